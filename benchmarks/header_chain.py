@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Load time and memory of a mainnet-sized HeaderChain.
+
+The headers file is synthetic (random bytes),
+as loading does not validate headers:
+
+    python benchmarks/header_chain.py [number_of_headers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from os import path
+
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.header_chain import HEADER_SIZE, HeaderChain
+
+SAMPLE = 10_000
+
+
+def main(n_headers: int) -> None:
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = path.join(dirname, "headers.dat")
+        with open(filename, "wb") as file_:
+            file_.write(os.urandom(n_headers * HEADER_SIZE))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        chain = HeaderChain.load(filename)
+        elapsed = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        print(f"loaded {len(chain):,} headers in {elapsed:.3f}s")
+        print(f"HeaderChain: {memory / 2**20:7.1f} MiB")
+
+        raw_headers = [chain.raw(i) for i in range(SAMPLE)]
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        headers = [BlockHeader.parse(raw, check_validity=False) for raw in raw_headers]
+        per_header = (tracemalloc.get_traced_memory()[0] - before) / len(headers)
+        estimate = per_header * n_headers
+        print(f"BlockHeader: {estimate / 2**20:7.1f} MiB (estimated)")
+        tracemalloc.stop()
+
+        heights = random.sample(range(n_headers), SAMPLE)
+        start = time.perf_counter()
+        for height in heights:
+            chain[height]  # pylint: disable=pointless-statement
+        elapsed = time.perf_counter() - start
+        print(f"by height: {elapsed / SAMPLE * 1e6:.1f}us per BlockHeader")
+
+        start = time.perf_counter()
+        chain.height_of(chain.tip)
+        elapsed = time.perf_counter() - start
+        print(f"hash index built (at the first lookup) in {elapsed:.3f}s")
+        hashes = [chain.hash(height) for height in heights]
+        start = time.perf_counter()
+        for hash_ in hashes:
+            chain.height_of(hash_)
+        elapsed = time.perf_counter() - start
+        print(f"by hash:   {elapsed / SAMPLE * 1e6:.1f}us per lookup")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 850_000)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Peak RSS of in-memory vs streaming signature of a large file.
+
+Each variant runs in its own process, as peak RSS is per-process:
+
+    python benchmarks/stream_hashing.py [size_in_MiB]
+
+resource.getrusage is only available on Unix.
+"""
+
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from os import path
+
+from btclib.ecc import bms, dsa, ssa
+
+PRV_KEY = 1
+WIF = "KwDiBf89QgGbjEhKnhXJuH7LrciVrZi3qYjgd9M7rFU73sVHnoWn"
+
+
+def _peak_rss_kib() -> int:
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _child(variant: str, filename: str) -> None:
+    start = time.perf_counter()
+    if variant == "in-memory":
+        with open(filename, "rb") as file_:
+            msg = file_.read()
+        dsa.sign(msg, PRV_KEY)
+        ssa.sign(msg, PRV_KEY)
+        bms.sign(msg, WIF)
+    else:
+        with open(filename, "rb") as file_:
+            dsa.sign_stream(file_, PRV_KEY)
+        with open(filename, "rb") as file_:
+            ssa.sign_stream(file_, PRV_KEY)
+        with open(filename, "rb") as file_:
+            bms.sign_stream(file_, WIF)
+    elapsed = time.perf_counter() - start
+    print(f"{variant:>10}: {elapsed:6.2f}s, peak RSS {_peak_rss_kib() / 1024:8.1f} MiB")
+
+
+def main(size_mib: int) -> None:
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = path.join(dirname, "large_file.bin")
+        chunk = b"\x5a" * (1 << 20)
+        with open(filename, "wb") as file_:
+            for _ in range(size_mib):
+                file_.write(chunk)
+        print(f"dsa, ssa, and bms signatures of a {size_mib} MiB file")
+        for variant in ("in-memory", "streaming"):
+            subprocess.run(
+                [sys.executable, __file__, "--child", variant, filename], check=True
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Build time, size, and lookup time of a TxIndex.
+
+The index is built from a synthetic chain of blk*.dat files:
+
+    python benchmarks/tx_index.py [number_of_transactions]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from os import path
+from typing import List
+
+from btclib.tx.blk_file import BlkFile
+from btclib.tx.tx_index import TxIndex
+from btclib.tx.tx_view import TxView
+
+MAGIC = bytes.fromhex("f9beb4d9")
+TXS_PER_BLOCK = 1_000
+BLOCKS_PER_FILE = 100
+LOOKUPS = 10_000
+
+
+def _raw_tx(i: int) -> bytes:
+    # one input spending a distinct prevout, one P2WPKH output
+    vin = i.to_bytes(32, "little") + b"\x00" * 4 + b"\x00" + b"\xff" * 4
+    vout = (50_000).to_bytes(8, "little") + b"\x16\x00\x14" + b"\x01" * 20
+    return b"\x01\x00\x00\x00" + b"\x01" + vin + b"\x01" + vout + b"\x00" * 4
+
+
+def _raw_block(first_tx: int, n: int) -> bytes:
+    header = b"\x00" * 80
+    txs = b"".join(_raw_tx(i) for i in range(first_tx, first_tx + n))
+    return header + b"\xfd" + n.to_bytes(2, "little") + txs
+
+
+def main(n_txs: int) -> None:
+    with tempfile.TemporaryDirectory() as dirname:
+        filenames: List[str] = []
+        n_blocks = n_txs // TXS_PER_BLOCK
+        for first_block in range(0, n_blocks, BLOCKS_PER_FILE):
+            filename = path.join(dirname, f"blk{len(filenames):05}.dat")
+            with open(filename, "wb") as file_:
+                for j in range(
+                    first_block, min(first_block + BLOCKS_PER_FILE, n_blocks)
+                ):
+                    raw_block = _raw_block(j * TXS_PER_BLOCK, TXS_PER_BLOCK)
+                    file_.write(MAGIC + len(raw_block).to_bytes(4, "little"))
+                    file_.write(raw_block)
+            filenames.append(filename)
+
+        db_filename = path.join(dirname, "txindex.sqlite")
+        with TxIndex(db_filename) as tx_index:
+            start = time.perf_counter()
+            for file_number, filename in enumerate(filenames):
+                with BlkFile(filename) as blk_file:
+                    tx_index.add_blk_file(blk_file, file_number)
+            elapsed = time.perf_counter() - start
+            print(f"indexed {len(tx_index):,} txs in {elapsed:.2f}s")
+            size = path.getsize(db_filename)
+            print(
+                f"index size: {size / 2**20:.1f} MiB ({size / len(tx_index):.1f} B/tx)"
+            )
+
+            tx_ids = [TxView.parse_at(_raw_tx(i)).id for i in range(n_txs)]
+            tx_ids = random.sample(tx_ids, min(LOOKUPS, n_txs))
+            start = time.perf_counter()
+            for tx_id in tx_ids:
+                tx_index.locations(tx_id)
+            elapsed = time.perf_counter() - start
+            print(f"locations: {elapsed / len(tx_ids) * 1e6:.1f}us per lookup")
+            start = time.perf_counter()
+            for tx_id in tx_ids:
+                tx_index.raw_tx(tx_id, filenames.__getitem__)
+            elapsed = time.perf_counter() - start
+            print(f"raw_tx:    {elapsed / len(tx_ids) * 1e6:.1f}us per lookup")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
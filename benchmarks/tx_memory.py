@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Memory of parsed transactions, in bytes per transaction.
+
+The transactions of a mainnet block (1866 transactions, 989 kB)
+are parsed and compared with their serialization size:
+
+    python benchmarks/tx_memory.py
+
+Before __slots__ and script interning,
+it was 2562 bytes per transaction (4.83x the serialization size),
+2268 after (4.28x).
+"""
+
+import tracemalloc
+from os import path
+
+from btclib.tx.blocks import Block
+
+FILENAME = path.join(
+    path.dirname(__file__), "..", "tests", "tx", "_data", "block_481824_complete.bin"
+)
+
+
+def main() -> None:
+    with open(FILENAME, "rb") as file_:
+        data = file_.read()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    block = Block.parse(data, check_validity=False)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    n_txs = len(block.transactions)
+    print(f"{n_txs} transactions, {len(data):,} bytes serialized")
+    print(f"serialized: {len(data) / n_txs:8.1f} bytes per transaction")
+    print(f"parsed:     {memory / n_txs:8.1f} bytes per transaction", end="")
+    print(f" ({memory / len(data):.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Blocks per second connected to (and disconnected from) a UtxoSet.
+
+Synthetic chain: each transaction spends an output of a previous block
+and creates two p2wpkh outputs:
+
+    python benchmarks/utxo_set.py [number_of_blocks] [transactions_per_block]
+"""
+
+import sys
+import tempfile
+import time
+from collections import deque
+from os import path
+from typing import List
+
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.blocks import Block
+from btclib.tx.out_point import OutPoint
+from btclib.tx.tx import Tx
+from btclib.tx.tx_in import TxIn
+from btclib.tx.tx_out import TxOut
+from btclib.tx.utxo_set import SqliteStore, UtxoSet
+
+P2WPKH = bytes.fromhex("0014") + b"\x01" * 20
+
+
+def _synthetic_chain(n_blocks: int, n_txs: int) -> List[Block]:
+    blocks = []
+    unspent: deque = deque()
+    for height in range(n_blocks):
+        coinbase_in = TxIn(OutPoint(), bytes([2, height % 256, height // 256]))
+        vout = [TxOut(50_000 * (i + 1), P2WPKH, False) for i in range(n_txs * 2)]
+        transactions = [Tx(2, 0, [coinbase_in], vout, False)]
+        # spendable outputs of the previous blocks
+        for _ in range(min(n_txs, len(unspent))):
+            vin = [TxIn(unspent.popleft(), check_validity=False)]
+            vout = [TxOut(10_000, P2WPKH, False), TxOut(20_000, P2WPKH, False)]
+            transactions.append(Tx(2, 0, vin, vout, False))
+        for tx in transactions:
+            tx_id = tx.id
+            unspent.extend(OutPoint(tx_id, i, False) for i in range(len(tx.vout)))
+        blocks.append(Block(BlockHeader(check_validity=False), transactions, False))
+    return blocks
+
+
+def _run(name: str, utxo_set: UtxoSet, blocks: List[Block]) -> None:
+    start = time.perf_counter()
+    undos = [utxo_set.connect_block(block, i) for i, block in enumerate(blocks)]
+    elapsed = time.perf_counter() - start
+    n_txs = sum(len(block.transactions) for block in blocks)
+    print(f"{name:>6} connect:    {len(blocks) / elapsed:8.1f} blocks/s", end="")
+    print(f" ({n_txs / elapsed:,.0f} txs/s), {len(utxo_set):,} utxos")
+    start = time.perf_counter()
+    for block, undo in zip(reversed(blocks), reversed(undos)):
+        utxo_set.disconnect_block(block, undo)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>6} disconnect: {len(blocks) / elapsed:8.1f} blocks/s")
+
+
+def main(n_blocks: int, n_txs: int) -> None:
+    blocks = _synthetic_chain(n_blocks, n_txs)
+    print(f"{n_blocks} blocks, up to {n_txs} transactions per block")
+    _run("dict", UtxoSet(), blocks)
+    with tempfile.TemporaryDirectory() as dirname:
+        with SqliteStore(path.join(dirname, "utxo.sqlite")) as store:
+            _run("sqlite", UtxoSet(store), blocks)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
@@ -14,7 +14,8 @@ mypy aliases, documenting also coding input conventions.
 """
 
 from io import BytesIO
-from typing import Any, Callable, Tuple, Union
+from mmap import mmap
+from typing import IO, Any, Callable, Iterable, Tuple, Union
 
 # Octets are a sequence of eight-bit bytes or a hex-string (not text string)
 #
@@ -65,6 +66,14 @@ String = Union[bytes, str]
 # but possibily provided as Octets too
 BinaryData = Union[BytesIO, Octets]
 
+# bytes-like object, to be parsed in place using an integer offset
+# (i.e. without wrapping it in a stream), e.g. a memory-mapped file
+Buffer = Union[bytes, bytearray, memoryview, mmap]
+
+# binary file object or iterable of bytes chunks,
+# e.g. a large message to be hashed in bounded memory
+ByteStream = Union[IO[bytes], Iterable[bytes]]
+
 # hex-string or bytes representation of an int
 # Integer = Union[Octets, int]
 Integer = Union[bytes, str, int]
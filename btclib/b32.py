@@ -39,21 +39,32 @@ with the following modifications:
 * detailed error messages and exteded safety checks
 * check that bech32 addresses are not longer than 90 characters
   (as this is not enforced by bech32.b32decode anymore)
+* witness program conversions to/from 5-bit values
+  through a single int, instead of bit by bit
+* added witness_from_address_many() for batches
 """
 
 
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from btclib.alias import Octets, String
 from btclib.bech32 import b32decode, b32encode
 from btclib.exceptions import BTClibValueError
 from btclib.hashes import hash160_from_key
-from btclib.network import NETWORKS, network_from_key_value
+from btclib.network import NETWORKS
 from btclib.to_pub_key import Key
 from btclib.utils import bytes_from_octets, sha256
 
 # 0. bech32 facilities
 
+# hrp: network, the first matching one as in network_from_key_value
+_HRP_NETWORKS: Dict[str, str] = {}
+for _network, _network_data in NETWORKS.items():
+    _HRP_NETWORKS.setdefault(_network_data.hrp, _network)
+
+# 5-bit value to base32 int() digit, for bytes.translate
+_INT_DIGITS = bytes(range(48, 58)) + bytes(range(97, 119)) + bytes(224)
+
 
 def has_segwit_prefix(addr: String) -> bool:
 
@@ -93,6 +104,26 @@ def power_of_2_base_conversion(
     return ret
 
 
+def _convert_8_to_5(data: bytes) -> List[int]:
+    "Return the zero padded 5-bit values of the bytes."
+    n_bits = len(data) * 8
+    pad = -n_bits % 5
+    acc = int.from_bytes(data, byteorder="big", signed=False) << pad
+    return [acc >> shift & 31 for shift in range(n_bits + pad - 5, -1, -5)]
+
+
+def _convert_5_to_8(data: Sequence[int]) -> bytes:
+    "Return the bytes of the 5-bit values, checking their zero padding."
+    n_bits = len(data) * 5
+    pad = n_bits % 8
+    if pad >= 5:
+        raise BTClibValueError("zero padding of more than 4 bits in 5-to-8 conversion")
+    acc = int(bytes(data).translate(_INT_DIGITS) or b"0", 32)
+    if acc & ((1 << pad) - 1):
+        raise BTClibValueError("non-zero padding in 5-to-8 conversion")
+    return (acc >> pad).to_bytes(n_bits // 8, byteorder="big", signed=False)
+
+
 def check_witness(wit_ver: int, wit_prg: Octets) -> bytes:
 
     if not 0 <= int(wit_ver) < 17:
@@ -114,7 +145,7 @@ def check_witness(wit_ver: int, wit_prg: Octets) -> bytes:
 
 def _address_from_witness(wit_ver: int, wit_prg: Octets, hrp: str) -> str:
     wit_prg = check_witness(wit_ver, wit_prg)
-    bytes_ = b32encode(hrp, [wit_ver] + power_of_2_base_conversion(wit_prg, 8, 5))
+    bytes_ = b32encode(hrp, [wit_ver] + _convert_8_to_5(wit_prg))
     return bytes_.decode("ascii")
 
 
@@ -141,7 +172,7 @@ def witness_from_address(b32addr: String) -> Tuple[int, bytes, str]:
     hrp, data = b32decode(b32addr)
 
     # check that it is a known SegWit address type
-    network = network_from_key_value("hrp", hrp)
+    network = _HRP_NETWORKS.get(hrp)
     if network is None:
         raise BTClibValueError(f"invalid hrp: {hrp}")
 
@@ -149,10 +180,27 @@ def witness_from_address(b32addr: String) -> Tuple[int, bytes, str]:
         raise BTClibValueError(f"empty data in bech32 address: {b32addr!r}")
 
     wit_ver = data[0]
-    wit_prg = bytes(power_of_2_base_conversion(data[1:], 5, 8, False))
+    wit_prg = _convert_5_to_8(data[1:])
     return wit_ver, check_witness(wit_ver, wit_prg), network
 
 
+def witness_from_address_many(
+    b32addrs: Iterable[String],
+) -> List[Union[Tuple[int, bytes, str], ValueError]]:
+    """Return the witness of each bech32 native SegWit address.
+
+    Invalid addresses are returned as the ValueError they raised,
+    so that a batch is also validated without being aborted.
+    """
+    results: List[Union[Tuple[int, bytes, str], ValueError]] = []
+    for b32addr in b32addrs:
+        try:
+            results.append(witness_from_address(b32addr))
+        except ValueError as e:
+            results.append(e)
+    return results
+
+
 # 1.+2. = 3. bech32 address from pub_key/script_pub_key
 
 
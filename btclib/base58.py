@@ -31,12 +31,16 @@ https://github.com/keis/base58, with the following modifications:
 * type annotated python3
 * using native python3 int.from_bytes() and i.to_bytes()
 * added optional check on output size for b58decode()
+* 256-entry translation tables instead of alphabet scans,
+  and integer conversion in chunks of 58^10
+  (i.e. mostly small int arithmetic, without quadratic concatenation)
+* added b58encode_many() and b58decode_many() for batches
 * interface mimics the native python3 base64 interface, i.e.
   it supports encoding bytes-like objects to ASCII bytes,
   and decoding ASCII bytes-like objects or ASCII strings to bytes.
 """
 
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from btclib.alias import Octets, String
 from btclib.exceptions import BTClibValueError
@@ -45,15 +49,31 @@ from btclib.utils import bytes_from_octets, hash256
 _ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 __BASE = len(_ALPHABET)
 
+# digit to base58 character, for bytes.translate
+_ENCODE_TABLE = _ALPHABET + bytes(256 - __BASE)
+# base58 character to digit, for bytes.translate
+_DECODE_TABLE = bytes(_ALPHABET.find(char) % 256 for char in range(256))
+
+# base58 digits per chunk, converted with small int arithmetic
+_CHUNK_SIZE = 10
+__CHUNK_BASE = __BASE ** _CHUNK_SIZE
+
 
 def _b58encode_from_int(i: int) -> bytes:
 
-    result = b""
-    while i or len(result) == 0:
-        i, idx = divmod(i, __BASE)
-        result = _ALPHABET[idx : idx + 1] + result
+    # least significant digit first
+    digits = bytearray()
+    while i >= __CHUNK_BASE:
+        i, chunk = divmod(i, __CHUNK_BASE)
+        for _ in range(_CHUNK_SIZE):
+            chunk, digit = divmod(chunk, __BASE)
+            digits.append(digit)
+    while i or len(digits) == 0:
+        i, digit = divmod(i, __BASE)
+        digits.append(digit)
 
-    return result
+    digits.reverse()
+    return bytes(digits.translate(_ENCODE_TABLE))
 
 
 def _b58encode(v: bytes) -> bytes:
@@ -83,16 +103,25 @@ def b58encode(v: Octets, in_size: Optional[int] = None) -> bytes:
 
 def _b58decode_to_int(v: bytes) -> int:
 
+    digits = v.translate(_DECODE_TABLE)
+    # the first chunk is the (possibly) shorter one
+    start = len(digits) % _CHUNK_SIZE or _CHUNK_SIZE
     i = 0
-    for char in v:
-        i *= __BASE
-        i += _ALPHABET.index(char)
+    for digit in digits[:start]:
+        i = i * __BASE + digit
+    for end in range(start + _CHUNK_SIZE, len(digits) + 1, _CHUNK_SIZE):
+        chunk = 0
+        for digit in digits[start:end]:
+            chunk = chunk * __BASE + digit
+        i = i * __CHUNK_BASE + chunk
+        start = end
     return i
 
 
 def _b58decode(v: bytes) -> bytes:
 
-    if any(x not in _ALPHABET for x in v):
+    # characters left after deleting the alphabet ones
+    if v.translate(None, _ALPHABET):
         msg = "Base58 string contains invalid characters"
         raise BTClibValueError(msg)
 
@@ -121,6 +150,9 @@ def b58decode(v: String, out_size: Optional[int] = None) -> bytes:
     if isinstance(v, str):
         # do not trim spaces
         v = v.encode("ascii")
+    elif not isinstance(v, bytes):
+        # any iterable of ints, e.g. bytearray
+        v = bytes(iter(v))
 
     result = _b58decode(v)
     if len(result) < 4:
@@ -140,3 +172,20 @@ def b58decode(v: String, out_size: Optional[int] = None) -> bytes:
     err_msg = "valid checksum, invalid decoded size: "
     err_msg += f"{len(result)} bytes instead of {out_size}"
     raise BTClibValueError(err_msg)
+
+
+def b58encode_many(
+    values: Iterable[Octets], in_size: Optional[int] = None
+) -> List[bytes]:
+    "Encode each bytes-like object using Base58Check."
+    return [b58encode(v, in_size) for v in values]
+
+
+def b58decode_many(
+    values: Iterable[String], out_size: Optional[int] = None
+) -> List[bytes]:
+    """Decode each Base58Check encoded bytes-like object or ASCII string.
+
+    The first invalid one raises, as in b58decode.
+    """
+    return [b58decode(v, out_size) for v in values]
@@ -40,12 +40,15 @@ with the following modifications:
 * avoided returning (None, None), throwing Exceptions instead
 * removed the 90-chars limit for bech32 string, enforced by segwitaddr instead
 * detailed error messages
+* table-driven polymod, with the checksum state after the HRP
+  computed once per HRP, and translation tables for data characters
 * interface mimics the native python3 base64 interface, i.e.
   it supports encoding bytes-like objects to ASCII bytes,
   and decoding ASCII bytes-like objects or ASCII strings to bytes.
 """
 
 
+from functools import lru_cache
 from typing import Iterable, List, Tuple
 
 from btclib.alias import String
@@ -54,16 +57,29 @@ from btclib.exceptions import BTClibValueError
 _ALPHABET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
 _M = 1  # 0x2bc830a3
 
-
-def _polymod(values: Iterable[int]) -> int:
+_GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+# XOR of the generator values selected by the 5 top bits of the checksum
+_GENERATOR_TABLE = tuple(
+    _GENERATOR[0] * (top & 1)
+    ^ _GENERATOR[1] * (top >> 1 & 1)
+    ^ _GENERATOR[2] * (top >> 2 & 1)
+    ^ _GENERATOR[3] * (top >> 3 & 1)
+    ^ _GENERATOR[4] * (top >> 4 & 1)
+    for top in range(32)
+)
+
+# data character to 5-bit value, for bytes.translate
+_DECODE_TABLE = bytes(_ALPHABET.find(chr(char)) % 256 for char in range(256))
+_ALPHABET_BYTES = _ALPHABET.encode("ascii")
+# ASCII characters in [48-122]
+_VALID_CHARS = bytes(range(48, 123))
+
+
+def _polymod(values: Iterable[int], chk: int = 1) -> int:
     "Internal function that computes the bech32 checksum."
-    generator = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
-    chk = 1
+    table = _GENERATOR_TABLE
     for value in values:
-        top = chk >> 25
-        chk = (chk & 0x1FFFFFF) << 5 ^ value
-        for i in range(5):
-            chk ^= generator[i] if ((top >> i) & 1) else 0
+        chk = ((chk & 0x1FFFFFF) << 5 ^ value) ^ table[chk >> 25]
     return chk
 
 
@@ -72,10 +88,15 @@ def _hrp_expand(hrp: str) -> List[int]:
     return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
 
 
+@lru_cache()
+def _hrp_polymod(hrp: str) -> int:
+    "Return the checksum state after the expanded HRP."
+    return _polymod(_hrp_expand(hrp))
+
+
 def _create_checksum(hrp: str, data: List[int]) -> List[int]:
     "Compute the checksum values given HRP and data."
-    values = _hrp_expand(hrp) + data
-    polymod = _polymod(values + [0, 0, 0, 0, 0, 0]) ^ _M
+    polymod = _polymod(data + [0, 0, 0, 0, 0, 0], _hrp_polymod(hrp)) ^ _M
     return [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
 
 
@@ -88,7 +109,7 @@ def b32encode(hrp: str, data: List[int]) -> bytes:
 
 def _verify_checksum(hrp: str, data: List[int]) -> bool:
     "Verify a checksum given HRP and converted data characters."
-    return _polymod(_hrp_expand(hrp) + data) == _M
+    return _polymod(data, _hrp_polymod(hrp)) == _M
 
 
 def b32decode(bech: String) -> Tuple[str, List[int]]:
@@ -100,7 +121,8 @@ def b32decode(bech: String) -> Tuple[str, List[int]]:
     if isinstance(bech, bytes):
         bech = bech.decode("ascii")
 
-    if not all(47 < ord(x) < 123 for x in bech):
+    # non-ASCII characters are utf-8 encoded as bytes >= 0x80
+    if bech.encode("utf-8").translate(None, _VALID_CHARS):
         raise BTClibValueError(f"ASCII character outside [48-122]: {bech}")
     if bech.lower() != bech and bech.upper() != bech:
         raise BTClibValueError(f"mixed case: {bech}")
@@ -123,9 +145,10 @@ def b32decode(bech: String) -> Tuple[str, List[int]]:
 
     hrp = bech[:pos]
 
-    if any(x not in _ALPHABET for x in bech[pos + 1 :]):
+    data_chars = bech[pos + 1 :].encode("ascii")
+    if data_chars.translate(None, _ALPHABET_BYTES):
         raise BTClibValueError(f"invalid data characters: {bech}")
-    data = [_ALPHABET.find(x) for x in bech[pos + 1 :]]
+    data = list(data_chars.translate(_DECODE_TABLE))
 
     if _verify_checksum(hrp, data):
         return hrp, data[:-6]
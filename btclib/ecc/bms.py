@@ -137,14 +137,14 @@ from dataclasses import InitVar, dataclass
 from hashlib import sha256
 from typing import Optional, Tuple, Type, TypeVar, Union
 
-from btclib.alias import BinaryData, Octets, String
+from btclib.alias import BinaryData, ByteStream, Octets, String
 from btclib.b32 import has_segwit_prefix, p2wpkh, witness_from_address
 from btclib.b58 import h160_from_address, p2pkh, p2wpkh_p2sh, wif_from_prv_key
 from btclib.ecc import dsa
 from btclib.ecc.curve import mult, secp256k1
 from btclib.ecc.sec_point import bytes_from_point
 from btclib.exceptions import BTClibValueError
-from btclib.hashes import magic_message
+from btclib.hashes import magic_message, magic_message_stream
 from btclib.network import NETWORKS
 from btclib.to_prv_key import PrvKey, prv_keyinfo_from_prv_key
 from btclib.utils import bytesio_from_binarydata, hash160
@@ -259,11 +259,10 @@ def gen_keys(
     return wif, address
 
 
-def sign(msg: Octets, prv_key: PrvKey, addr: Optional[String] = None) -> Sig:
-    "Generate address-based compact signature for the provided message."
+def sign_(magic_msg: Octets, prv_key: PrvKey, addr: Optional[String] = None) -> Sig:
+    "Generate address-based compact signature for the magic message hash."
 
     # first sign the message
-    magic_msg = magic_message(msg)
     q, network, compressed = prv_keyinfo_from_prv_key(prv_key)
     dsa_sig = dsa.sign(magic_msg, q)
 
@@ -297,8 +296,34 @@ def sign(msg: Octets, prv_key: PrvKey, addr: Optional[String] = None) -> Sig:
     return Sig(rf, dsa_sig)
 
 
-def assert_as_valid(
-    msg: Octets, addr: String, sig: Union[Sig, String], lower_s: bool = True
+def sign(msg: Octets, prv_key: PrvKey, addr: Optional[String] = None) -> Sig:
+    "Generate address-based compact signature for the provided message."
+
+    magic_msg = magic_message(msg)
+    return sign_(magic_msg, prv_key, addr)
+
+
+def sign_stream(
+    stream: ByteStream,
+    prv_key: PrvKey,
+    addr: Optional[String] = None,
+    *,
+    msg_len: Optional[int] = None,
+) -> Sig:
+    """Generate address-based compact signature for a message byte stream.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    The message length must be provided
+    unless the stream is a seekable file object.
+    """
+
+    magic_msg = magic_message_stream(stream, msg_len)
+    return sign_(magic_msg, prv_key, addr)
+
+
+def assert_as_valid_(
+    magic_msg: Octets, addr: String, sig: Union[Sig, String], lower_s: bool = True
 ) -> None:
     # Private function for test/dev purposes
     # It raises Errors, while verify should always return True or False
@@ -315,7 +340,6 @@ def assert_as_valid(
     # 35-27 = 001000;  36-27 = 001001;  37-27 = 001010;  38-27 = 001011
     # 39-27 = 001100;  40-27 = 001101;  41-27 = 001110;  42-27 = 001111
     key_id = sig.rf - 27 & 0b11
-    magic_msg = magic_message(msg)
     Q = dsa.recover_pub_key(key_id, magic_msg, sig.dsa_sig, lower_s, sha256)
     compressed = sig.rf > 30
     # signature is valid only if the provided address is matched
@@ -348,16 +372,53 @@ def assert_as_valid(
         raise BTClibValueError(f"invalid p2wpkh-p2sh address: {addr!r}")
 
 
-def verify(
+def assert_as_valid(
     msg: Octets, addr: String, sig: Union[Sig, String], lower_s: bool = True
+) -> None:
+
+    magic_msg = magic_message(msg)
+    assert_as_valid_(magic_msg, addr, sig, lower_s)
+
+
+def verify_(
+    magic_msg: Octets, addr: String, sig: Union[Sig, String], lower_s: bool = True
 ) -> bool:
-    "Verify address-based compact signature for the provided message."
+    "Verify address-based compact signature for the magic message hash."
 
     # all kind of Exceptions are catched because
     # verify must always return a bool
     try:
-        assert_as_valid(msg, addr, sig, lower_s)
+        assert_as_valid_(magic_msg, addr, sig, lower_s)
     except Exception:  # pylint: disable=broad-except
         return False
     else:
         return True
+
+
+def verify(
+    msg: Octets, addr: String, sig: Union[Sig, String], lower_s: bool = True
+) -> bool:
+    "Verify address-based compact signature for the provided message."
+
+    magic_msg = magic_message(msg)
+    return verify_(magic_msg, addr, sig, lower_s)
+
+
+def verify_stream(
+    stream: ByteStream,
+    addr: String,
+    sig: Union[Sig, String],
+    *,
+    lower_s: bool = True,
+    msg_len: Optional[int] = None,
+) -> bool:
+    """Verify address-based compact signature for a message byte stream.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    The message length must be provided
+    unless the stream is a seekable file object.
+    """
+
+    magic_msg = magic_message_stream(stream, msg_len)
+    return verify_(magic_msg, addr, sig, lower_s)
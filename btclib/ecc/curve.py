@@ -23,6 +23,7 @@ from btclib.ecc.curve_group import (
     _mult,
     _multi_mult,
     jac_from_aff,
+    mult_fixed_window,
 )
 from btclib.exceptions import BTClibValueError
 from btclib.utils import hex_string, int_from_integer
@@ -109,7 +110,9 @@ class Curve(CurveSubGroup):
         if self.G[1] == 0:
             err_msg = "INF point cannot be a generator"
             raise BTClibValueError(err_msg)
-        jac_inf = _mult(n, self.GJ, self)
+        # no cached generator table here, as it would be built
+        # for every curve at import time
+        jac_inf = mult_fixed_window(n, self.GJ, self)
         if jac_inf[2] != 0:
             err_msg = "n is not the group order: "
             err_msg += f"{hex_string(n)}" if n > HEX_THRESHOLD else f"{n}"
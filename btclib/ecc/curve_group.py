@@ -19,10 +19,13 @@ see the btclib.curve module.
 import functools
 import heapq
 from math import ceil
-from typing import List, Sequence, Tuple
+from os import path
+from typing import List, Optional, Sequence, Tuple
 
 from btclib.alias import INF, INFJ, Integer, JacPoint, Point
+from btclib.ecc import table_file
 from btclib.ecc.number_theory import legendre_symbol, mod_inv, mod_sqrt
+from btclib.ecc.table_cache import TABLE_CACHE
 from btclib.exceptions import BTClibTypeError, BTClibValueError
 from btclib.utils import hex_string, int_from_integer
 
@@ -501,8 +504,12 @@ def multiples(Q: JacPoint, size: int, ec: CurveGroup) -> List[JacPoint]:
 MAX_W = 5
 
 
-@functools.lru_cache()  # least recently used cache
-def cached_multiples(Q: JacPoint, ec: CurveGroup) -> List[JacPoint]:
+def _is_generator(Q: JacPoint, ec: CurveGroup) -> bool:
+    "Return True if Q is the generator of the curve, if any."
+    return Q == getattr(ec, "GJ", None)
+
+
+def _multiples(Q: JacPoint, ec: CurveGroup) -> List[JacPoint]:
 
     T = [INFJ, Q]
     for i in range(3, 2 ** MAX_W, 2):
@@ -511,15 +518,20 @@ def cached_multiples(Q: JacPoint, ec: CurveGroup) -> List[JacPoint]:
     return T
 
 
-@functools.lru_cache()
-def cached_multiples_fixwind(
-    Q: JacPoint, ec: CurveGroup, w: int = 4
-) -> List[List[JacPoint]]:
-    """Made to precompute values for mult_fixed_window_cached.
-    Do not use it for other functions.
-    Made to be used for w=4, do not use w.
+def cached_multiples(Q: JacPoint, ec: CurveGroup) -> List[JacPoint]:
+    """Return {k_i * Q} for k_i in {0, ..., 2**MAX_W-1).
+
+    The table is cached in TABLE_CACHE,
+    pinned if Q is the curve generator.
     """
 
+    key = ("multiples", Q, ec)
+    builder = functools.partial(_multiples, Q, ec)
+    return TABLE_CACHE.get(key, builder, _is_generator(Q, ec))
+
+
+def _multiples_fixwind(Q: JacPoint, ec: CurveGroup, w: int) -> List[List[JacPoint]]:
+
     T = []
     K = Q
     for _ in range((ec.p_size * 8) // w + 1):
@@ -533,6 +545,73 @@ def cached_multiples_fixwind(
     return T
 
 
+def cached_multiples_fixwind(
+    Q: JacPoint, ec: CurveGroup, w: int = 4
+) -> List[List[JacPoint]]:
+    """Made to precompute values for mult_fixed_window_cached.
+    Do not use it for other functions.
+    Made to be used for w=4, do not use w.
+
+    The table is cached in TABLE_CACHE,
+    pinned if Q is the curve generator.
+    """
+
+    key = ("multiples_fixwind", Q, ec, w)
+    if _is_generator(Q, ec):
+        builder = functools.partial(_generator_multiples_fixwind, ec, w)
+        return TABLE_CACHE.get(key, builder, True)
+    builder = functools.partial(_multiples_fixwind, Q, ec, w)
+    return TABLE_CACHE.get(key, builder)
+
+
+def _generator_multiples_fixwind(ec: CurveGroup, w: int) -> List[List[JacPoint]]:
+    "Load the generator table from file, if available and valid, or build it."
+
+    filename = table_file.generator_table_filename(ec, w)
+    if filename is not None:
+        try:
+            return table_file.load(filename, ec, w)
+        except BTClibValueError:
+            # e.g. truncated or corrupted file: the table is built instead
+            pass
+    return _multiples_fixwind(getattr(ec, "GJ"), ec, w)
+
+
+def save_generator_table(
+    ec: CurveGroup, filename: Optional[str] = None, w: int = 4
+) -> str:
+    """Save the generator fixed-window table to file.
+
+    If filename is not provided, the table is saved
+    in the first of the table_file.TABLE_DIRS directories,
+    where it is looked for when the table is needed.
+    The name of the file is returned.
+    """
+
+    if not hasattr(ec, "GJ"):
+        raise BTClibValueError("no generator for curve")
+    if filename is None:
+        basename = table_file.generator_table_basename(ec, w)
+        filename = path.join(table_file.TABLE_DIRS[0], basename)
+    T = _multiples_fixwind(getattr(ec, "GJ"), ec, w)
+    table_file.save(T, ec, filename, w)
+    return filename
+
+
+def warm_table_cache(ec: CurveGroup, Q: Optional[JacPoint] = None, w: int = 4) -> None:
+    """Precompute and cache the multiplication tables of Q.
+
+    If Q is not provided, the curve generator is used.
+    """
+
+    if Q is None:
+        if not hasattr(ec, "GJ"):
+            raise BTClibValueError("no point provided and no generator for curve")
+        Q = getattr(ec, "GJ")
+    cached_multiples(Q, ec)
+    cached_multiples_fixwind(Q, ec, w)
+
+
 def convert_number_to_base(i: int, base: int) -> List[int]:
     "Return the digits of an integer in the requested base."
 
@@ -686,7 +765,17 @@ def mult_fixed_window_cached(
     return R
 
 
-_mult = mult_fixed_window
+def _mult(m: int, Q: JacPoint, ec: CurveGroup) -> JacPoint:
+    """Scalar multiplication of a curve point in Jacobian coordinates.
+
+    The generator is multiplied using its cached fixed-window table,
+    any other point (or a scalar too large for the table)
+    using the plain fixed window algorithm.
+    """
+
+    if _is_generator(Q, ec) and m.bit_length() <= ec.p_size * 8:
+        return mult_fixed_window_cached(m, Q, ec)
+    return mult_fixed_window(m, Q, ec)
 
 
 def _double_mult(
@@ -14,29 +14,35 @@ These functions are meant to explore low-cardinality CurveGroup,
 for didactical (and fun) reason only.
 """
 
-from typing import List
+import secrets
+from math import sqrt
+from typing import Dict, List, Optional, Tuple
 
 from btclib.alias import INF, Point
 from btclib.ecc.curve import CurveGroup
+from btclib.ecc.curve_group import mult_aff
+from btclib.ecc.number_theory import mod_inv, mod_sqrt
 from btclib.exceptions import BTClibValueError
 
 
 def find_all_points(ec: CurveGroup) -> List[Point]:
     """Attemp to find all group points, if p is low.
 
-    Very unsofisticated walk-through approach,
-    for didactical sake only.
+    Walk-through approach, for didactical sake only;
+    x values with no y are skipped using Euler's criterion.
     """
     if ec.p > 10000:
         err_msg = f"p is too big to count all group points: {ec.p}"
         raise BTClibValueError(err_msg)
 
     points: List[Point] = [INF]
+    exp = (ec.p - 1) // 2
     for x in range(ec.p):
-        try:
-            y = ec.y(x)
-        except BTClibValueError:
+        y2 = ec._y2(x)  # pylint: disable=protected-access
+        # Euler's criterion: y2 is a square iff y2^((p-1)/2) = 1 (or y2 = 0)
+        if y2 and pow(y2, exp, ec.p) != 1:
             continue
+        y = mod_sqrt(y2, ec.p)
 
         points.append((x, y))
         if y != 0:
@@ -55,9 +61,133 @@ def find_subgroup_points(ec: CurveGroup, G: Point) -> List[Point]:
         err_msg = f"p is too big to count all subgroup points: {ec.p}"
         raise BTClibValueError(err_msg)
 
+    ec.require_on_curve(G)
     points: List[Point] = [G]
     while points[-1] != INF:
-        Q = ec.add(points[-1], G)
+        Q = ec.add_aff(points[-1], G)
         points.append(Q)
 
     return points
+
+
+def _generator_and_order(
+    ec: CurveGroup, G: Optional[Point], n: Optional[int]
+) -> Tuple[Point, Optional[int]]:
+    "Return G and its order n, defaulting to the curve ones."
+
+    if G is None:
+        if not hasattr(ec, "G"):
+            raise BTClibValueError("no generator provided and no generator for curve")
+        G = getattr(ec, "G")
+        if n is None:
+            n = getattr(ec, "n", None)
+    ec.require_on_curve(G)
+    return G, n
+
+
+def bsgs(
+    Q: Point,
+    ec: CurveGroup,
+    G: Optional[Point] = None,
+    n: Optional[int] = None,
+    max_table_size: int = 2 ** 20,
+) -> int:
+    """Return the discrete logarithm of Q with respect to G.
+
+    Baby-step giant-step algorithm: the smallest k such that Q = k*G
+    is found with about sqrt(n) point additions and a table of
+    min(sqrt(n), max_table_size) points;
+    a smaller table results in more giant steps.
+
+    G defaults to the curve generator;
+    n is the order of G (or any upper bound of it)
+    and defaults to the curve order if G is the curve generator,
+    to the Hasse bound of the group cardinality otherwise.
+    """
+
+    G, order = _generator_and_order(ec, G, n)
+    if order is None:
+        order = ec.p + 1 + 2 * (int(sqrt(ec.p)) + 1)
+    if max_table_size < 1:
+        raise BTClibValueError(f"invalid max_table_size: {max_table_size}")
+    ec.require_on_curve(Q)
+
+    m = min(int(sqrt(order)) + 1, max_table_size)
+    # baby steps: j*G for j in 0..m-1
+    baby_steps: Dict[Point, int] = {}
+    P = INF
+    for j in range(m):
+        baby_steps.setdefault(P, j)
+        P = ec.add_aff(P, G)
+    # giant steps: Q - i*m*G for i in 0..ceil(order/m)-1
+    minus_mG = ec.negate(P)
+    R = Q
+    for i in range((order + m - 1) // m):
+        if R in baby_steps:
+            return i * m + baby_steps[R]
+        R = ec.add_aff(R, minus_mG)
+
+    raise BTClibValueError("discrete logarithm not found")
+
+
+def pollard_rho(
+    Q: Point,
+    ec: CurveGroup,
+    G: Optional[Point] = None,
+    n: Optional[int] = None,
+    max_attempts: int = 32,
+) -> int:
+    """Return the discrete logarithm of Q with respect to G.
+
+    Pollard's rho algorithm with Floyd's cycle detection:
+    about sqrt(n) point additions and constant memory.
+    The pseudo-random walk starts from a random combination a*G + b*Q,
+    so a failed attempt (i.e. a degenerate collision)
+    is repeated up to max_attempts times.
+
+    G defaults to the curve generator;
+    n is the order of G, preferably a prime,
+    and defaults to the curve order if G is the curve generator.
+    """
+
+    G, order = _generator_and_order(ec, G, n)
+    if order is None:
+        raise BTClibValueError("missing generator order")
+    n = order
+    ec.require_on_curve(Q)
+
+    if Q[1] == 0:
+        return 0
+
+    def step(R: Point, a: int, b: int) -> Tuple[Point, int, int]:
+        # the x-coordinate partitions the points in three sets
+        s = R[0] % 3
+        if s == 0:
+            return ec.add_aff(R, G), (a + 1) % n, b
+        if s == 1:
+            return ec.add_aff(R, Q), a, (b + 1) % n
+        return ec.double_aff(R), 2 * a % n, 2 * b % n
+
+    for _ in range(max_attempts):
+        a = secrets.randbelow(n)
+        b = secrets.randbelow(n)
+        R = ec.add_aff(mult_aff(a, G, ec), mult_aff(b, Q, ec))
+        tortoise = hare = (R, a, b)
+        while True:
+            tortoise = step(*tortoise)
+            hare = step(*step(*hare))
+            if tortoise[0] == hare[0]:
+                break
+        # a1*G + b1*Q = a2*G + b2*Q, i.e. (a1 - a2)*G = (b2 - b1)*Q
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        if (b2 - b1) % n == 0:
+            continue
+        try:
+            k = (a1 - a2) * mod_inv(b2 - b1, n) % n
+        except BTClibValueError:  # n is not prime
+            continue
+        if mult_aff(k, G, ec) == Q:
+            return k
+
+    raise BTClibValueError("discrete logarithm not found")
@@ -22,14 +22,14 @@ import secrets
 from hashlib import sha256
 from typing import List, Optional, Tuple, Union
 
-from btclib.alias import HashF, JacPoint, Octets, Point
+from btclib.alias import ByteStream, HashF, JacPoint, Octets, Point
 from btclib.ecc.curve import Curve, secp256k1
 from btclib.ecc.curve_group import _double_mult, _mult
 from btclib.ecc.der import Sig
 from btclib.ecc.number_theory import mod_inv
 from btclib.ecc.rfc6979 import _rfc6979_
 from btclib.exceptions import BTClibRuntimeError, BTClibValueError
-from btclib.hashes import challenge_, reduce_to_hlen
+from btclib.hashes import challenge_, reduce_to_hlen, reduce_to_hlen_stream
 from btclib.to_prv_key import PrvKey, int_from_prv_key
 from btclib.to_pub_key import Key, point_from_key
 from btclib.utils import bytes_from_octets
@@ -147,6 +147,25 @@ def sign(
     return sign_(msg_hash, prv_key, nonce, lower_s, ec, hf)
 
 
+def sign_stream(
+    stream: ByteStream,
+    prv_key: PrvKey,
+    *,
+    nonce: Optional[PrvKey] = None,
+    lower_s: bool = True,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+) -> Sig:
+    """ECDSA signature of a message provided as byte stream.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    """
+
+    msg_hash = reduce_to_hlen_stream(stream, hf)
+    return sign_(msg_hash, prv_key, nonce, lower_s, ec, hf)
+
+
 def _assert_as_valid_(
     c: int, QJ: JacPoint, r: int, s: int, lower_s: bool, ec: Curve
 ) -> None:
@@ -244,6 +263,24 @@ def verify(
     return verify_(msg_hash, key, sig, lower_s, hf)
 
 
+def verify_stream(
+    stream: ByteStream,
+    key: Key,
+    sig: Union[Sig, Octets],
+    *,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+) -> bool:
+    """ECDSA signature verification of a message provided as byte stream.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    """
+
+    msg_hash = reduce_to_hlen_stream(stream, hf)
+    return verify_(msg_hash, key, sig, lower_s, hf)
+
+
 # TODO: use _recover_pub_key_ to avoid code duplication
 def _recover_pub_keys_(
     c: int, r: int, s: int, lower_s: bool, ec: Curve
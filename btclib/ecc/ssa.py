@@ -54,13 +54,13 @@ from dataclasses import InitVar, dataclass
 from hashlib import sha256
 from typing import List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
-from btclib.alias import BinaryData, HashF, Integer, JacPoint, Octets, Point
+from btclib.alias import BinaryData, ByteStream, HashF, Integer, JacPoint, Octets, Point
 from btclib.bip32.bip32 import BIP32Key
 from btclib.ecc.curve import Curve, secp256k1
 from btclib.ecc.curve_group import _double_mult, _mult, _multi_mult
 from btclib.ecc.number_theory import mod_inv
 from btclib.exceptions import BTClibRuntimeError, BTClibTypeError, BTClibValueError
-from btclib.hashes import reduce_to_hlen, tagged_hash
+from btclib.hashes import reduce_to_hlen, reduce_to_hlen_stream, tagged_hash
 from btclib.to_prv_key import PrvKey, int_from_prv_key
 from btclib.to_pub_key import point_from_pub_key
 from btclib.utils import (
@@ -349,6 +349,24 @@ def sign(
     return sign_(msg_hash, prv_key, nonce, ec, hf)
 
 
+def sign_stream(
+    stream: ByteStream,
+    prv_key: PrvKey,
+    *,
+    nonce: Optional[PrvKey] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+) -> Sig:
+    """Sign a message provided as byte stream according to BIP340.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    """
+
+    msg_hash = reduce_to_hlen_stream(stream, hf)
+    return sign_(msg_hash, prv_key, nonce, ec, hf)
+
+
 def _assert_as_valid_(c: int, QJ: JacPoint, r: int, s: int, ec: Curve) -> None:
     # Private function for test/dev purposes
     # It raises Errors, while verify should always return True or False
@@ -418,6 +436,23 @@ def verify(
     return verify_(msg_hash, Q, sig, hf)
 
 
+def verify_stream(
+    stream: ByteStream,
+    Q: BIP340PubKey,
+    sig: Union[Sig, Octets],
+    *,
+    hf: HashF = sha256,
+) -> bool:
+    """Verify the BIP340 signature of a message provided as byte stream.
+
+    The stream (a binary file object or an iterable of bytes chunks)
+    is hashed incrementally, in bounded memory.
+    """
+
+    msg_hash = reduce_to_hlen_stream(stream, hf)
+    return verify_(msg_hash, Q, sig, hf)
+
+
 def _recover_pub_key_(c: int, r: int, s: int, ec: Curve) -> int:
     # Private function provided for testing purposes only.
 
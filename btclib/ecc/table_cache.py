@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Bounded cache for precomputed tables of point multiples.
+
+Windowed scalar multiplication algorithms use tables
+of multiples of the point being multiplied:
+building them is expensive, so they are cached here.
+
+The cache has a memory budget (estimated bytes):
+when exceeded, the least recently used tables are evicted.
+Pinned tables (e.g. those of curve generators)
+are never evicted and do not count against the budget.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+
+from btclib.exceptions import BTClibValueError
+
+# 32 MiB are about 128 secp256k1 fixed-window tables (w=4)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_Table = TypeVar("_Table")
+
+
+@dataclass(frozen=True)
+class TableCacheInfo:
+    "Statistics of a TableCache."
+
+    hits: int
+    misses: int
+    evictions: int
+    tables: int
+    nbytes: int
+    pinned_tables: int
+    pinned_nbytes: int
+    max_bytes: int
+
+
+def table_nbytes(table: Any) -> int:
+    "Return the estimated memory footprint of a (nested) table of points."
+
+    if isinstance(table, int):
+        return sys.getsizeof(table)
+    # list of points or list of lists of points
+    return sys.getsizeof(table) + sum(table_nbytes(item) for item in table)
+
+
+class TableCache:
+    """Least recently used cache of tables with a memory budget.
+
+    Tables are built on demand by the builder passed to get,
+    so the cache is agnostic about the kind of table it stores.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise BTClibValueError(f"negative max_bytes: {max_bytes}")
+        self._max_bytes = max_bytes
+        self._lock = threading.RLock()
+        # key: [table, nbytes]
+        self._tables: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        self._pinned: Dict[Hashable, List[Any]] = {}
+        self._nbytes = 0
+        self._pinned_nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise BTClibValueError(f"negative max_bytes: {max_bytes}")
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._nbytes > self._max_bytes:
+            _, (_, nbytes) = self._tables.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+    def get(
+        self, key: Hashable, builder: Callable[[], _Table], pinned: bool = False
+    ) -> _Table:
+        """Return the table for key, building it if not available.
+
+        Pinned tables are never evicted and
+        do not count against the memory budget.
+        """
+
+        with self._lock:
+            if key in self._pinned:
+                self.hits += 1
+                return self._pinned[key][0]
+            if key in self._tables:
+                self.hits += 1
+                self._tables.move_to_end(key)
+                return self._tables[key][0]
+            self.misses += 1
+
+        # build outside the lock: concurrent misses might build
+        # the same table twice, but will not block each other
+        table = builder()
+        nbytes = table_nbytes(table)
+
+        with self._lock:
+            if pinned:
+                if key not in self._pinned:
+                    self._pinned[key] = [table, nbytes]
+                    self._pinned_nbytes += nbytes
+            elif nbytes <= self._max_bytes and key not in self._tables:
+                self._tables[key] = [table, nbytes]
+                self._nbytes += nbytes
+                self._evict()
+        return table
+
+    def pin(self, key: Hashable) -> None:
+        "Pin an already cached table, so that it is never evicted."
+
+        with self._lock:
+            if key in self._pinned:
+                return
+            if key not in self._tables:
+                raise BTClibValueError(f"table not cached: {key!r}")
+            entry = self._tables.pop(key)
+            self._nbytes -= entry[1]
+            self._pinned[key] = entry
+            self._pinned_nbytes += entry[1]
+
+    def unpin(self, key: Hashable) -> None:
+        "Unpin a table, making it subject to the memory budget."
+
+        with self._lock:
+            if key not in self._pinned:
+                raise BTClibValueError(f"table not pinned: {key!r}")
+            entry = self._pinned.pop(key)
+            self._pinned_nbytes -= entry[1]
+            self._tables[key] = entry
+            self._nbytes += entry[1]
+            self._evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pinned or key in self._tables
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._tables)
+
+    def keys(self) -> List[Hashable]:
+        "Return the keys of the cached tables, pinned first then LRU order."
+
+        with self._lock:
+            return list(self._pinned) + list(self._tables)
+
+    def info(self) -> TableCacheInfo:
+        with self._lock:
+            return TableCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._tables),
+                self._nbytes,
+                len(self._pinned),
+                self._pinned_nbytes,
+                self._max_bytes,
+            )
+
+    def clear(self, pinned: bool = False) -> None:
+        """Remove all unpinned tables and reset statistics.
+
+        Pinned tables are removed too if pinned is True.
+        """
+
+        with self._lock:
+            self._tables.clear()
+            self._nbytes = 0
+            if pinned:
+                self._pinned.clear()
+                self._pinned_nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# the cache used by the windowed scalar multiplications of btclib.ecc
+TABLE_CACHE = TableCache()
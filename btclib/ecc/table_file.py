@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Binary file format for precomputed fixed-window tables.
+
+The table of a curve generator used by mult_fixed_window_cached
+can be serialized to a compact, memory-mappable file,
+so that it is not to be built again at each process start.
+
+The file is made of a fixed-size header followed by the points
+in affine coordinates, row after row,
+each coordinate being a fixed-width big-endian integer of p_size bytes;
+INF is encoded as a zero y-coordinate.
+
+The header includes a fingerprint of the curve parameters
+and the sha256 checksum of the points, both checked at load time.
+"""
+
+import mmap
+import struct
+from hashlib import sha256
+from os import path
+from typing import TYPE_CHECKING, List, Optional, Union
+
+from btclib.alias import INFJ, JacPoint
+from btclib.exceptions import BTClibValueError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from btclib.ecc.curve_group import CurveGroup
+
+_MAGIC = b"btclibT1"
+# magic, w, p_size, rows, curve fingerprint, points checksum
+_HEADER = struct.Struct("<8sBHH32s32s")
+
+# directories searched (in order) by generator_table_filename
+TABLE_DIRS = [path.join(path.dirname(__file__), "_data")]
+
+
+def _curve_fingerprint(ec) -> bytes:
+    # repr includes p, a, b, and (if available) G, n, and cofactor
+    return sha256(repr(ec).encode("ascii")).digest()
+
+
+def table_rows(ec: "CurveGroup", w: int) -> int:
+    "Return the number of rows of the fixed-window table for w."
+    return (ec.p_size * 8) // w + 1
+
+
+def serialize(table: List[List[JacPoint]], ec: "CurveGroup", w: int) -> bytes:
+    "Return the binary serialization of a fixed-window table."
+
+    rows = table_rows(ec, w)
+    if len(table) != rows or any(len(row) != 2 ** w for row in table):
+        raise BTClibValueError(f"invalid table for w={w}")
+
+    size = ec.p_size
+    points = bytearray()
+    for row in table:
+        for QJ in row:
+            if QJ[2] == 0:  # INFJ
+                points += b"\x00" * (2 * size)
+            else:
+                x, y = ec.aff_from_jac(QJ)
+                points += x.to_bytes(size, byteorder="big", signed=False)
+                points += y.to_bytes(size, byteorder="big", signed=False)
+
+    header = _HEADER.pack(
+        _MAGIC, w, size, rows, _curve_fingerprint(ec), sha256(points).digest()
+    )
+    return header + bytes(points)
+
+
+def parse(
+    data: Union[bytes, mmap.mmap], ec: "CurveGroup", w: int
+) -> List[List[JacPoint]]:
+    """Return the fixed-window table from its binary serialization.
+
+    data can be any bytes-like object, e.g. a memory map.
+    """
+
+    # views are released explicitly, so that a memory map can be closed
+    with memoryview(data) as view:
+        if len(view) < _HEADER.size:
+            raise BTClibValueError(f"invalid table size: {len(view)}")
+        magic, w2, size, rows, fingerprint, checksum = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise BTClibValueError(f"invalid table magic: {magic!r}")
+        if w2 != w:
+            raise BTClibValueError(f"invalid table window: {w2} instead of {w}")
+        if fingerprint != _curve_fingerprint(ec):
+            raise BTClibValueError("table for a different curve")
+        if size != ec.p_size or rows != table_rows(ec, w):
+            raise BTClibValueError("invalid table shape")
+        if len(view) != _HEADER.size + rows * 2 ** w * 2 * size:
+            raise BTClibValueError(f"invalid table size: {len(view)}")
+
+        with view[_HEADER.size :] as points:
+            if sha256(points).digest() != checksum:
+                raise BTClibValueError("invalid table checksum")
+            coords = points.tobytes()
+
+    table: List[List[JacPoint]] = []
+    i = 0
+    for _ in range(rows):
+        row: List[JacPoint] = []
+        for _ in range(2 ** w):
+            x = int.from_bytes(coords[i : i + size], byteorder="big", signed=False)
+            i += size
+            y = int.from_bytes(coords[i : i + size], byteorder="big", signed=False)
+            i += size
+            row.append((x, y, 1) if y else INFJ)
+        table.append(row)
+    return table
+
+
+def save(table: List[List[JacPoint]], ec: "CurveGroup", filename: str, w: int) -> None:
+    "Save the fixed-window table to file."
+
+    data = serialize(table, ec, w)
+    with open(filename, "wb") as file_:
+        file_.write(data)
+
+
+def load(filename: str, ec: "CurveGroup", w: int) -> List[List[JacPoint]]:
+    "Load the fixed-window table from a memory-mapped file."
+
+    with open(filename, "rb") as file_:
+        if path.getsize(filename) == 0:
+            raise BTClibValueError("invalid table size: 0")
+        with mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse(mm, ec, w)
+
+
+def generator_table_basename(ec: "CurveGroup", w: int) -> str:
+    if getattr(ec, "name", None) is None:
+        raise BTClibValueError("unnamed curve")
+    return f"{getattr(ec, 'name')}_fixwind_w{w}.bin"
+
+
+def generator_table_filename(ec: "CurveGroup", w: int) -> Optional[str]:
+    """Return the file of the generator table in TABLE_DIRS, if any.
+
+    None is returned for unnamed curves.
+    """
+
+    if getattr(ec, "name", None) is None:
+        return None
+    basename = generator_table_basename(ec, w)
+    for dirname in TABLE_DIRS:
+        filename = path.join(dirname, basename)
+        if path.isfile(filename):
+            return filename
+    return None
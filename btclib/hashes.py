@@ -13,10 +13,13 @@
 """
 
 import hashlib
-from typing import Optional, Tuple
+from io import SEEK_END
+from typing import Iterator, Optional, Tuple
 
-from btclib.alias import HashF, Octets
+from btclib import var_int
+from btclib.alias import ByteStream, HashF, Octets
 from btclib.ecc.curve import Curve, secp256k1
+from btclib.exceptions import BTClibValueError
 from btclib.to_pub_key import Key, pub_keyinfo_from_key
 from btclib.utils import bytes_from_octets, hash160, int_from_bits
 
@@ -45,6 +48,37 @@ def fingerprint(key: Key, network: Optional[str] = None) -> bytes:
     return hash160(pub_key)[:4]
 
 
+# size of the chunks read from binary file objects when streaming
+CHUNK_SIZE = 1 << 20
+
+MAGIC_PREFIX = b"\x18Bitcoin Signed Message:\n"
+
+
+def _chunks(stream: ByteStream) -> Iterator[bytes]:
+    "Yield the chunks of a binary file object or of an iterable of bytes."
+
+    if hasattr(stream, "read"):
+        read = stream.read  # type: ignore
+        chunk = read(CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = read(CHUNK_SIZE)
+    else:
+        yield from stream  # type: ignore
+
+
+def _remaining_size(stream: ByteStream) -> int:
+    "Return the number of bytes left in a seekable binary file object."
+
+    seekable = getattr(stream, "seekable", None)
+    if seekable is None or not seekable():
+        raise BTClibValueError("message length required for non-seekable stream")
+    pos = stream.tell()  # type: ignore
+    end = stream.seek(0, SEEK_END)  # type: ignore
+    stream.seek(pos)  # type: ignore
+    return end - pos
+
+
 def reduce_to_hlen(msg: Octets, hf: HashF = hashlib.sha256) -> bytes:
 
     msg = bytes_from_octets(msg)
@@ -54,17 +88,46 @@ def reduce_to_hlen(msg: Octets, hf: HashF = hashlib.sha256) -> bytes:
     return h.digest()
 
 
+def reduce_to_hlen_stream(stream: ByteStream, hf: HashF = hashlib.sha256) -> bytes:
+    """Return the hf digest of a message provided as byte stream.
+
+    The stream is hashed incrementally, in bounded memory;
+    the result is the same as reduce_to_hlen of the whole message.
+    """
+
+    h = hf()
+    for chunk in _chunks(stream):
+        h.update(chunk)
+    return h.digest()
+
+
 def magic_message(msg: Octets) -> bytes:
 
     msg = bytes_from_octets(msg)
-    t = (
-        b"\x18Bitcoin Signed Message:\n"
-        + len(msg).to_bytes(1, byteorder="big", signed=False)
-        + msg
-    )
+    t = MAGIC_PREFIX + var_int.serialize(len(msg)) + msg
     return hashlib.sha256(t).digest()
 
 
+def magic_message_stream(stream: ByteStream, msg_len: Optional[int] = None) -> bytes:
+    """Return the magic message hash of a message provided as byte stream.
+
+    The message length precedes the message in the magic message,
+    so it must be provided unless the stream is a seekable file object,
+    in which case the bytes from the current position to the end are used.
+    """
+
+    if msg_len is None:
+        msg_len = _remaining_size(stream)
+    h = hashlib.sha256(MAGIC_PREFIX + var_int.serialize(msg_len))
+    size = 0
+    for chunk in _chunks(stream):
+        h.update(chunk)
+        size += len(chunk)
+    if size != msg_len:
+        raise BTClibValueError(f"message length mismatch: {size} instead of {msg_len}")
+    return h.digest()
+
+
 # FIXME move into ecc folder
 def challenge_(
     msg_hash: Octets, ec: Curve = secp256k1, hf: HashF = hashlib.sha256
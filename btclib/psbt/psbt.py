@@ -207,7 +207,7 @@ class Psbt:
     ) -> _Psbt:
 
         return cls(
-            Tx.from_dict(dict_["tx"]),
+            Tx.from_dict(dict_["tx"], False),
             [PsbtIn.from_dict(psbt_in, False) for psbt_in in dict_["inputs"]],
             [PsbtOut.from_dict(psbt_out, False) for psbt_out in dict_["outputs"]],
             dict_["version"],
@@ -267,7 +267,7 @@ class Psbt:
             if k[:1] == PSBT_GLOBAL_UNSIGNED_TX:
                 if tx.vin:
                     raise BTClibValueError("duplicate Psbt unsigned tx")
-                tx = deserialize_tx(k, v, "global unsigned tx")
+                tx = deserialize_tx(k, v, "global unsigned tx", check_validity)
             elif k[:1] == PSBT_GLOBAL_VERSION:
                 if version:
                     raise BTClibValueError("duplicate Psbt version")
@@ -275,7 +275,7 @@ class Psbt:
             elif k[:1] == PSBT_GLOBAL_XPUB:
                 if k[1:] in hd_key_paths:
                     raise BTClibValueError("duplicate xpub in Psbt hd_key_path")
-                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v)
+                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v, check_validity)
             else:  # unknown
                 if k in unknown:
                     raise BTClibValueError("duplicate Psbt unknown")
@@ -284,12 +284,12 @@ class Psbt:
         inputs: List[PsbtIn] = []
         for _ in tx.vin:
             input_map, psbt_bin = deserialize_map(psbt_bin)
-            inputs.append(PsbtIn.parse(input_map))
+            inputs.append(PsbtIn.parse(input_map, check_validity))
 
         outputs: List[PsbtOut] = []
         for _ in tx.vout:
             output_map, psbt_bin = deserialize_map(psbt_bin)
-            outputs.append(PsbtOut.parse(output_map))
+            outputs.append(PsbtOut.parse(output_map, check_validity))
 
         return cls(
             tx,
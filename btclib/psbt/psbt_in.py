@@ -66,22 +66,22 @@ PSBT_IN_FINAL_SCRIPTWITNESS = b"\x08"
 # PSBT_IN_PROPRIETARY = b"\xfc"
 
 
-def deserialize_tx(k: bytes, v: bytes, type_: str) -> Tx:
+def deserialize_tx(k: bytes, v: bytes, type_: str, check_validity: bool = True) -> Tx:
     "Return the dataclass element from its binary representation."
 
     if len(k) != 1:
         err_msg = f"invalid {type_} key length: {len(k)}"
         raise BTClibValueError(err_msg)
-    return Tx.parse(v)
+    return Tx.parse(v, check_validity)
 
 
-def _deserialize_witness_utxo(k: bytes, v: bytes) -> TxOut:
+def _deserialize_witness_utxo(k: bytes, v: bytes, check_validity: bool) -> TxOut:
     "Return the dataclass element from its binary representation."
 
     if len(k) != 1:
         err_msg = f"invalid witness-utxo key length: {len(k)}"
         raise BTClibValueError(err_msg)
-    return TxOut.parse(v)
+    return TxOut.parse(v, check_validity)
 
 
 def _assert_valid_partial_sigs(partial_sigs: Mapping[bytes, bytes]) -> None:
@@ -116,13 +116,15 @@ def _assert_valid_final_script_sig(final_script_sig: bytes) -> None:
     bytes(final_script_sig)
 
 
-def _deserialize_final_script_witness(k: bytes, v: bytes) -> Witness:
+def _deserialize_final_script_witness(
+    k: bytes, v: bytes, check_validity: bool
+) -> Witness:
     "Return the dataclass element from its binary representation."
 
     if len(k) != 1:
         err_msg = f"invalid final script witness key length: {len(k)}"
         raise BTClibValueError(err_msg)
-    return Witness.parse(v)
+    return Witness.parse(v, check_validity)
 
 
 _PsbtIn = TypeVar("_PsbtIn", bound="PsbtIn")
@@ -327,11 +329,13 @@ class PsbtIn:
             if k[:1] == PSBT_IN_NON_WITNESS_UTXO:
                 if non_witness_utxo:
                     raise BTClibValueError("duplicate PsbtIn non_witness_utxo")
-                non_witness_utxo = deserialize_tx(k, v, "non-witness utxo")
+                non_witness_utxo = deserialize_tx(
+                    k, v, "non-witness utxo", check_validity
+                )
             elif k[:1] == PSBT_IN_WITNESS_UTXO:
                 if witness_utxo:
                     raise BTClibValueError("duplicate PsbtIn witness_utxo")
-                witness_utxo = _deserialize_witness_utxo(k, v)
+                witness_utxo = _deserialize_witness_utxo(k, v, check_validity)
             elif k[:1] == PSBT_IN_PARTIAL_SIG:
                 if k[1:] in partial_sigs:
                     raise BTClibValueError("duplicate PsbtIn partial_sigs")
@@ -351,7 +355,7 @@ class PsbtIn:
             elif k[:1] == PSBT_IN_BIP32_DERIVATION:
                 if k[1:] in hd_key_paths:
                     raise BTClibValueError("duplicate pub_key in PsbtIn hd_key_path")
-                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v)
+                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v, check_validity)
             elif k[:1] == PSBT_IN_FINAL_SCRIPTSIG:
                 if final_script_sig:
                     raise BTClibValueError("duplicate PsbtIn final_script_sig")
@@ -359,7 +363,9 @@ class PsbtIn:
             elif k[:1] == PSBT_IN_FINAL_SCRIPTWITNESS:
                 if final_script_witness:
                     raise BTClibValueError("duplicate PsbtIn final_script_witness")
-                final_script_witness = _deserialize_final_script_witness(k, v)
+                final_script_witness = _deserialize_final_script_witness(
+                    k, v, check_validity
+                )
             else:  # unknown
                 if k in unknown:
                     raise BTClibValueError("duplicate PsbtIn unknown")
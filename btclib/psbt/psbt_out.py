@@ -236,7 +236,7 @@ class PsbtOut:
                 #  parse just one hd key path at time :-(
                 if k[1:] in hd_key_paths:
                     raise BTClibValueError("duplicate pub_key in PsbtOut hd_key_path")
-                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v)
+                hd_key_paths[k[1:]] = BIP32KeyOrigin.parse(v, check_validity)
             else:  # unknown
                 if k in unknown:
                     raise BTClibValueError("duplicate PsbtOut unknown")
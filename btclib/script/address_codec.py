@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Address to/from script_pub_key conversions, one by one or in batches.
+
+decode is equivalent to ScriptPubKey.from_address,
+returning script_pub_key and network,
+while encode is equivalent to script_pub_key.address.
+
+Network prefixes are looked up in dictionaries built once,
+instead of scanning all the networks for each address.
+In batches, invalid addresses are returned as the ValueError
+they raised, without aborting the batch.
+
+An AddressCodec adds bounded LRU caches, in both directions,
+with hit and miss statistics.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from btclib import b32
+from btclib.alias import Octets, String
+from btclib.base58 import b58decode, b58encode
+from btclib.exceptions import BTClibValueError
+from btclib.network import NETWORKS
+from btclib.script.op_codes import op_int
+from btclib.script.script import serialize
+from btclib.script.script_pub_key import _type_and_payload
+from btclib.utils import bytes_from_octets
+
+# base58 address prefix: (script_type, network)
+# as in b58.h160_from_address, the first matching network is used
+_B58_PREFIXES: Dict[bytes, Tuple[str, str]] = {}
+for _script_type in ("p2pkh", "p2sh"):
+    for _network, _network_data in NETWORKS.items():
+        _prefix = getattr(_network_data, _script_type)
+        _B58_PREFIXES.setdefault(_prefix, (_script_type, _network))
+
+_SEGWIT_PREFIXES = tuple(network.hrp + "1" for network in NETWORKS.values())
+
+
+def _decode(address: String) -> Tuple[bytes, str]:
+
+    if isinstance(address, bytes):
+        address = address.decode("ascii")
+    address = address.strip()
+
+    if address.lower().startswith(_SEGWIT_PREFIXES):
+        wit_ver, wit_prg, network = b32.witness_from_address(address)
+        return serialize([op_int(wit_ver), wit_prg]), network
+
+    payload = b58decode(address, 21)
+    prefix = payload[:1]
+    if prefix not in _B58_PREFIXES:
+        err_msg = f"invalid base58 address prefix: 0x{prefix.hex()}"
+        raise BTClibValueError(err_msg)
+    script_type, network = _B58_PREFIXES[prefix]
+    if script_type == "p2pkh":
+        return b"\x76\xa9\x14" + payload[1:] + b"\x88\xac", network
+    return b"\xa9\x14" + payload[1:] + b"\x87", network
+
+
+def _encode(script_pub_key: bytes, network: str) -> str:
+
+    script_type, payload = _type_and_payload(script_pub_key)
+    if script_type in ("p2pkh", "p2sh"):
+        prefix = getattr(NETWORKS[network], script_type)
+        return b58encode(prefix + payload).decode("ascii")
+    if script_type in ("p2wpkh", "p2wsh"):
+        return b32.address_from_witness(0, payload, network)
+    return ""
+
+
+def _check_network(network: str) -> None:
+    if network not in NETWORKS:
+        raise BTClibValueError(f"unknown network: {network}")
+
+
+def decode(address: String) -> Tuple[bytes, str]:
+    "Return script_pub_key and network of the address."
+    return _decode(address)
+
+
+def encode(script_pub_key: Octets, network: str = "mainnet") -> str:
+    "Return the address of the script_pub_key, if any, or an empty string."
+    _check_network(network)
+    return _encode(bytes_from_octets(script_pub_key), network)
+
+
+def decode_many(
+    addresses: Iterable[String],
+) -> List[Union[Tuple[bytes, str], ValueError]]:
+    """Return script_pub_key and network of each address.
+
+    Invalid addresses are returned as the ValueError they raised.
+    """
+    return _decode_many(_decode, addresses)
+
+
+def encode_many(
+    script_pub_keys: Iterable[Octets], network: str = "mainnet"
+) -> List[str]:
+    "Return the address of each script_pub_key, if any, or an empty string."
+    _check_network(network)
+    return [_encode(bytes_from_octets(s), network) for s in script_pub_keys]
+
+
+def _decode_many(
+    decode_: Any, addresses: Iterable[String]
+) -> List[Union[Tuple[bytes, str], ValueError]]:
+
+    results: List[Union[Tuple[bytes, str], ValueError]] = []
+    for address in addresses:
+        try:
+            results.append(decode_(address))
+        except ValueError as e:
+            results.append(e)
+    return results
+
+
+class AddressCodec:
+    """Address to/from script_pub_key conversions with LRU caches.
+
+    Each direction caches up to maxsize results,
+    with maxsize=0 meaning no caching (but statistics).
+    Only valid addresses are cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024) -> None:
+        self._decode = lru_cache(maxsize=maxsize)(_decode)
+        self._encode = lru_cache(maxsize=maxsize)(_encode)
+
+    def decode(self, address: String) -> Tuple[bytes, str]:
+        "Return script_pub_key and network of the address."
+        return self._decode(address)
+
+    def encode(self, script_pub_key: Octets, network: str = "mainnet") -> str:
+        "Return the address of the script_pub_key, if any, or an empty string."
+        _check_network(network)
+        return self._encode(bytes_from_octets(script_pub_key), network)
+
+    def decode_many(
+        self, addresses: Iterable[String]
+    ) -> List[Union[Tuple[bytes, str], ValueError]]:
+        """Return script_pub_key and network of each address.
+
+        Invalid addresses are returned as the ValueError they raised.
+        """
+        return _decode_many(self._decode, addresses)
+
+    def encode_many(
+        self, script_pub_keys: Iterable[Octets], network: str = "mainnet"
+    ) -> List[str]:
+        "Return the address of each script_pub_key, if any, or an empty string."
+        _check_network(network)
+        encode_ = self._encode
+        return [encode_(bytes_from_octets(s), network) for s in script_pub_keys]
+
+    def cache_info(self) -> Dict[str, Dict[str, Any]]:
+        "Return hits, misses, maxsize, and currsize of both caches."
+        return {
+            "decode": self._decode.cache_info()._asdict(),
+            "encode": self._encode.cache_info()._asdict(),
+        }
+
+    def cache_clear(self) -> None:
+        "Clear both caches and their statistics."
+        self._decode.cache_clear()
+        self._encode.cache_clear()
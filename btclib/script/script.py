@@ -18,12 +18,17 @@ Scripts are represented by List[Command], where Command = Union[int, str, bytes]
   anyway, the use of the corresponding operator is to be preferred.
 * ascii str are for opcodes (e.g. 'OP_HASH160', 'OP_1', 'OP_1NEGATE', etc.)
 * hex-string or bytes (i.e., Octets) are for data
+
+tokenize is the low-level alternative to parse:
+it yields (opcode, data, offset) directly over the script buffer,
+without converting data to hex-strings or integers.
 """
 
 from dataclasses import dataclass
-from typing import List, Sequence, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
-from btclib.alias import BinaryData, Octets
+from btclib.alias import BinaryData, Buffer, Octets
+from btclib.exceptions import BTClibValueError
 from btclib.script.op_codes import (
     OP_CODE_NAMES,
     decode_num,
@@ -31,9 +36,16 @@ from btclib.script.op_codes import (
     op_pushdata,
     op_str,
 )
-from btclib.utils import bytes_from_octets, bytesio_from_binarydata
+from btclib.utils import bytes_from_octets
 
 Command = Union[int, str, bytes]
+Token = Tuple[int, Optional[memoryview], int]
+
+# OP_PUSHDATA1, OP_PUSHDATA2, and OP_PUSHDATA4 data-length sizes
+_PUSHDATA_LENGTH_SIZE = {76: 1, 77: 2, 78: 4}
+
+# because of the 520 bytes limit, see op_pushdata
+_MAX_PUSH_SIZE = 520
 
 
 def serialize(script: Sequence[Command]) -> bytes:
@@ -50,48 +62,60 @@ def serialize(script: Sequence[Command]) -> bytes:
     return b"".join(r)
 
 
+def tokenize(script: Union[Octets, Buffer]) -> Iterator[Token]:
+    """Yield (opcode, data, offset) for each script operation.
+
+    data is a memoryview of the pushed data,
+    None for the non-push opcodes (including OP_0);
+    offset is the one of the opcode.
+    As in parse, truncated pushes yield the available data.
+    """
+
+    if isinstance(script, str):  # hex string
+        script = bytes_from_octets(script)
+    view = memoryview(script)
+    n = len(view)
+    i = 0
+    while i < n:
+        op = view[i]
+        start = i + 1
+        if 0 < op < 76:
+            # 1-byte-data-length | data
+            end = start + op
+        elif 75 < op < 79:
+            # OP_PUSHDATA | 1/2/4-byte-data-length | data
+            start += _PUSHDATA_LENGTH_SIZE[op]
+            end = start + int.from_bytes(view[i + 1 : start], byteorder="little")
+        else:
+            # OP_CODE
+            yield op, None, i
+            i = start
+            continue
+        yield op, view[start:end], i
+        i = end
+
+
 def parse(stream: BinaryData) -> List[Command]:
 
-    s = bytesio_from_binarydata(stream)
-    # initialize the result list
+    if not isinstance(stream, (str, bytes)):  # binary stream
+        stream = stream.read()
     r: List[Command] = []
-    while True:
-        # get one byte
-        t = s.read(1)
-        if not t:
-            break
-        # convert the byte to an integer
-        i = t[0]
-        if 0 < i < 76:
-            # 1-byte-data-length | data
-            data = s.read(i)
+    for op, data, _ in tokenize(stream):
+        if data is None:
+            r.append(OP_CODE_NAMES[op])
+        elif op < 6:
             # if <= 0xFFFFFFFF, parse it as integer
-            as_int = decode_num(data)
-            r.append(as_int if i < 6 and as_int <= 0xFFFFFFFF else data.hex().upper())
-        elif i == 76:
-            # OP_PUSHDATA1 | 1-byte-data-length | data
-            data_length = int.from_bytes(s.read(1), byteorder="little", signed=False)
-            data = s.read(data_length)
-            r.append(data.hex().upper())
-        elif i == 77:
-            # OP_PUSHDATA2 | 2-byte-data-length | data
-            data_length = int.from_bytes(s.read(2), byteorder="little", signed=False)
-            data = s.read(data_length)
-            r.append(data.hex().upper())
-        elif i == 78:
-            # OP_PUSHDATA4 | 4-byte-data-length | data
-            data_length = int.from_bytes(s.read(4), byteorder="little", signed=False)
-            data = s.read(data_length)
-            r.append(data.hex().upper())
+            as_int = decode_num(bytes(data))
+            r.append(as_int if as_int <= 0xFFFFFFFF else data.hex().upper())
         else:
-            # OP_CODE
-            r.append(OP_CODE_NAMES[i])
-
+            r.append(data.hex().upper())
     return r
 
 
 @dataclass
 class Script:
+    __slots__ = ("script",)
+
     # Bitcoin script expressed as List[Command]
     # e.g. [OP_HASH160, script_h160, OP_EQUAL]
     # or Octets of its byte-encoded representation
@@ -115,4 +139,11 @@ class Script:
             self.assert_valid()
 
     def assert_valid(self) -> None:
-        serialize(self.asm)
+        # as serialize(self.asm), without parsing and serializing
+        for op, data, _ in tokenize(self.script):
+            if data is None:
+                if op not in OP_CODE_NAMES:
+                    raise BTClibValueError(f"invalid opcode: {op}")
+            elif len(data) > _MAX_PUSH_SIZE:
+                err_msg = f"too many bytes for OP_PUSHDATA: {len(data)}"
+                raise BTClibValueError(err_msg)
@@ -10,18 +10,28 @@
 
 "ScriptPubKey class and functions."
 
-from typing import Callable, List, Optional, Sequence, Tuple, Type, TypeVar
-
-from btclib import b32, b58, var_bytes
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from btclib import b32, b58
 from btclib.alias import Octets, String
 from btclib.ecc.sec_point import point_from_octets
 from btclib.exceptions import BTClibValueError
 from btclib.hashes import hash160_from_key
 from btclib.network import NETWORKS
 from btclib.script.op_codes import op_int
-from btclib.script.script import Command, Script, serialize
+from btclib.script.script import Command, Script, serialize, tokenize
 from btclib.to_pub_key import Key, pub_keyinfo_from_key
-from btclib.utils import bytes_from_octets, bytesio_from_binarydata, hash160, sha256
+from btclib.utils import bytes_from_octets, hash160, sha256
 
 
 def address(script_pub_key: Octets, network: str = "mainnet") -> str:
@@ -57,10 +67,13 @@ def addresses(script_pub_key: Octets, network: str = "mainnet") -> List[str]:
     if not m <= n < 17:
         raise BTClibValueError(f"invalid m-of-n: {m}-of-{n}")
 
-    stream = bytesio_from_binarydata(script_pub_key[1:-2])
-    pub_keys = [var_bytes.parse(stream) for _ in range(n)]
-
-    if stream.read(1):
+    pub_keys: List[bytes] = []
+    for op, data, _ in tokenize(script_pub_key[1:-2]):
+        # only complete 1-byte-data-length pushes
+        if data is None or op > 75 or len(data) != op:
+            raise BTClibValueError("invalid p2ms script_pub_key size")
+        pub_keys.append(bytes(data))
+    if len(pub_keys) != n:
         raise BTClibValueError("invalid p2ms script_pub_key size")
 
     return [b58.p2pkh(pub_key, network) for pub_key in pub_keys]
@@ -215,60 +228,162 @@ def is_p2wsh(script_pub_key: Octets) -> bool:
     return _is_funct(assert_p2wsh, script_pub_key)
 
 
-def type_and_payload(script_pub_key: Octets) -> Tuple[str, bytes]:
-    "Return (script_pub_key type, payload) from the input script_pub_key."
+def _is_pub_key(pub_key: bytes) -> bool:
+    # raising only for invalid keys, i.e. not for valid script_pub_keys
+    try:
+        point_from_octets(pub_key)
+    except BTClibValueError:
+        return False
+    return True
 
-    script_pub_key = bytes_from_octets(script_pub_key)
 
-    if is_p2wpkh(script_pub_key):
-        # p2wpkh [OP_0, pub_key_hash]
-        # 0x0014{20-byte pub_key_hash}
-        return "p2wpkh", script_pub_key[2:]
+def _p2wpkh_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2wpkh [OP_0, pub_key_hash]
+    # 0x0014{20-byte pub_key_hash}
+    return script_pub_key[2:] if script_pub_key[1] == 0x14 else None
 
-    if is_p2wsh(script_pub_key):
-        # p2wsh [OP_0, script_hash]
-        # 0x0020{32-byte script_hash}
-        return "p2wsh", script_pub_key[2:]
 
-    if is_p2pk(script_pub_key):
-        # p2pk [pub_key, OP_CHECKSIG]
-        # 0x41{65-byte pub_key}AC or 0x21{33-byte pub_key}AC
-        return "p2pk", script_pub_key[1:-1]
+def _p2wsh_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2wsh [OP_0, script_hash]
+    # 0x0020{32-byte script_hash}
+    return script_pub_key[2:] if script_pub_key[1] == 0x20 else None
 
-    if is_p2ms(script_pub_key):
-        # p2ms [m, pub_keys, n, OP_CHECKMULTISIG]
-        return "p2ms", script_pub_key[:-1]
 
-    length = len(script_pub_key)
+def _p2pk_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2pk [pub_key, OP_CHECKSIG]
+    # 0x41{65-byte pub_key}AC or 0x21{33-byte pub_key}AC
+    if script_pub_key[-1] != 0xAC:
+        return None
+    pub_key = script_pub_key[1:-1]
+    return pub_key if _is_pub_key(pub_key) else None
+
+
+def _p2pkh_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2pkh [OP_DUP, OP_HASH160, pub_key_hash, OP_EQUALVERIFY, OP_CHECKSIG]
+    # 0x76A914{20-byte pub_key_hash}88AC
+    if script_pub_key[1:3] != b"\xa9\x14" or script_pub_key[-2:] != b"\x88\xac":
+        return None
+    return script_pub_key[3:-2]
+
+
+def _p2sh_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2sh [OP_HASH160, script_hash, OP_EQUAL]
+    # 0xA914{20-byte script_hash}87
+    if script_pub_key[1] != 0x14 or script_pub_key[-1] != 0x87:
+        return None
+    return script_pub_key[2:-1]
 
-    if is_nulldata(script_pub_key):
-        # nulldata [OP_RETURN, data]
-        if length < 78:
-            # OP_RETURN, data length, data up to 75 bytes max
-            # 0x6A{1 byte data-length}{data (0-75 bytes)}
-            return "nulldata", script_pub_key[2:]
 
+def _p2ms_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # p2ms [m, pub_keys, n, OP_CHECKMULTISIG]
+    if len(script_pub_key) < 37 or script_pub_key[-1] != 0xAE:
+        return None
+    m = script_pub_key[0] - 80
+    n = script_pub_key[-2] - 80
+    if not 0 < m <= n < 17:
+        return None
+    n_pub_keys = 0
+    for op, data, _ in tokenize(memoryview(script_pub_key)[1:-2]):
+        if data is None or op > 75 or len(data) != op:
+            return None
+        if not _is_pub_key(bytes(data)):
+            return None
+        n_pub_keys += 1
+    return script_pub_key[:-1] if n_pub_keys == n else None
+
+
+def _nulldata_payload(script_pub_key: bytes) -> Optional[bytes]:
+    # nulldata [OP_RETURN, data]
+    length = len(script_pub_key)
+    if length < 78:
+        # OP_RETURN, data length, data up to 75 bytes max
+        # 0x6A{1 byte data-length}{data (0-75 bytes)}
+        if length > 1 and script_pub_key[1] == length - 2:
+            return script_pub_key[2:]
+    elif 78 < length < 84:
         # OP_RETURN, OP_PUSHDATA1, data length, data min 76 bytes up to 80
         # 0x6A4C{1-byte data-length}{data (76-80 bytes)}
-        return "nulldata", script_pub_key[3:]
+        if script_pub_key[1] == 0x4C and script_pub_key[2] == length - 3:
+            return script_pub_key[3:]
+    return None
+
+
+_PayloadFunct = Callable[[bytes], Optional[bytes]]
+
+# dispatch tables: (length, leading opcode) for fixed-length templates
+_FIXED_LENGTH_TEMPLATES: Dict[Tuple[int, int], Tuple[str, _PayloadFunct]] = {
+    (22, 0x00): ("p2wpkh", _p2wpkh_payload),
+    (34, 0x00): ("p2wsh", _p2wsh_payload),
+    (35, 0x21): ("p2pk", _p2pk_payload),
+    (67, 0x41): ("p2pk", _p2pk_payload),
+    (25, 0x76): ("p2pkh", _p2pkh_payload),
+    (23, 0xA9): ("p2sh", _p2sh_payload),
+}
+# leading opcode for variable-length templates: OP_RETURN and OP_1-OP_16
+_TEMPLATES: Dict[int, Tuple[str, _PayloadFunct]] = {
+    0x6A: ("nulldata", _nulldata_payload),
+    **{op: ("p2ms", _p2ms_payload) for op in range(0x51, 0x61)},
+}
+
+SCRIPT_TYPES = (
+    "p2pk",
+    "p2pkh",
+    "p2sh",
+    "p2ms",
+    "nulldata",
+    "p2wpkh",
+    "p2wsh",
+    "unknown",
+)
+_SCRIPT_TYPE_INDEX = {script_type: i for i, script_type in enumerate(SCRIPT_TYPES)}
+
+
+def _type_and_payload(script_pub_key: bytes) -> Tuple[str, bytes]:
+    if script_pub_key:
+        key = len(script_pub_key), script_pub_key[0]
+        template = _FIXED_LENGTH_TEMPLATES.get(key) or _TEMPLATES.get(key[1])
+        if template:
+            script_type, payload_funct = template
+            payload = payload_funct(script_pub_key)
+            if payload is not None:
+                return script_type, payload
+    return "unknown", script_pub_key
 
-    if is_p2pkh(script_pub_key):
-        # p2pkh [OP_DUP, OP_HASH160, pub_key_hash, OP_EQUALVERIFY, OP_CHECKSIG]
-        # 0x76A914{20-byte pub_key_hash}88AC
-        return "p2pkh", script_pub_key[3 : length - 2]
 
-    if is_p2sh(script_pub_key):
-        # p2sh [OP_HASH160, script_hash, OP_EQUAL]
-        # 0xA914{20-byte script_hash}87
-        return "p2sh", script_pub_key[2 : length - 1]
+def type_and_payload(script_pub_key: Octets) -> Tuple[str, bytes]:
+    """Return (script_pub_key type, payload) from the input script_pub_key.
+
+    The script_pub_key is classified in a single pass,
+    dispatching on its length and leading opcode.
+    """
+
+    return _type_and_payload(bytes_from_octets(script_pub_key))
 
-    return "unknown", script_pub_key
+
+def type_and_payload_many(
+    script_pub_keys: Iterable[Octets],
+) -> Tuple[bytes, List[bytes]]:
+    """Return types and payloads of many script_pub_keys.
+
+    Types are returned compactly, one byte per script_pub_key
+    being the index of the type in SCRIPT_TYPES.
+    """
+
+    types = bytearray()
+    payloads: List[bytes] = []
+    for script_pub_key in script_pub_keys:
+        script_type, payload = _type_and_payload(bytes_from_octets(script_pub_key))
+        types.append(_SCRIPT_TYPE_INDEX[script_type])
+        payloads.append(payload)
+    return bytes(types), payloads
 
 
 _ScriptPubKey = TypeVar("_ScriptPubKey", bound="ScriptPubKey")
 
 
 class ScriptPubKey(Script):
+    __slots__ = ("network",)
+
     network: str
 
     @property
@@ -22,6 +22,8 @@ _Witness = TypeVar("_Witness", bound="Witness")
 
 @dataclass
 class Witness:
+    __slots__ = ("stack",)
+
     stack: List[bytes]
 
     def __init__(
@@ -37,6 +39,13 @@ class Witness:
     def __len__(self) -> int:
         return len(self.stack)
 
+    @property
+    def size(self) -> int:
+        "Return the serialization size, without serializing."
+        return var_int.size(len(self.stack)) + sum(
+            var_bytes.size(w) for w in self.stack
+        )
+
     def assert_valid(self) -> None:
         for stack_element in self.stack:
             bytes(stack_element)
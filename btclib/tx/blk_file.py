@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Bitcoin Core blk*.dat block files.
+
+Each block is stored as network magic bytes,
+block size (4 bytes, unsigned little endian), and serialized block;
+the unused space preallocated at the end of a file is zero-filled
+(also in obfuscated files, as it is never written).
+
+Block files may be obfuscated, XOR-ing them with the 8 bytes key
+stored in the xor.dat file of the blocks directory.
+
+Files are memory-mapped and block boundaries are indexed
+reading only the 8 bytes of each block framing:
+blocks are parsed only when required.
+"""
+
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import listdir, path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from btclib.alias import Octets
+from btclib.exceptions import BTClibValueError
+from btclib.network import NETWORKS
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.blocks import Block
+from btclib.utils import bytes_from_octets
+
+XOR_KEY_SIZE = 8
+
+_BLK_FILENAME = re.compile(r"^blk(\d+)\.dat$")
+
+
+def read_xor_key(blocks_dir: str) -> bytes:
+    "Return the obfuscation key of the blocks directory (empty if none)."
+
+    filename = path.join(blocks_dir, "xor.dat")
+    if not path.isfile(filename):
+        return b""
+    with open(filename, "rb") as file_:
+        return file_.read()
+
+
+def blk_filenames(blocks_dir: str) -> List[str]:
+    "Return the blk*.dat files of the blocks directory, sorted by number."
+
+    numbered = []
+    for basename in listdir(blocks_dir):
+        match = _BLK_FILENAME.match(basename)
+        if match:
+            numbered.append((int(match.group(1)), path.join(blocks_dir, basename)))
+    return [filename for _, filename in sorted(numbered)]
+
+
+def xor(data: bytes, key: bytes, offset: int = 0) -> bytes:
+    """Return data, found at offset in a file, XOR-ed with the file key.
+
+    As XOR is its own inverse, it both obfuscates and deobfuscates.
+    """
+
+    if not any(key):
+        return data
+    n = len(data)
+    shift = offset % len(key)
+    key_stream = (key[shift:] + key[:shift]) * (n // len(key) + 1)
+    result = int.from_bytes(data, "big") ^ int.from_bytes(key_stream[:n], "big")
+    return result.to_bytes(n, "big")
+
+
+class BlkFile:
+    """Memory-mapped Bitcoin Core blk*.dat file.
+
+    It should be used as context manager, to release the memory map:
+
+        with BlkFile(filename, xor_key=read_xor_key(blocks_dir)) as blk_file:
+            for header in blk_file.headers():
+                ...
+    """
+
+    def __init__(
+        self, filename: str, network: str = "mainnet", xor_key: Octets = b""
+    ) -> None:
+
+        self.filename = filename
+        # magic_bytes are stored as a big endian number
+        self.magic = NETWORKS[network].magic_bytes[::-1]
+        self.xor_key = bytes_from_octets(xor_key)
+        if len(self.xor_key) not in (0, XOR_KEY_SIZE):
+            raise BTClibValueError(f"invalid xor key size: {len(self.xor_key)}")
+
+        self._spans: Optional[List[Tuple[int, int]]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        if path.getsize(filename):
+            with open(filename, "rb") as file_:
+                self._mmap = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "BlkFile":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _read(self, offset: int, size: int) -> bytes:
+        if self._mmap is None:
+            return b""
+        return xor(self._mmap[offset : offset + size], self.xor_key, offset)
+
+    def spans(self) -> List[Tuple[int, int]]:
+        """Return offset and size of each block in the file.
+
+        The offset is the one of the serialized block,
+        i.e. after magic bytes and block size.
+        Blocks are not parsed: only their framing is read.
+        """
+
+        if self._spans is not None:
+            return self._spans
+
+        spans: List[Tuple[int, int]] = []
+        # raw (i.e. still obfuscated) file content
+        raw: Union[bytes, mmap.mmap] = b"" if self._mmap is None else self._mmap
+        file_size = len(raw)
+        offset = 0
+        while offset + 8 <= file_size:
+            # preallocated space is zero-filled on disk, i.e. not obfuscated
+            if raw[offset : offset + 4] == b"\x00" * 4:
+                break
+            framing = self._read(offset, 8)
+            if framing[:4] != self.magic:
+                err_msg = f"invalid magic bytes at offset {offset}: "
+                err_msg += f"{framing[:4].hex()} instead of {self.magic.hex()}"
+                raise BTClibValueError(err_msg)
+            size = int.from_bytes(framing[4:], byteorder="little", signed=False)
+            offset += 8
+            if offset + size > file_size:
+                raise BTClibValueError(f"truncated block at offset {offset}")
+            spans.append((offset, size))
+            offset += size
+
+        self._spans = spans
+        return spans
+
+    def raw_blocks(self) -> Iterator[Tuple[int, bytes]]:
+        "Yield offset and (deobfuscated) serialization of each block."
+        for offset, size in self.spans():
+            yield offset, self._read(offset, size)
+
+    def headers(self, check_validity: bool = True) -> Iterator[BlockHeader]:
+        "Yield the BlockHeader of each block, reading only its 80 bytes."
+        for offset, _ in self.spans():
+            yield BlockHeader.parse(self._read(offset, 80), check_validity)
+
+    def blocks(self, check_validity: bool = True) -> Iterator[Block]:
+        "Yield each Block."
+        for _, raw_block in self.raw_blocks():
+            yield Block.parse_at(raw_block, 0, check_validity)[0]
+
+
+def _map_blk_file(
+    func: Callable[[bytes], Any], filename: str, network: str, xor_key: Octets
+) -> List[Tuple[int, Any]]:
+    with BlkFile(filename, network, xor_key) as blk_file:
+        return [
+            (offset, func(raw_block)) for offset, raw_block in blk_file.raw_blocks()
+        ]
+
+
+def map_blk_files(
+    func: Callable[[bytes], Any],
+    filenames: Sequence[str],
+    network: str = "mainnet",
+    xor_key: Octets = b"",
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, int, Any]]:
+    """Yield filename, offset, and func(raw_block) for each block.
+
+    Files are processed in parallel by a pool of max_workers processes
+    (func must be picklable, e.g. a module-level function),
+    but results are yielded ordered by file (as in filenames) and offset.
+    """
+
+    worker = partial(_map_blk_file, func, network=network, xor_key=xor_key)
+    with ProcessPoolExecutor(max_workers) as executor:
+        for filename, results in zip(filenames, executor.map(worker, filenames)):
+            for offset, result in results:
+                yield filename, offset, result
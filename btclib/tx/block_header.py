@@ -93,6 +93,12 @@ class BlockHeader:
         power_term = pow(256, genesis_exponent - self.bits[0])
         return significand * power_term
 
+    @property
+    def size(self) -> int:
+        "Return the serialization size (80 bytes), without serializing."
+        fields = (self.previous_block_hash, self.merkle_root, self.bits)
+        return 12 + sum(len(field) for field in fields)
+
     @property
     def hash(self) -> bytes:
         "Return the reversed hash of the BlockHeader."
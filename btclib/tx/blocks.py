@@ -16,15 +16,31 @@ Dataclass encapsulating BlockHeader and List[Tx].
 import sys
 from dataclasses import dataclass
 from math import ceil
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Type, TypeVar
+from mmap import mmap
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from btclib import var_bytes, var_int
-from btclib.alias import BinaryData
+from btclib.alias import BinaryData, Buffer
 from btclib.exceptions import BTClibValueError
 from btclib.script.script import decode_num
 from btclib.tx.block_header import BlockHeader
+from btclib.tx.merkle_tree import MerkleTree
 from btclib.tx.tx import Tx
-from btclib.utils import bytesio_from_binarydata, hash256, merkle_root
+from btclib.tx.tx_view import TxView
+from btclib.utils import bytes_from_octets, bytesio_from_binarydata, hash256
 
 # python 3.6
 if sys.version_info.minor == 6:  # pragma: no cover
@@ -32,10 +48,11 @@ if sys.version_info.minor == 6:  # pragma: no cover
 
     backports.datetime_fromisoformat.MonkeyPatch.patch_fromisoformat()
 
-_HF = hash256
-
 _Block = TypeVar("_Block", bound="Block")
 
+# OP_RETURN, 36 bytes push, and commitment header
+_WITNESS_COMMITMENT_HEADER = bytes.fromhex("6a24aa21a9ed")
+
 
 @dataclass
 class Block:
@@ -44,7 +61,9 @@ class Block:
 
     @property
     def size(self) -> int:
-        return len(self.serialize(check_validity=False))
+        "Return the block size, without serializing."
+        size = self.header.size + var_int.size(len(self.transactions))
+        return size + sum(t.size for t in self.transactions)
 
     @property
     def weight(self) -> int:
@@ -117,16 +136,54 @@ class Block:
         return any(tx.is_segwit() for tx in self.transactions)
 
     def assert_valid_merkle_root(self) -> None:
-        data = [
-            tx.serialize(include_witness=False, check_validity=False)
-            for tx in self.transactions
-        ]
-        merkle_root_ = merkle_root(data, _HF)[::-1]
+        # memoized txids, no re-serialization
+        merkle_root_ = MerkleTree(tx.id for tx in self.transactions).root
         if merkle_root_ != self.header.merkle_root:
             err_msg = f"invalid merkle root: {self.header.merkle_root.hex()}"
             err_msg += f" instead of: {merkle_root_.hex()}"
             raise BTClibValueError(err_msg)
 
+    def witness_commitment(self) -> Optional[bytes]:
+        """Return the BIP141 witness commitment of the coinbase, if any.
+
+        If more than one coinbase output matches the commitment pattern,
+        the one with the highest index is used.
+
+        https://github.com/bitcoin/bips/blob/master/bip-0141.mediawiki
+        """
+        for tx_out in reversed(self.transactions[0].vout):
+            script = tx_out.script_pub_key.script
+            if len(script) >= 38 and script[:6] == _WITNESS_COMMITMENT_HEADER:
+                return script[6:38]
+        return None
+
+    def witness_merkle_root(self) -> bytes:
+        "Return the merkle root of the wtxids, the coinbase one being zero."
+        # memoized wtxids, no re-serialization
+        wtx_ids = [tx.hash for tx in self.transactions[1:]]
+        return MerkleTree([b"\x00" * 32] + wtx_ids).root
+
+    def assert_valid_witness_commitment(self) -> None:
+        """Assert the validity of the BIP141 witness commitment.
+
+        Blocks without witness data (e.g. as seen from legacy nodes)
+        do not need a valid commitment.
+        """
+        if not self.has_segwit_tx():
+            return
+
+        commitment = self.witness_commitment()
+        if commitment is None:
+            raise BTClibValueError("missing witness commitment")
+        stack = self.transactions[0].vin[0].script_witness.stack
+        if len(stack) != 1 or len(stack[0]) != 32:
+            raise BTClibValueError("invalid witness reserved value")
+        commitment_ = hash256(self.witness_merkle_root()[::-1] + stack[0])
+        if commitment_ != commitment:
+            err_msg = f"invalid witness commitment: {commitment.hex()}"
+            err_msg += f" instead of: {commitment_.hex()}"
+            raise BTClibValueError(err_msg)
+
     def assert_valid(self) -> None:
 
         self.header.assert_valid()
@@ -134,10 +191,11 @@ class Block:
         if not self.transactions[0].is_coinbase():
             raise BTClibValueError("first transaction is not a coinbase")
 
-        for transaction in self.transactions[1:]:
+        for transaction in self.transactions:
             transaction.assert_valid()
 
         self.assert_valid_merkle_root()
+        self.assert_valid_witness_commitment()
 
     def serialize(
         self, include_witness: bool = True, check_validity: bool = True
@@ -155,10 +213,99 @@ class Block:
     ) -> _Block:
         "Return a Block by parsing binary data."
 
+        if isinstance(data, str):  # hex string
+            data = bytes_from_octets(data)
+        if isinstance(data, bytes):
+            return cls.parse_at(data, 0, check_validity)[0]
+
         stream = bytesio_from_binarydata(data)
-        header = BlockHeader.parse(stream)
+        header = BlockHeader.parse(stream, check_validity)
         n = var_int.parse(stream)
         # TODO: is a block required to have a coinbase tx?
-        transactions = [Tx.parse(stream) for _ in range(n)]
+        # validated only once, when the Block is created
+        transactions = [Tx.parse(stream, False) for _ in range(n)]
 
         return cls(header, transactions, check_validity)
+
+    @classmethod
+    def parse_at(
+        cls: Type[_Block], data: Buffer, offset: int = 0, check_validity: bool = True
+    ) -> Tuple[_Block, int]:
+        """Return the Block at offset and the offset just after it.
+
+        The buffer (e.g. bytes, memoryview, or mmap) is parsed in place
+        using an integer offset, instead of being wrapped in a stream.
+        """
+
+        header = BlockHeader.parse(bytes(data[offset : offset + 80]), check_validity)
+        n, i = var_int.parse_at(data, offset + 80)
+        transactions: List[Tx] = []
+        for _ in range(n):
+            # validated only once, when the Block is created
+            tx, i = Tx.parse_at(data, i, check_validity=False)
+            transactions.append(tx)
+
+        return cls(header, transactions, check_validity), i
+
+
+class LazyBlock:
+    """Lazy iteration over the transactions of a serialized block.
+
+    Only the header and the number of transactions are parsed
+    when the LazyBlock is created: transactions are then yielded
+    one at a time, so that memory usage does not depend on the block size.
+
+    data can be a bytes-like buffer (e.g. a memory-mapped file),
+    parsed in place and iterable more than once,
+    or a binary stream (e.g. a file), read sequentially only once.
+    """
+
+    def __init__(
+        self, data: Union[Buffer, str, IO[bytes]], check_validity: bool = True
+    ) -> None:
+
+        if isinstance(data, str):  # hex string
+            data = bytes_from_octets(data)
+        self._stream: Optional[IO[bytes]] = None
+        self._buffer: Optional[memoryview] = None
+        if isinstance(data, (bytes, bytearray, memoryview, mmap)):
+            self._buffer = memoryview(data)
+            header_bytes = bytes(self._buffer[:80])
+            self.n_transactions, self._offset = var_int.parse_at(self._buffer, 80)
+        else:
+            self._stream = data
+            header_bytes = data.read(80)
+            self.n_transactions = var_int.parse(data)  # type: ignore
+        self.header = BlockHeader.parse(header_bytes, check_validity)
+
+    def tx_views(self) -> Iterator[TxView]:
+        """Yield the TxView of each transaction.
+
+        Transactions not needed can be skipped without parsing them:
+        only their boundaries are computed.
+        """
+
+        if self._buffer is not None:
+            offset = self._offset
+            for _ in range(self.n_transactions):
+                tx_view = TxView.parse_at(self._buffer, offset)
+                offset = tx_view.end
+                yield tx_view
+            return
+
+        if self._stream is None:
+            raise BTClibValueError("transactions already read from stream")
+        stream, self._stream = self._stream, None
+        for _ in range(self.n_transactions):
+            yield TxView.read(stream)
+
+    def transactions(
+        self, check_validity: bool = True, include_witness: bool = True
+    ) -> Iterator[Tx]:
+        """Yield each transaction as Tx.
+
+        If include_witness is False, witnesses are not parsed.
+        """
+
+        for tx_view in self.tx_views():
+            yield tx_view.tx(check_validity, include_witness)
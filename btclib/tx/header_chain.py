@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Compact block header chain (HeaderChain).
+
+The best chain is stored as contiguous raw 80-byte headers,
+the header at height h being at offset 80*h:
+BlockHeader objects are materialized only on demand.
+
+The hash to height index is built lazily, at the first lookup,
+as sorted array of truncated hashes;
+headers of side branches (forks) are kept apart
+and the best chain is the one with the most cumulative work.
+
+Sequences of raw headers (e.g. from the initial header sync)
+are validated in bulk: linkage, proof-of-work, difficulty retargets,
+and median time past are checked in one pass.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from hashlib import sha256
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from btclib.alias import Buffer, Octets
+from btclib.exceptions import BTClibValueError
+from btclib.tx.block_header import BlockHeader
+from btclib.utils import bytes_from_octets
+
+HEADER_SIZE = 80
+
+# cumulative work is cached every _CHECKPOINT headers
+_CHECKPOINT = 2016
+
+RETARGET_INTERVAL = 2016
+_TARGET_TIMESPAN = 14 * 24 * 60 * 60
+_MTP_SPAN = 11
+
+# proof-of-work limit and whether difficulty is retargeted
+_POW_RULES: Dict[str, Tuple[int, bool]] = {
+    "mainnet": ((1 << 224) - 1, True),
+    "testnet": ((1 << 224) - 1, False),
+    "regtest": ((1 << 255) - 1, False),
+}
+
+# 32-bit unsigned integers
+_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+_HeaderChain = TypeVar("_HeaderChain", bound="HeaderChain")
+
+
+def _hash256(raw_header: Buffer) -> bytes:
+    "Return the hash of the raw header, in internal byte order."
+    return sha256(sha256(raw_header).digest()).digest()
+
+
+def _key(internal_hash: bytes) -> int:
+    # the trailing bytes of the (reversed) hash are the non-zero ones
+    return int.from_bytes(internal_hash[:8], byteorder="little", signed=False)
+
+
+@lru_cache(maxsize=4096)
+def _target(bits: bytes) -> int:
+    "Return the target of the 4 bytes (little endian) raw bits."
+    significand = int.from_bytes(bits[:3], byteorder="little", signed=False)
+    exponent = bits[3]
+    if exponent < 3:
+        return significand >> (8 * (3 - exponent))
+    return significand << (8 * (exponent - 3))
+
+
+@lru_cache(maxsize=4096)
+def _work(bits: bytes) -> int:
+    "Return the expected number of hashes to satisfy the target."
+    return (1 << 256) // (_target(bits) + 1)
+
+
+def _compact(target: int) -> bytes:
+    "Return the 4 bytes (little endian) raw bits of the target."
+    size = (target.bit_length() + 7) // 8
+    if size <= 3:
+        significand = target << (8 * (3 - size))
+    else:
+        significand = target >> (8 * (size - 3))
+    # the significand sign bit must not be set
+    if significand & 0x800000:
+        significand >>= 8
+        size += 1
+    return (significand | size << 24).to_bytes(4, byteorder="little", signed=False)
+
+
+def _retarget(bits: bytes, first_time: int, last_time: int, pow_limit: int) -> bytes:
+    "Return the raw bits of the first header of a retarget period."
+    timespan = last_time - first_time
+    timespan = min(max(timespan, _TARGET_TIMESPAN // 4), _TARGET_TIMESPAN * 4)
+    target = _target(bits) * timespan // _TARGET_TIMESPAN
+    return _compact(min(target, pow_limit))
+
+
+def _hash_headers(data: Buffer) -> bytes:
+    "Return the concatenated hashes of the raw headers."
+    view = memoryview(data)
+    return b"".join(
+        _hash256(view[i : i + HEADER_SIZE]) for i in range(0, len(data), HEADER_SIZE)
+    )
+
+
+def _hashes(data: memoryview, max_workers: int) -> List[bytes]:
+    "Return the hashes of the raw headers, in internal byte order."
+
+    if max_workers > 1:
+        # hashlib does not release the GIL for 80 bytes: use processes
+        n_chunks = max_workers * 4
+        size = -(-len(data) // HEADER_SIZE // n_chunks) * HEADER_SIZE or HEADER_SIZE
+        chunks = [bytes(data[i : i + size]) for i in range(0, len(data), size)]
+        with ProcessPoolExecutor(max_workers) as executor:
+            hashes = b"".join(executor.map(_hash_headers, chunks))
+    else:
+        hashes = _hash_headers(data)
+    return [hashes[i : i + 32] for i in range(0, len(hashes), 32)]
+
+
+def _time(raw_header: Buffer) -> int:
+    return int.from_bytes(raw_header[68:72], byteorder="little", signed=False)
+
+
+class HeaderChain:
+    """Best chain of raw 80-byte block headers, with side branches.
+
+    Headers are indexed by height (the genesis one being at height zero)
+    and by hash, i.e. BlockHeader.hash.
+    """
+
+    def __init__(self, data: Buffer = b"") -> None:
+
+        if len(data) % HEADER_SIZE:
+            raise BTClibValueError(f"invalid header chain size: {len(data)}")
+        self._data = bytearray(data)
+
+        # lazily built index of the first _n_indexed headers:
+        # sorted truncated hashes and their heights
+        self._n_indexed: Optional[int] = None
+        self._keys = array("Q")
+        self._heights = array(_TYPECODE)
+        # best chain headers not in the sorted index: hash -> height
+        self._recent: Dict[bytes, int] = {}
+        # side branch headers: hash -> (raw header, height)
+        self._side: Dict[bytes, Tuple[bytes, int]] = {}
+        # cumulative work of the first i * _CHECKPOINT headers
+        self._checkpoints: List[int] = [0]
+
+    def __len__(self) -> int:
+        return len(self._data) // HEADER_SIZE
+
+    @property
+    def height(self) -> int:
+        "Return the height of the best chain tip (-1 if empty)."
+        return len(self) - 1
+
+    def raw(self, height: int) -> bytes:
+        "Return the raw header at height."
+        if height < 0:
+            height += len(self)
+        if not 0 <= height < len(self):
+            raise IndexError("height out of range")
+        offset = height * HEADER_SIZE
+        return bytes(self._data[offset : offset + HEADER_SIZE])
+
+    def __getitem__(self, height: int) -> BlockHeader:
+        "Return the BlockHeader at height, materialized on demand."
+        return BlockHeader.parse(self.raw(height), check_validity=False)
+
+    def hash(self, height: int) -> bytes:
+        "Return the hash of the header at height."
+        return _hash256(self.raw(height))[::-1]
+
+    @property
+    def tip(self) -> bytes:
+        "Return the hash of the best chain tip."
+        return self.hash(-1)
+
+    def _build_index(self) -> None:
+        view = memoryview(self._data)
+        keys = [
+            _key(_hash256(view[i : i + HEADER_SIZE]))
+            for i in range(0, len(self._data), HEADER_SIZE)
+        ]
+        heights = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = array("Q", [keys[height] for height in heights])
+        self._heights = array(_TYPECODE, heights)
+        self._n_indexed = len(self)
+        self._recent = {}
+
+    def height_of(self, hash_: Octets) -> Optional[int]:
+        "Return the height of the header in the best chain, if any."
+
+        hash_ = bytes_from_octets(hash_, 32)
+        if self._n_indexed is None:
+            self._build_index()
+        height = self._recent.get(hash_)
+        if height is not None:
+            return height
+        key = _key(hash_[::-1])
+        i = bisect_left(self._keys, key)
+        # truncated keys may collide, heights may be stale after a reorg
+        while i < len(self._keys) and self._keys[i] == key:
+            height = self._heights[i]
+            if height < len(self) and self.hash(height) == hash_:
+                return height
+            i += 1
+        return None
+
+    def __contains__(self, hash_: Octets) -> bool:
+        "Return True if the header is in the best chain or in a side branch."
+        hash_ = bytes_from_octets(hash_, 32)
+        return hash_ in self._side or self.height_of(hash_) is not None
+
+    def _sum_work(self, start: int, stop: int) -> int:
+        data = self._data
+        return sum(
+            _work(bytes(data[i + 72 : i + 76]))
+            for i in range(start * HEADER_SIZE, stop * HEADER_SIZE, HEADER_SIZE)
+        )
+
+    def chain_work(self, height: int = -1) -> int:
+        "Return the cumulative work of the best chain up to height."
+
+        if height < 0:
+            height += len(self)
+        n = height + 1
+        i = n // _CHECKPOINT
+        while len(self._checkpoints) <= i:
+            j = len(self._checkpoints)
+            work = self._sum_work((j - 1) * _CHECKPOINT, j * _CHECKPOINT)
+            self._checkpoints.append(self._checkpoints[-1] + work)
+        return self._checkpoints[i] + self._sum_work(i * _CHECKPOINT, n)
+
+    def _append(self, raw_header: bytes, hash_: bytes) -> None:
+        if self._n_indexed is not None:
+            self._recent[hash_] = len(self)
+        self._data.extend(raw_header)
+
+    def _reorg(self, fork_height: int, branch: List[bytes]) -> None:
+        "Replace the best chain above fork_height with the branch."
+
+        for height in range(fork_height + 1, len(self)):
+            raw_header = self.raw(height)
+            self._side[_hash256(raw_header)[::-1]] = (raw_header, height)
+        del self._data[(fork_height + 1) * HEADER_SIZE :]
+        recent = self._recent.items()
+        self._recent = {k: height for k, height in recent if height <= fork_height}
+        del self._checkpoints[(fork_height + 1) // _CHECKPOINT + 1 :]
+        for raw_header in branch:
+            hash_ = _hash256(raw_header)[::-1]
+            del self._side[hash_]
+            self._append(raw_header, hash_)
+
+    def add(self, header: Union[BlockHeader, Octets]) -> bool:
+        """Add a header, returning True if the best chain has changed.
+
+        The header must satisfy its proof-of-work target
+        and its previous block must be known (unless it is the first one).
+        The best chain is reorganized if a side branch
+        has more cumulative work.
+        """
+
+        if isinstance(header, BlockHeader):
+            raw_header = header.serialize(check_validity=False)
+        else:
+            raw_header = bytes_from_octets(header, HEADER_SIZE)
+        internal_hash = _hash256(raw_header)
+        hash_ = internal_hash[::-1]
+        target = _target(raw_header[72:76])
+        if int.from_bytes(internal_hash, "little", signed=False) > target:
+            raise BTClibValueError(f"invalid proof-of-work: {hash_.hex()}")
+
+        prev_hash = raw_header[4:36][::-1]
+        if not self._data or prev_hash == self.tip:
+            self._append(raw_header, hash_)
+            return True
+
+        if hash_ in self:
+            return False
+
+        if prev_hash in self._side:
+            height = self._side[prev_hash][1] + 1
+        else:
+            prev_height = self.height_of(prev_hash)
+            if prev_height is None:
+                raise BTClibValueError(f"unknown previous block: {prev_hash.hex()}")
+            height = prev_height + 1
+        self._side[hash_] = (raw_header, height)
+
+        branch = [raw_header]
+        while prev_hash in self._side:
+            raw_header = self._side[prev_hash][0]
+            branch.append(raw_header)
+            prev_hash = raw_header[4:36][::-1]
+        branch.reverse()
+        fork_height = height - len(branch)
+
+        branch_work = sum(_work(raw_header[72:76]) for raw_header in branch)
+        if branch_work <= self._sum_work(fork_height + 1, len(self)):
+            return False
+        self._reorg(fork_height, branch)
+        return True
+
+    def _assert_valid_headers(
+        self, data: memoryview, network: str, max_workers: int
+    ) -> List[bytes]:
+        "Return the hashes of the raw headers, asserting their validity."
+
+        if len(data) % HEADER_SIZE:
+            raise BTClibValueError(f"invalid header data size: {len(data)}")
+        pow_limit, retarget = _POW_RULES[network]
+        hashes = _hashes(data, max_workers)
+
+        start = len(self)
+
+        def raw(height: int) -> Buffer:
+            if height < start:
+                return self.raw(height)
+            offset = (height - start) * HEADER_SIZE
+            return data[offset : offset + HEADER_SIZE]
+
+        # previous timestamps for the median time past
+        times = deque(
+            (_time(self.raw(h)) for h in range(max(start - _MTP_SPAN, 0), start)),
+            maxlen=_MTP_SPAN,
+        )
+        prev_hash = _hash256(self.raw(-1)) if start else None
+        prev_bits = self.raw(-1)[72:76] if start else None
+        for i, hash_ in enumerate(hashes):
+            height = start + i
+            raw_header = raw(height)
+
+            if prev_hash is not None and raw_header[4:36] != prev_hash:
+                raise BTClibValueError(f"invalid previous hash at height {height}")
+
+            bits = bytes(raw_header[72:76])
+            target = _target(bits)
+            if bits[2] & 0x80 or not 0 < target <= pow_limit:
+                raise BTClibValueError(
+                    f"invalid bits at height {height}: {bits[::-1].hex()}"
+                )
+            if int.from_bytes(hash_, "little", signed=False) > target:
+                raise BTClibValueError(f"invalid proof-of-work at height {height}")
+
+            if retarget and prev_bits is not None:
+                if height % RETARGET_INTERVAL:
+                    expected = prev_bits
+                else:
+                    first_time = _time(raw(height - RETARGET_INTERVAL))
+                    last_time = _time(raw(height - 1))
+                    expected = _retarget(prev_bits, first_time, last_time, pow_limit)
+                if bits != expected:
+                    err_msg = f"invalid difficulty at height {height}: "
+                    err_msg += f"{bits[::-1].hex()} instead of {expected[::-1].hex()}"
+                    raise BTClibValueError(err_msg)
+
+            time = _time(raw_header)
+            if times and time <= sorted(times)[len(times) // 2]:
+                err_msg = f"invalid timestamp at height {height}: "
+                err_msg += "not after the median time past"
+                raise BTClibValueError(err_msg)
+
+            times.append(time)
+            prev_hash = hash_
+            prev_bits = bits
+        return hashes
+
+    def assert_valid_headers(
+        self, data: Buffer, network: str = "mainnet", max_workers: int = 1
+    ) -> None:
+        """Assert that the raw headers validly extend the best chain.
+
+        In one pass: previous hash linkage, proof-of-work,
+        difficulty retargets (every 2016 headers),
+        and timestamps after the median time past.
+        Hashing is spread over max_workers processes.
+
+        Testnet min-difficulty blocks are not supported:
+        difficulty is not checked for testnet and regtest.
+        """
+        self._assert_valid_headers(memoryview(data), network, max_workers)
+
+    def extend(
+        self,
+        data: Buffer,
+        network: str = "mainnet",
+        max_workers: int = 1,
+        check_validity: bool = True,
+    ) -> None:
+        "Append the raw headers to the best chain, validating them in bulk."
+
+        view = memoryview(data)
+        if check_validity:
+            hashes = self._assert_valid_headers(view, network, max_workers)
+        elif len(view) % HEADER_SIZE:
+            raise BTClibValueError(f"invalid header data size: {len(view)}")
+        else:
+            # hashes are only needed to update the hash index
+            indexed = self._n_indexed is not None
+            hashes = _hashes(view, max_workers) if indexed else []
+        if self._n_indexed is not None:
+            for height, hash_ in enumerate(hashes, len(self)):
+                self._recent[hash_[::-1]] = height
+        self._data.extend(view)
+
+    def serialize(self) -> bytes:
+        "Return the raw headers of the best chain."
+        return bytes(self._data)
+
+    def save(self, filename: str) -> None:
+        "Save the raw headers of the best chain."
+        with open(filename, "wb") as file_:
+            file_.write(self._data)
+
+    @classmethod
+    def load(cls: Type[_HeaderChain], filename: str) -> _HeaderChain:
+        "Return the HeaderChain of the raw headers saved in the file."
+        with open(filename, "rb") as file_:
+            return cls(file_.read())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Transaction merkle trees: MerkleTree and PartialMerkleTree (BIP37).
+
+A MerkleTree keeps all its levels, built from txids:
+appending or replacing a leaf rehashes only its path to the root,
+i.e. O(log n), and inclusion proofs are read from the stored levels.
+
+As usual, txids and merkle root are in the byte order
+of Tx.id and BlockHeader.merkle_root.
+
+https://github.com/bitcoin/bips/blob/master/bip-0037.mediawiki
+"""
+
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from btclib import var_bytes, var_int
+from btclib.alias import BinaryData, Octets
+from btclib.exceptions import BTClibValueError
+from btclib.utils import bytes_from_octets, bytesio_from_binarydata
+
+_PartialMerkleTree = TypeVar("_PartialMerkleTree", bound="PartialMerkleTree")
+
+
+def _parent(left: bytes, right: bytes) -> bytes:
+    "Return the hash256 of the concatenation, in internal byte order."
+    return sha256(sha256(left + right).digest()).digest()
+
+
+def _parent_level(level: List[bytes]) -> List[bytes]:
+    # an odd last node is paired with itself
+    n = len(level)
+    parents = [_parent(level[i], level[i + 1]) for i in range(0, n - 1, 2)]
+    if n % 2:
+        parents.append(_parent(level[-1], level[-1]))
+    return parents
+
+
+class MerkleTree:
+    """Merkle tree of a list of txids.
+
+    Levels are stored without the duplicated odd last nodes:
+    the tree of n leaves takes about 2n hashes.
+    """
+
+    def __init__(self, tx_ids: Iterable[Octets] = ()) -> None:
+        # internal byte order
+        leaves = [bytes_from_octets(tx_id, 32)[::-1] for tx_id in tx_ids]
+        self._levels = [leaves]
+        while len(self._levels[-1]) > 1:
+            self._levels.append(_parent_level(self._levels[-1]))
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    def _check_index(self, i: int) -> None:
+        if not 0 <= i < len(self):
+            raise IndexError("leaf index out of range")
+
+    def _update(self, i: int) -> None:
+        "Rehash the path from the i-th leaf to the root."
+        height = 0
+        while len(self._levels[height]) > 1:
+            level = self._levels[height]
+            left = level[i & ~1]
+            right = level[i | 1] if i | 1 < len(level) else left
+            i >>= 1
+            if height + 1 == len(self._levels):
+                self._levels.append([])
+            parents = self._levels[height + 1]
+            if i == len(parents):
+                parents.append(_parent(left, right))
+            else:
+                parents[i] = _parent(left, right)
+            height += 1
+        del self._levels[height + 1 :]
+
+    @property
+    def root(self) -> bytes:
+        if not self._levels[0]:
+            raise BTClibValueError("empty merkle tree")
+        return self._levels[-1][0][::-1]
+
+    def append(self, tx_id: Octets) -> None:
+        "Append a leaf, rehashing only its path to the root."
+        self._levels[0].append(bytes_from_octets(tx_id, 32)[::-1])
+        self._update(len(self) - 1)
+
+    def replace(self, i: int, tx_id: Octets) -> None:
+        "Replace the i-th leaf, rehashing only its path to the root."
+        self._check_index(i)
+        self._levels[0][i] = bytes_from_octets(tx_id, 32)[::-1]
+        self._update(i)
+
+    def proof(self, i: int) -> List[bytes]:
+        "Return the inclusion proof of the i-th leaf, i.e. its merkle branch."
+        self._check_index(i)
+        branch = []
+        for level in self._levels[:-1]:
+            sibling = i ^ 1
+            branch.append(level[sibling if sibling < len(level) else i][::-1])
+            i >>= 1
+        return branch
+
+    def partial(self, matches: Iterable[int]) -> "PartialMerkleTree":
+        "Return the PartialMerkleTree proving the inclusion of the matched leaves."
+
+        matched = set(matches)
+        for i in matched:
+            self._check_index(i)
+        hashes: List[bytes] = []
+        flags: List[bool] = []
+
+        def traverse(height: int, pos: int) -> None:
+            first = pos << height
+            last = min((pos + 1) << height, len(self))
+            parent_of_match = any(i in matched for i in range(first, last))
+            flags.append(parent_of_match)
+            if height == 0 or not parent_of_match:
+                hashes.append(self._levels[height][pos][::-1])
+                return
+            traverse(height - 1, pos * 2)
+            if pos * 2 + 1 < len(self._levels[height - 1]):
+                traverse(height - 1, pos * 2 + 1)
+
+        traverse(len(self._levels) - 1, 0)
+        return PartialMerkleTree(len(self), hashes, flags)
+
+
+def root_from_proof(tx_id: Octets, i: int, proof: Sequence[Octets]) -> bytes:
+    "Return the merkle root committed to by the i-th leaf and its proof."
+
+    hash_ = bytes_from_octets(tx_id, 32)[::-1]
+    for sibling in proof:
+        sibling = bytes_from_octets(sibling, 32)[::-1]
+        hash_ = _parent(sibling, hash_) if i & 1 else _parent(hash_, sibling)
+        i >>= 1
+    return hash_[::-1]
+
+
+def verify_proof(
+    tx_id: Octets, i: int, proof: Sequence[Octets], merkle_root: Octets
+) -> bool:
+    "Return True if the proof commits the i-th leaf to the merkle root."
+
+    return root_from_proof(tx_id, i, proof) == bytes_from_octets(merkle_root, 32)
+
+
+@dataclass
+class PartialMerkleTree:
+    """BIP37 partial merkle tree.
+
+    Depth-first traversal of the tree pruned below
+    the nodes that are not ancestors of a matched leaf:
+    one flag per visited node, one hash per pruned node or leaf.
+    """
+
+    n_transactions: int
+    hashes: List[bytes]
+    flags: List[bool]
+
+    def __init__(
+        self,
+        n_transactions: int = 0,
+        hashes: Optional[Sequence[Octets]] = None,
+        flags: Optional[Sequence[bool]] = None,
+        check_validity: bool = True,
+    ) -> None:
+
+        self.n_transactions = n_transactions
+        self.hashes = [bytes_from_octets(hash_) for hash_ in hashes or []]
+        self.flags = list(flags or [])
+
+        if check_validity:
+            self.assert_valid()
+
+    def assert_valid(self) -> None:
+        if not 0 < self.n_transactions <= 0xFFFFFFFF:
+            raise BTClibValueError(f"invalid n_transactions: {self.n_transactions}")
+        if len(self.hashes) > self.n_transactions:
+            raise BTClibValueError("more hashes than transactions")
+        if len(self.flags) < len(self.hashes):
+            raise BTClibValueError("less flags than hashes")
+        for hash_ in self.hashes:
+            if len(hash_) != 32:
+                raise BTClibValueError(f"invalid hash length: {len(hash_)}")
+
+    def _width(self, height: int) -> int:
+        return (self.n_transactions + (1 << height) - 1) >> height
+
+    def extract(self) -> Tuple[bytes, List[Tuple[int, bytes]]]:
+        """Return merkle root and (index, txid) of the matched leaves.
+
+        The merkle root must be checked against the block header.
+        """
+
+        self.assert_valid()
+        height = 0
+        while self._width(height) > 1:
+            height += 1
+
+        n_hashes = n_flags = 0
+        matched: List[Tuple[int, bytes]] = []
+
+        def traverse(height: int, pos: int) -> bytes:
+            nonlocal n_hashes, n_flags
+            if n_flags == len(self.flags):
+                raise BTClibValueError("not enough flags")
+            parent_of_match = self.flags[n_flags]
+            n_flags += 1
+            if height == 0 or not parent_of_match:
+                if n_hashes == len(self.hashes):
+                    raise BTClibValueError("not enough hashes")
+                hash_ = self.hashes[n_hashes][::-1]
+                n_hashes += 1
+                if height == 0 and parent_of_match:
+                    matched.append((pos, hash_[::-1]))
+                return hash_
+            left = traverse(height - 1, pos * 2)
+            if pos * 2 + 1 < self._width(height - 1):
+                right = traverse(height - 1, pos * 2 + 1)
+                # CVE-2012-2459
+                if right == left:
+                    raise BTClibValueError("duplicated hashes")
+            else:
+                right = left
+            return _parent(left, right)
+
+        root = traverse(height, 0)[::-1]
+        # flags are serialized in whole bytes
+        if (n_flags + 7) // 8 != (len(self.flags) + 7) // 8:
+            raise BTClibValueError("unused flags")
+        if n_hashes != len(self.hashes):
+            raise BTClibValueError("unused hashes")
+        return root, matched
+
+    def serialize(self, check_validity: bool = True) -> bytes:
+        "Return the BIP37 serialization of the PartialMerkleTree."
+
+        if check_validity:
+            self.assert_valid()
+
+        out = self.n_transactions.to_bytes(4, byteorder="little", signed=False)
+        out += var_int.serialize(len(self.hashes))
+        out += b"".join(hash_[::-1] for hash_ in self.hashes)
+        flags = bytearray((len(self.flags) + 7) // 8)
+        for i, flag in enumerate(self.flags):
+            flags[i // 8] |= flag << (i % 8)
+        return out + var_bytes.serialize(bytes(flags))
+
+    @classmethod
+    def parse(
+        cls: Type[_PartialMerkleTree], data: BinaryData, check_validity: bool = True
+    ) -> _PartialMerkleTree:
+        "Return a PartialMerkleTree by parsing binary data."
+
+        stream = bytesio_from_binarydata(data)
+        n_transactions = int.from_bytes(stream.read(4), "little", signed=False)
+        n = var_int.parse(stream)
+        hashes = [stream.read(32)[::-1] for _ in range(n)]
+        flag_bytes = var_bytes.parse(stream)
+        flags = [
+            bool(flag_bytes[i // 8] >> (i % 8) & 1) for i in range(len(flag_bytes) * 8)
+        ]
+        return cls(n_transactions, hashes, flags, check_validity)
@@ -27,6 +27,8 @@ _OutPoint = TypeVar("_OutPoint", bound="OutPoint")
 # FIXME make it frozen
 @dataclass
 class OutPoint:
+    __slots__ = ("tx_id", "vout")
+
     tx_id: bytes
     vout: int
 
@@ -42,6 +44,11 @@ class OutPoint:
         "Return the n int for compatibility with COutPoint."
         return self.vout
 
+    @property
+    def size(self) -> int:
+        "Return the serialization size, without serializing."
+        return len(self.tx_id) + 4
+
     def __init__(
         self,
         tx_id: Octets = b"\x00" * 32,
@@ -15,20 +15,15 @@ https://raghavsood.com/blog/2018/06/10/bitcoin-signature-types-sighash
 https://wiki.bitcoinsv.io/index.php/SIGHASH_flags
 """
 
-from copy import deepcopy
-from typing import List
+from hashlib import sha256
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from btclib import var_bytes
+from btclib import var_bytes, var_int
 from btclib.alias import Octets
 from btclib.exceptions import BTClibValueError
-from btclib.script.script import Command, parse, serialize
-from btclib.script.script_pub_key import (
-    ScriptPubKey,
-    is_p2sh,
-    is_p2wpkh,
-    is_p2wsh,
-    type_and_payload,
-)
+from btclib.script.op_codes import OP_CODES
+from btclib.script.script import serialize, tokenize
+from btclib.script.script_pub_key import is_p2sh, is_p2wpkh, is_p2wsh, type_and_payload
 from btclib.tx.tx import Tx
 from btclib.tx.tx_out import TxOut
 from btclib.utils import bytes_from_octets, hash256
@@ -38,6 +33,8 @@ NONE = 2
 SINGLE = 3
 ANYONECANPAY = 0b10000000
 
+_OP_CODESEPARATOR = OP_CODES["OP_CODESEPARATOR"][0]
+
 SIG_HASH_TYPES = [
     ALL,
     NONE,
@@ -53,16 +50,23 @@ def assert_valid_hash_type(hash_type: int) -> None:
         raise BTClibValueError(f"invalid sign_hash type: {hex(hash_type)}")
 
 
+def _separators(script_pub_key: bytes) -> List[int]:
+    "Return the offsets of the OP_CODESEPARATORs."
+    return [i for op, _, i in tokenize(script_pub_key) if op == _OP_CODESEPARATOR]
+
+
 def legacy_script(script_pub_key: Octets) -> List[bytes]:
-    script_s: List[bytes] = []
-    current_script: List[Command] = []
-    for token in parse(script_pub_key)[::-1]:
-        if token == "OP_CODESEPARATOR":  # nosec required for python < 3.8
-            script_s.append(serialize(current_script[::-1]))
-        else:
-            current_script.append(token)
-    script_s.append(serialize(current_script[::-1]))
-    return script_s[::-1]
+    """Return the script and the scripts after each OP_CODESEPARATOR.
+
+    In all of them OP_CODESEPARATORs are removed.
+    """
+
+    script_pub_key = bytes_from_octets(script_pub_key)
+    separators = _separators(script_pub_key)
+    starts = [0] + [i + 1 for i in separators]
+    ends = separators + [len(script_pub_key)]
+    chunks = [script_pub_key[start:end] for start, end in zip(starts, ends)]
+    return [b"".join(chunks[i:]) for i in range(len(chunks))]
 
 
 # FIXME: remove OP_CODESEPARATOR only if executed
@@ -75,83 +79,160 @@ def witness_v0_script(script_pub_key: Octets) -> List[bytes]:
         )
         return [script]
 
-    script_s: List[bytes] = []
-    current_script: List[Command] = []
-    for token in parse(script_pub_key)[::-1]:
-        if token == "OP_CODESEPARATOR":  # nosec required for python < 3.8
-            script_s.append(serialize(current_script[::-1]))
-        current_script.append(token)
-    script_s.append(serialize(current_script[::-1]))
-    return script_s[::-1]
-
+    script_pub_key = bytes_from_octets(script_pub_key)
+    separators = _separators(script_pub_key)
+    return [script_pub_key] + [script_pub_key[i + 1 :] for i in separators]
+
+
+class SegwitV0Context:
+    """BIP143 hashes shared by all the inputs of a transaction.
+
+    hash_prev_outs, hash_seqs, and hash_outputs do not depend
+    on the input being signed: they are computed at most once,
+    only when required by a hash type, and then reused.
+    The serialized outputs are reused by legacy sign hashes too.
+
+    Changes of the transaction are not detected:
+    invalidate must be called after changing its inputs or outputs.
+    """
+
+    def __init__(self, tx: Tx) -> None:
+        self.tx = tx
+        self._cache: Dict[str, bytes] = {}
+
+    def invalidate(self) -> None:
+        "Discard the cached hashes, e.g. after changing the transaction."
+        self._cache.clear()
+
+    def outputs(self) -> bytes:
+        "Return the serialized outputs, without their number."
+        if "outputs" not in self._cache:
+            outputs = b"".join([vout.serialize(False) for vout in self.tx.vout])
+            self._cache["outputs"] = outputs
+        return self._cache["outputs"]
+
+    def _hash(self, name: str) -> bytes:
+        key = "hash_" + name
+        if key not in self._cache:
+            if name == "prev_outs":
+                data = b"".join([vin.prev_out.serialize() for vin in self.tx.vin])
+            elif name == "seqs":
+                data = b"".join(
+                    [
+                        vin.sequence.to_bytes(4, byteorder="little", signed=False)
+                        for vin in self.tx.vin
+                    ]
+                )
+            else:
+                data = self.outputs()
+            self._cache[key] = hash256(data)
+        return self._cache[key]
+
+    def hashes(self, vin_i: int, hash_type: int) -> Tuple[bytes, bytes, bytes]:
+        "Return hash_prev_outs, hash_seqs, and hash_outputs."
+
+        zeros = b"\x00" * 32
+        base_type = hash_type & 0x1F
+        anyonecanpay = hash_type & ANYONECANPAY
+
+        hash_prev_outs = zeros if anyonecanpay else self._hash("prev_outs")
+        if anyonecanpay or base_type in (SINGLE, NONE):
+            hash_seqs = zeros
+        else:
+            hash_seqs = self._hash("seqs")
+        if base_type not in (SINGLE, NONE):
+            hash_outputs = self._hash("outputs")
+        elif base_type == SINGLE and vin_i < len(self.tx.vout):
+            hash_outputs = hash256(self.tx.vout[vin_i].serialize(False))
+        else:
+            hash_outputs = zeros
+        return hash_prev_outs, hash_seqs, hash_outputs
 
-def legacy(script_: Octets, tx: Tx, vin_i: int, hash_type: int) -> bytes:
-    script_ = bytes_from_octets(script_)
 
-    new_tx = deepcopy(tx)
-    for txin in new_tx.vin:
-        txin.script_sig = b""
-    # TODO: delete sig from script_ (even if non standard)
-    new_tx.vin[vin_i].script_sig = script_
-    if hash_type & 0x1F == NONE:
-        new_tx.vout = []
-        for i, txin in enumerate(new_tx.vin):
-            if i != vin_i:
-                txin.sequence = 0
-
-    if hash_type & 0x1F == SINGLE:
-        # sign_hash single bug
-        if vin_i >= len(new_tx.vout):
-            return (256 ** 31).to_bytes(32, byteorder="big", signed=False)
-        new_tx.vout = new_tx.vout[: vin_i + 1]
-        for txout in new_tx.vout[:-1]:
-            txout.script_pub_key = ScriptPubKey(b"")
-            txout.value = 0xFFFFFFFFFFFFFFFF
-        for i, txin in enumerate(new_tx.vin):
-            if i != vin_i:
-                txin.sequence = 0
-
-    if hash_type & 0x80:
-        new_tx.vin = [new_tx.vin[vin_i]]
-
-    preimage = new_tx.serialize(include_witness=False, check_validity=False)
-    preimage += hash_type.to_bytes(4, byteorder="little", signed=False)
+def _context(tx: Tx, context: Optional[SegwitV0Context]) -> SegwitV0Context:
+    if context is None:
+        return SegwitV0Context(tx)
+    if context.tx is not tx:
+        raise BTClibValueError("context for a different transaction")
+    return context
 
-    return hash256(preimage)
 
+def _legacy(
+    script_: bytes, tx: Tx, vin_i: int, hash_type: int, *, context: SegwitV0Context
+) -> bytes:
 
-# https://github.com/bitcoin/bitcoin/blob/4b30c41b4ebf2eb70d8a3cd99cf4d05d405eec81/test/functional/test_framework/script.py#L673
-def segwit_v0(
-    script_: Octets, tx: Tx, vin_i: int, hash_type: int, amount: int
+    base_type = hash_type & 0x1F
+    # sign_hash single bug
+    if base_type == SINGLE and vin_i >= len(tx.vout):
+        return (256 ** 31).to_bytes(32, byteorder="big", signed=False)
+
+    # the preimage is the serialization of a modified copy of tx:
+    # it is streamed into the hash, without copying nor modifying tx
+    hash_ = sha256()
+    hash_.update(tx.version.to_bytes(4, byteorder="little", signed=True))
+
+    if hash_type & ANYONECANPAY:
+        vin_indexes: Sequence[int] = [vin_i]
+    else:
+        vin_indexes = range(len(tx.vin))
+    hash_.update(var_int.serialize(len(vin_indexes)))
+    for i in vin_indexes:
+        tx_in = tx.vin[i]
+        hash_.update(tx_in.prev_out.serialize())
+        # TODO: delete sig from script_ (even if non standard)
+        hash_.update(var_bytes.serialize(script_) if i == vin_i else b"\x00")
+        sequence = tx_in.sequence
+        if i != vin_i and base_type in (NONE, SINGLE):
+            sequence = 0
+        hash_.update(sequence.to_bytes(4, byteorder="little", signed=False))
+
+    if base_type == NONE:
+        hash_.update(var_int.serialize(0))
+    elif base_type == SINGLE:
+        hash_.update(var_int.serialize(vin_i + 1))
+        # blanked outputs: 0xFFFFFFFFFFFFFFFF value and empty script
+        hash_.update((b"\xff" * 8 + b"\x00") * vin_i)
+        hash_.update(tx.vout[vin_i].serialize(False))
+    else:
+        hash_.update(var_int.serialize(len(tx.vout)))
+        hash_.update(context.outputs())
+
+    hash_.update(tx.lock_time.to_bytes(4, byteorder="little", signed=False))
+    hash_.update(hash_type.to_bytes(4, byteorder="little", signed=False))
+
+    return sha256(hash_.digest()).digest()
+
+
+def legacy(
+    script_: Octets,
+    tx: Tx,
+    vin_i: int,
+    hash_type: int,
+    *,
+    context: Optional[SegwitV0Context] = None,
 ) -> bytes:
-    script_ = bytes_from_octets(script_)
+    """Return the legacy hash to be signed for the vin_i input.
 
-    hash_prev_outs = b"\x00" * 32
-    if not hash_type & ANYONECANPAY:
-        hash_prev_outs = b"".join([vin.prev_out.serialize() for vin in tx.vin])
-        hash_prev_outs = hash256(hash_prev_outs)
-
-    hash_seqs = b"\x00" * 32
-    if (
-        not (hash_type & ANYONECANPAY)
-        and (hash_type & 0x1F) != SINGLE
-        and (hash_type & 0x1F) != NONE
-    ):
-        hash_seqs = b"".join(
-            [
-                vin.sequence.to_bytes(4, byteorder="little", signed=False)
-                for vin in tx.vin
-            ]
-        )
-        hash_seqs = hash256(hash_seqs)
+    When signing more inputs of the same transaction,
+    a SegwitV0Context avoids serializing again and again its outputs.
+    """
 
-    hash_outputs = b"\x00" * 32
-    if hash_type & 0x1F not in (SINGLE, NONE):
-        hash_outputs = b"".join([vout.serialize() for vout in tx.vout])
-        hash_outputs = hash256(hash_outputs)
-    elif (hash_type & 0x1F) == SINGLE and vin_i < len(tx.vout):
-        hash_outputs = hash256(tx.vout[vin_i].serialize())
+    script_ = bytes_from_octets(script_)
+    context = _context(tx, context)
+    return _legacy(script_, tx, vin_i, hash_type, context=context)
+
+
+def _segwit_v0(
+    script_: bytes,
+    tx: Tx,
+    vin_i: int,
+    hash_type: int,
+    amount: int,
+    *,
+    context: SegwitV0Context,
+) -> bytes:
 
+    hash_prev_outs, hash_seqs, hash_outputs = context.hashes(vin_i, hash_type)
     preimage = b"".join(
         [
             tx.version.to_bytes(4, byteorder="little", signed=False),
@@ -169,7 +250,31 @@ def segwit_v0(
     return hash256(preimage)
 
 
-def from_utxo(utxo: TxOut, tx: Tx, vin_i: int, hash_type: int) -> bytes:
+# https://github.com/bitcoin/bitcoin/blob/4b30c41b4ebf2eb70d8a3cd99cf4d05d405eec81/test/functional/test_framework/script.py#L673
+def segwit_v0(
+    script_: Octets,
+    tx: Tx,
+    vin_i: int,
+    hash_type: int,
+    amount: int,
+    *,
+    context: Optional[SegwitV0Context] = None,
+) -> bytes:
+    """Return the BIP143 hash to be signed for the vin_i input.
+
+    When signing more inputs of the same transaction,
+    a SegwitV0Context avoids hashing again and again
+    all its inputs and outputs.
+    """
+
+    script_ = bytes_from_octets(script_)
+    context = _context(tx, context)
+    return _segwit_v0(script_, tx, vin_i, hash_type, amount, context=context)
+
+
+def _from_utxo(
+    utxo: TxOut, tx: Tx, vin_i: int, hash_type: int, *, context: SegwitV0Context
+) -> bytes:
 
     script = utxo.script_pub_key.script
 
@@ -179,12 +284,54 @@ def from_utxo(utxo: TxOut, tx: Tx, vin_i: int, hash_type: int) -> bytes:
 
     if is_p2wpkh(script):
         script_ = witness_v0_script(script)[0]
-        return segwit_v0(script_, tx, vin_i, hash_type, utxo.value)
+        return _segwit_v0(script_, tx, vin_i, hash_type, utxo.value, context=context)
 
     if is_p2wsh(script):
         # the real script is contained in the witness
         script_ = witness_v0_script(tx.vin[vin_i].script_witness.stack[-1])[0]
-        return segwit_v0(script_, tx, vin_i, hash_type, utxo.value)
+        return _segwit_v0(script_, tx, vin_i, hash_type, utxo.value, context=context)
 
     script_ = legacy_script(script)[0]
-    return legacy(script_, tx, vin_i, hash_type)
+    return _legacy(script_, tx, vin_i, hash_type, context=context)
+
+
+def from_utxo(
+    utxo: TxOut,
+    tx: Tx,
+    vin_i: int,
+    hash_type: int,
+    *,
+    context: Optional[SegwitV0Context] = None,
+) -> bytes:
+
+    context = _context(tx, context)
+    return _from_utxo(utxo, tx, vin_i, hash_type, context=context)
+
+
+def from_utxos(
+    utxos: Sequence[TxOut], tx: Tx, hash_types: Union[int, Sequence[int]] = ALL
+) -> List[bytes]:
+    """Return the hashes to be signed for all the transaction inputs.
+
+    utxos are the outputs spent by the transaction inputs, in the same order;
+    hash_types is either a single hash type for all inputs
+    or a hash type for each input.
+    The hashes and the serialized outputs shared by the inputs
+    are computed only once.
+    """
+
+    if len(utxos) != len(tx.vin):
+        err_msg = f"mismatched number of utxos: {len(utxos)} instead of {len(tx.vin)}"
+        raise BTClibValueError(err_msg)
+    if isinstance(hash_types, int):
+        hash_types = [hash_types] * len(tx.vin)
+    elif len(hash_types) != len(tx.vin):
+        err_msg = f"mismatched number of hash types: {len(hash_types)}"
+        err_msg += f" instead of {len(tx.vin)}"
+        raise BTClibValueError(err_msg)
+
+    context = SegwitV0Context(tx)
+    return [
+        _from_utxo(utxo, tx, vin_i, hash_type, context=context)
+        for vin_i, (utxo, hash_type) in enumerate(zip(utxos, hash_types))
+    ]
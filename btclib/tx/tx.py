@@ -26,18 +26,32 @@ https://en.bitcoin.it/wiki/Timelock
 
 """
 
+from copy import deepcopy
 from dataclasses import dataclass
 from io import SEEK_CUR
 from math import ceil
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Type, TypeVar, Union
-
-from btclib import var_int
-from btclib.alias import BinaryData
-from btclib.exceptions import BTClibValueError
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from btclib import var_bytes, var_int
+from btclib.alias import BinaryData, Buffer
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
+from btclib.script.script_pub_key import ScriptPubKey
 from btclib.script.witness import Witness
+from btclib.tx.out_point import OutPoint
 from btclib.tx.tx_in import TX_IN_COMPARES_WITNESS, TxIn
-from btclib.tx.tx_out import TxOut
-from btclib.utils import bytesio_from_binarydata, hash256
+from btclib.tx.tx_out import TxOut, _intern_script
+from btclib.utils import bytes_from_octets, bytesio_from_binarydata, hash256
 
 _SEGWIT_MARKER = b"\x00\x01"
 
@@ -46,6 +60,8 @@ _Tx = TypeVar("_Tx", bound="Tx")
 
 @dataclass
 class Tx:
+    __slots__ = ("version", "lock_time", "vin", "vout", "_cache_fingerprint", "_cache")
+
     # 4 bytes, _signed_ little endian
     version: int
     # 0	Not locked
@@ -70,12 +86,53 @@ class Tx:
         "Return the nLockTime int for compatibility with CTransaction."
         return self.lock_time
 
+    def _fingerprint(self) -> Tuple[Any, ...]:
+        # all the serialized data, collected without serializing it
+        vin = tuple(
+            (
+                tx_in.prev_out.tx_id,
+                tx_in.prev_out.vout,
+                tx_in.script_sig,
+                tx_in.sequence,
+                tuple(tx_in.script_witness.stack),
+            )
+            for tx_in in self.vin
+        )
+        vout = tuple((v.value, v.script_pub_key.script) for v in self.vout)
+        return self.version, self.lock_time, vin, vout
+
+    def _hash(self, include_witness: bool) -> bytes:
+        """Return the hash of the serialization.
+
+        Results are memoized and discarded as soon as
+        any serialized data of the transaction has changed.
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint != self._cache_fingerprint:
+            self._cache_fingerprint: Optional[Tuple[Any, ...]] = fingerprint
+            self._cache: Dict[bool, bytes] = {}
+        if include_witness and not self.is_segwit():
+            include_witness = False
+        if include_witness not in self._cache:
+            serialized_ = self.serialize(include_witness, check_validity=False)
+            self._cache[include_witness] = hash256(serialized_)
+        return self._cache[include_witness]
+
+    def _size(self, include_witness: bool) -> int:
+        "Return the serialization size, without serializing."
+
+        size = 8  # version and lock_time
+        size += var_int.size(len(self.vin)) + sum(tx_in.size for tx_in in self.vin)
+        size += var_int.size(len(self.vout)) + sum(t.size for t in self.vout)
+        if include_witness and self.is_segwit():
+            size += len(_SEGWIT_MARKER)
+            size += sum(tx_in.script_witness.size for tx_in in self.vin)
+        return size
+
     @property
     def id(self) -> bytes:
         "Return the transaction id."
-        serialized_ = self.serialize(include_witness=False, check_validity=False)
-        hash256_ = hash256(serialized_)
-        return hash256_[::-1]
+        return self._hash(False)[::-1]
 
     @property
     def hash(self) -> bytes:
@@ -83,14 +140,12 @@ class Tx:
 
         It differs from tx_id for witness transactions.
         """
-        serialized_ = self.serialize(include_witness=True, check_validity=False)
-        hash256_ = hash256(serialized_)
-        return hash256_[::-1]
+        return self._hash(True)[::-1]
 
     @property
     def size(self) -> int:
         "Return the transaction size."
-        return len(self.serialize(include_witness=True, check_validity=False))
+        return self._size(True)
 
     @property
     def vsize(self) -> int:
@@ -102,9 +157,12 @@ class Tx:
 
     @property
     def weight(self) -> int:
-        no_wit = len(self.serialize(include_witness=False, check_validity=False)) * 3
-        wit = len(self.serialize(include_witness=True, check_validity=False))
-        return no_wit + wit
+        base_size = self._size(False)
+        if not self.is_segwit():
+            return base_size * 4
+        witness_size = len(_SEGWIT_MARKER)
+        witness_size += sum(tx_in.script_witness.size for tx_in in self.vin)
+        return base_size * 4 + witness_size
 
     @property
     def vwitness(self) -> List[Witness]:
@@ -132,6 +190,10 @@ class Tx:
         self.vin = list(vin) if vin else []
         self.vout = list(vout) if vout else []
 
+        # see _hash
+        self._cache_fingerprint = None
+        self._cache = {}
+
         if check_validity:
             self.assert_valid()
 
@@ -143,11 +205,12 @@ class Tx:
             return False  # pragma: no cover
 
         # FIXME use super().__eq__
-        return (self.version, self.lock_time, self.vin, self.vout) == (
+        # vin and vout are tuples in FrozenTx
+        return (self.version, self.lock_time, tuple(self.vin), tuple(self.vout)) == (
             other.version,
             other.lock_time,
-            other.vin,
-            other.vout,
+            tuple(other.vin),
+            tuple(other.vout),
         )
 
     def to_dict(
@@ -226,6 +289,11 @@ class Tx:
     def parse(cls: Type[_Tx], data: BinaryData, check_validity: bool = True) -> _Tx:
         "Return a Tx by parsing binary data."
 
+        if isinstance(data, str):  # hex string
+            data = bytes_from_octets(data)
+        if isinstance(data, bytes):
+            return cls.parse_at(data, 0, check_validity)[0]
+
         stream = bytesio_from_binarydata(data)
 
         # version is a signed int (int32_t, not uint32_t)
@@ -236,16 +304,167 @@ class Tx:
             # Change stream position: seek to byte offset relative to position
             stream.seek(-2, SEEK_CUR)  # current position
 
+        # validated only once, when the Tx is created
         n = var_int.parse(stream)
-        vin = [TxIn.parse(stream) for _ in range(n)]
+        vin = [TxIn.parse(stream, check_validity=False) for _ in range(n)]
 
         n = var_int.parse(stream)
-        vout = [TxOut.parse(stream) for _ in range(n)]
+        vout = [TxOut.parse(stream, check_validity=False) for _ in range(n)]
 
         if segwit:
             for tx_in in vin:
-                tx_in.script_witness = Witness.parse(stream, check_validity)
+                tx_in.script_witness = Witness.parse(stream, check_validity=False)
 
         lock_time = int.from_bytes(stream.read(4), byteorder="little", signed=False)
 
         return cls(version, lock_time, vin, vout, check_validity)
+
+    @classmethod
+    def parse_at(
+        cls: Type[_Tx],
+        data: Buffer,
+        offset: int = 0,
+        check_validity: bool = True,
+        include_witness: bool = True,
+    ) -> Tuple[_Tx, int]:
+        """Return the Tx at offset and the offset just after it.
+
+        The buffer (e.g. bytes, memoryview, or mmap) is parsed in place
+        using an integer offset, instead of being wrapped in a stream:
+        only the Tx fields are copied.
+        If include_witness is False, witnesses are skipped
+        (i.e. not parsed) and left empty.
+        """
+
+        # version is a signed int (int32_t, not uint32_t)
+        version = int.from_bytes(data[offset : offset + 4], "little", signed=True)
+        i = offset + 4
+
+        segwit = data[i : i + 2] == _SEGWIT_MARKER
+        if segwit:
+            i += 2
+
+        n, i = var_int.parse_at(data, i)
+        vin: List[TxIn] = []
+        for _ in range(n):
+            tx_id = bytes(data[i : i + 32])[::-1]
+            vout = int.from_bytes(data[i + 32 : i + 36], "little", signed=False)
+            prev_out = OutPoint(tx_id, vout, check_validity=False)
+            script_sig, i = var_bytes.parse_at(data, i + 36)
+            sequence = int.from_bytes(data[i : i + 4], "little", signed=False)
+            i += 4
+            vin.append(TxIn(prev_out, script_sig, sequence, Witness(), False))
+
+        n, i = var_int.parse_at(data, i)
+        vout_: List[TxOut] = []
+        for _ in range(n):
+            value = int.from_bytes(data[i : i + 8], "little", signed=False)
+            script, i = var_bytes.parse_at(data, i + 8)
+            script = _intern_script(script)
+            script_pub_key = ScriptPubKey(script, "mainnet", check_validity=False)
+            vout_.append(TxOut(value, script_pub_key, check_validity=False))
+
+        if segwit:
+            for tx_in in vin:
+                n, i = var_int.parse_at(data, i)
+                stack: List[bytes] = []
+                for _ in range(n):
+                    if include_witness:
+                        stack_element, i = var_bytes.parse_at(data, i)
+                        stack.append(stack_element)
+                    else:
+                        length, i = var_int.parse_at(data, i)
+                        i += length
+                tx_in.script_witness.stack = stack
+
+        lock_time = int.from_bytes(data[i : i + 4], "little", signed=False)
+        i += 4
+        if i > len(data):
+            raise BTClibRuntimeError("not enough binary data")
+
+        return cls(version, lock_time, vin, vout_, check_validity), i
+
+
+class FrozenTx(Tx):
+    """Immutable Tx, with O(1) id, hash, size, vsize, and weight.
+
+    Unlike Tx, memoized values are never checked for changes:
+    vin and vout are tuples and attributes cannot be set.
+    As for frozen dataclasses, immutability is shallow:
+    the TxIn and TxOut of a FrozenTx must not be modified.
+    """
+
+    __slots__ = ("_sizes", "_segwit")
+
+    _sizes: Dict[bool, int]
+    _segwit: bool
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        version: int = 1,
+        lock_time: int = 0,
+        vin: Optional[Sequence[TxIn]] = None,
+        vout: Optional[Sequence[TxOut]] = None,
+        check_validity: bool = True,
+    ) -> None:
+
+        # Tx.__init__ would set the attributes
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "lock_time", lock_time)
+        object.__setattr__(self, "vin", tuple(vin) if vin else ())
+        object.__setattr__(self, "vout", tuple(vout) if vout else ())
+        object.__setattr__(self, "_cache", {})
+        object.__setattr__(self, "_sizes", {})
+        segwit = any(tx_in.is_segwit() for tx_in in self.vin)
+        object.__setattr__(self, "_segwit", segwit)
+
+        if check_validity:
+            self.assert_valid()
+
+    @classmethod
+    def from_tx(cls, tx: Tx, check_validity: bool = True) -> "FrozenTx":
+        "Return a FrozenTx with a copy of the inputs and outputs of tx."
+        vin, vout = deepcopy(tx.vin), deepcopy(tx.vout)
+        return cls(tx.version, tx.lock_time, vin, vout, check_validity)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise BTClibRuntimeError(f"FrozenTx is immutable: cannot set {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise BTClibRuntimeError(f"FrozenTx is immutable: cannot delete {name}")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # copy and pickle without setting attributes
+        return self.__class__, (
+            self.version,
+            self.lock_time,
+            self.vin,
+            self.vout,
+            False,
+        )
+
+    def __hash__(self) -> int:
+        return hash(self._hash(False))
+
+    def is_segwit(self) -> bool:
+        return self._segwit
+
+    def _hash(self, include_witness: bool) -> bytes:
+        "Return the hash of the serialization, computed only once."
+        include_witness = include_witness and self._segwit
+        if include_witness not in self._cache:
+            serialized_ = self.serialize(include_witness, check_validity=False)
+            self._cache[include_witness] = hash256(serialized_)
+        return self._cache[include_witness]
+
+    def _size(self, include_witness: bool) -> int:
+        "Return the serialization size, computed only once."
+        include_witness = include_witness and self._segwit
+        if include_witness not in self._sizes:
+            self._sizes[include_witness] = super()._size(include_witness)
+        return self._sizes[include_witness]
+
+    @property
+    def weight(self) -> int:
+        # the witness data is the difference between the two sizes
+        return self._size(False) * 3 + self._size(True)
@@ -13,8 +13,8 @@
 Dataclass encapsulating prev_out, script_sig, sequence, and script_witness.
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Mapping, Type, TypeVar
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Type, TypeVar
 
 from btclib import var_bytes
 from btclib.alias import BinaryData, Octets
@@ -30,6 +30,8 @@ TX_IN_COMPARES_WITNESS = True
 
 @dataclass
 class TxIn:
+    __slots__ = ("prev_out", "script_sig", "sequence", "script_witness")
+
     prev_out: OutPoint
     script_sig: bytes
     # If all TxIns have final (0xffffffff) sequence numbers
@@ -44,7 +46,7 @@ class TxIn:
     # lower than 0xFFFFFFFD to be meaningful,
     # all sequence locked transactions are opting into RBF.
     sequence: int
-    script_witness: Witness = field(compare=TX_IN_COMPARES_WITNESS)
+    script_witness: Witness
 
     @property
     def outpoint(self) -> OutPoint:
@@ -61,26 +63,48 @@ class TxIn:
         "Return the nSequence int for compatibility with CTxIn."
         return self.sequence
 
+    @property
+    def size(self) -> int:
+        """Return the serialization size, without serializing.
+
+        As for serialize, the script_witness is not included.
+        """
+        return self.prev_out.size + var_bytes.size(self.script_sig) + 4
+
     def __init__(
         self,
         prev_out: OutPoint = OutPoint(),
         script_sig: Octets = b"",
         sequence: int = 0,
-        script_witness: Witness = Witness(),
+        script_witness: Optional[Witness] = None,
         check_validity: bool = True,
     ) -> None:
 
         self.prev_out = prev_out
         self.script_sig = bytes_from_octets(script_sig)
         self.sequence = sequence
-        self.script_witness = script_witness
+        # https://docs.python.org/3/tutorial/controlflow.html#default-argument-values
+        self.script_witness = Witness() if script_witness is None else script_witness
 
         if check_validity:
             self.assert_valid()
 
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, TxIn):
+            return NotImplemented
+
+        if TX_IN_COMPARES_WITNESS and self.script_witness != other.script_witness:
+            return False
+        return (self.prev_out, self.script_sig, self.sequence) == (
+            other.prev_out,
+            other.script_sig,
+            other.sequence,
+        )
+
     def is_segwit(self) -> bool:
         # self.prev_out has no segwit information
-        return self.script_witness.stack != []
+        return bool(self.script_witness.stack)
 
     def is_coinbase(self) -> bool:
         return self.prev_out.is_coinbase()
@@ -136,7 +160,7 @@ class TxIn:
     def parse(cls: Type[_TxIn], data: BinaryData, check_validity: bool = True) -> _TxIn:
 
         stream = bytesio_from_binarydata(data)
-        prev_out = OutPoint.parse(stream)
+        prev_out = OutPoint.parse(stream, check_validity=False)
         script_sig = var_bytes.parse(stream)
         sequence = int.from_bytes(stream.read(4), byteorder="little", signed=False)
 
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Persistent transaction index (TxIndex).
+
+A TxIndex resolves txids to the location of the raw transaction
+in local block data, i.e. blk*.dat files,
+without the need of a full node -txindex.
+
+Records are stored in a local sqlite database as compact
+fixed-width integers: txid truncated to KEY_SIZE bytes,
+file number, offset, and length of the transaction.
+Blocks can be appended incrementally and lookups are O(log n).
+
+Truncated keys may collide: lookups return all candidate locations
+and raw_tx checks the full txid of the candidate transactions.
+"""
+
+import sqlite3
+from typing import Any, Callable, List, Optional, Tuple
+
+from btclib.alias import Buffer, Octets
+from btclib.tx.blk_file import BlkFile, xor
+from btclib.tx.tx_offsets import TxOffsets
+from btclib.tx.tx_view import TxView
+from btclib.utils import bytes_from_octets
+
+KEY_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tx_index (
+    key INTEGER NOT NULL,
+    file INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (key, file, offset)
+) WITHOUT ROWID
+"""
+
+
+def _key(tx_id: bytes) -> int:
+    # sqlite integers are 64-bit signed
+    return int.from_bytes(tx_id[:KEY_SIZE], byteorder="big", signed=True)
+
+
+def _records(data: Buffer, file_number: int, offset: int) -> List[Tuple[int, ...]]:
+    view = memoryview(data)
+    tx_offsets = TxOffsets.from_block(view)
+    records: List[Tuple[int, ...]] = []
+    for i, (tx_offset, length, _) in enumerate(tx_offsets):
+        tx_id = tx_offsets.tx_id(view, i)
+        records.append((_key(tx_id), file_number, offset + tx_offset, length))
+    return records
+
+
+class TxIndex:
+    """Persistent txid to (file number, offset, length) index.
+
+    It should be used as context manager, to close the database:
+
+        with TxIndex("txindex.sqlite") as tx_index:
+            with BlkFile(filename) as blk_file:
+                tx_index.add_blk_file(blk_file, file_number)
+    """
+
+    def __init__(self, filename: str = ":memory:") -> None:
+        self.filename = filename
+        self._db = sqlite3.connect(filename)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "TxIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM tx_index").fetchone()[0]
+
+    def _insert(self, records: List[Tuple[int, ...]]) -> None:
+        # re-indexing the same block is harmless
+        sql = "INSERT OR IGNORE INTO tx_index VALUES (?, ?, ?, ?)"
+        self._db.executemany(sql, records)
+
+    def add_block(self, data: Buffer, file_number: int, offset: int) -> int:
+        """Index the transactions of a serialized block.
+
+        offset is the one of the block in the file_number blk*.dat file.
+        Return the number of indexed transactions.
+        """
+        records = _records(data, file_number, offset)
+        with self._db:
+            self._insert(records)
+        return len(records)
+
+    def add_blk_file(self, blk_file: BlkFile, file_number: int) -> int:
+        """Index the transactions of all the blocks of a blk*.dat file.
+
+        Return the number of indexed transactions.
+        """
+        n = 0
+        with self._db:
+            for offset, raw_block in blk_file.raw_blocks():
+                records = _records(raw_block, file_number, offset)
+                self._insert(records)
+                n += len(records)
+        return n
+
+    def locations(self, tx_id: Octets) -> List[Tuple[int, int, int]]:
+        """Return the candidate (file number, offset, length) of the txid.
+
+        Because of truncated keys, more than one location is possible.
+        """
+        sql = "SELECT file, offset, length FROM tx_index WHERE key = ? ORDER BY 1, 2"
+        rows = self._db.execute(sql, (_key(bytes_from_octets(tx_id, 32)),))
+        return list(rows)
+
+    def raw_tx(
+        self,
+        tx_id: Octets,
+        filename: Callable[[int], str],
+        xor_key: Octets = b"",
+    ) -> Optional[bytes]:
+        """Return the serialized transaction, if indexed.
+
+        filename maps a file number to the name of the blk*.dat file.
+        """
+        tx_id = bytes_from_octets(tx_id, 32)
+        key = bytes_from_octets(xor_key)
+        for file_number, offset, length in self.locations(tx_id):
+            with open(filename(file_number), "rb") as file_:
+                file_.seek(offset)
+                data = xor(file_.read(length), key, offset)
+            if TxView.parse_at(data).id == tx_id:
+                return data
+        return None
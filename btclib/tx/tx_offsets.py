@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Transaction offsets (TxOffsets) of a serialized block.
+
+TxOffsets are computed walking the block using only var_int
+and length fields: then any transaction can be sliced out of the block,
+parsed, or have its id computed, without touching the other ones.
+
+As compact array of integers, TxOffsets can be serialized
+and cached alongside the block.
+"""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, Tuple, Type, TypeVar
+
+from btclib import var_int
+from btclib.alias import Buffer
+from btclib.exceptions import BTClibValueError
+from btclib.tx.tx import Tx
+from btclib.tx.tx_view import TxView, scan_at
+
+# 32-bit unsigned integers
+_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+_TxOffsets = TypeVar("_TxOffsets", bound="TxOffsets")
+
+
+class TxOffsets:
+    """Offsets of the transactions of a serialized block.
+
+    For each transaction: offset, length, and witness offset
+    (i.e. the offset of the witness section,
+    empty for non-segwit transactions),
+    all relative to the start of the block.
+    """
+
+    def __init__(self, offsets: Iterable[int] = ()) -> None:
+        self._offsets = array(_TYPECODE, offsets)
+        if len(self._offsets) % 3:
+            raise BTClibValueError(f"invalid number of offsets: {len(self._offsets)}")
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 3
+
+    def __getitem__(self, i: int) -> Tuple[int, int, int]:
+        "Return offset, length, and witness offset of the i-th transaction."
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transaction index out of range")
+        offset, length, witness_offset = self._offsets[3 * i : 3 * i + 3]
+        return offset, length, witness_offset
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        "Yield offset, length, and witness offset of each transaction."
+        offsets = iter(self._offsets)
+        return zip(offsets, offsets, offsets)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TxOffsets):
+            return NotImplemented  # pragma: no cover
+        return self._offsets == other._offsets
+
+    @classmethod
+    def from_block(cls: Type[_TxOffsets], data: Buffer) -> _TxOffsets:
+        "Return the TxOffsets of a serialized block."
+
+        n, i = var_int.parse_at(data, 80)
+        tx_offsets = cls()
+        for _ in range(n):
+            witness_offset, end = scan_at(data, i)
+            tx_offsets._offsets.extend((i, end - i, witness_offset))
+            i = end
+        return tx_offsets
+
+    def tx_view(self, data: Buffer, i: int) -> TxView:
+        "Return the TxView of the i-th transaction of the serialized block."
+        offset, length, witness_offset = self[i]
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        end = offset + length
+        return TxView(view, offset, end, witness_offset, end - 4)
+
+    def tx(
+        self,
+        data: Buffer,
+        i: int,
+        check_validity: bool = True,
+        include_witness: bool = True,
+    ) -> Tx:
+        "Return the i-th transaction of the serialized block."
+        offset, _, _ = self[i]
+        return Tx.parse_at(data, offset, check_validity, include_witness)[0]
+
+    def tx_id(self, data: Buffer, i: int) -> bytes:
+        "Return the id of the i-th transaction of the serialized block."
+        return self.tx_view(data, i).id
+
+    def serialize(self) -> bytes:
+        "Return the serialization as little endian 32-bit unsigned integers."
+        offsets = array(_TYPECODE, self._offsets)
+        if sys.byteorder == "big":  # pragma: no cover
+            offsets.byteswap()
+        return offsets.tobytes()
+
+    @classmethod
+    def parse(cls: Type[_TxOffsets], data: bytes) -> _TxOffsets:
+        "Return the TxOffsets from its serialization."
+
+        if len(data) % 12:
+            raise BTClibValueError(f"invalid TxOffsets size: {len(data)}")
+        tx_offsets = cls()
+        tx_offsets._offsets.frombytes(data)
+        if sys.byteorder == "big":  # pragma: no cover
+            tx_offsets._offsets.byteswap()
+        return tx_offsets
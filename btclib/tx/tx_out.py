@@ -15,6 +15,7 @@ Dataclass encapsulating value and script_pub_key
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, Mapping, Type, TypeVar, Union
 
 from btclib import var_bytes
@@ -26,9 +27,21 @@ from btclib.utils import bytes_from_octets, bytesio_from_binarydata
 _TxOut = TypeVar("_TxOut", bound="TxOut")
 
 
+@lru_cache(maxsize=1 << 14)
+def _intern_script(script: bytes) -> bytes:
+    """Return the cached copy of a recently parsed script.
+
+    Scripts paying to the same address are repeated across transactions:
+    when parsing, they are shared instead of being copied again.
+    """
+    return script
+
+
 # FIXME make it frozen
 @dataclass
 class TxOut:
+    __slots__ = ("value", "script_pub_key")
+
     # 8 bytes, unsigned little endian
     value: int  # denominated in satoshi
     script_pub_key: ScriptPubKey
@@ -43,6 +56,11 @@ class TxOut:
         "Return the scriptPubKey bytes for compatibility with CTxOut."
         return self.script_pub_key.script
 
+    @property
+    def size(self) -> int:
+        "Return the serialization size, without serializing."
+        return 8 + var_bytes.size(self.script_pub_key.script)
+
     def __init__(
         self,
         value: int,
@@ -53,7 +71,7 @@ class TxOut:
         object.__setattr__(self, "value", value)
         if not isinstance(script_pub_key, ScriptPubKey):
             script_bytes = bytes_from_octets(script_pub_key)
-            script_pub_key = ScriptPubKey(script_bytes)
+            script_pub_key = ScriptPubKey(script_bytes, check_validity=False)
         object.__setattr__(self, "script_pub_key", script_pub_key)
 
         if check_validity:
@@ -106,8 +124,9 @@ class TxOut:
     ) -> _TxOut:
         stream = bytesio_from_binarydata(data)
         value = int.from_bytes(stream.read(8), byteorder="little", signed=False)
-        script = var_bytes.parse(stream)
-        return cls(value, ScriptPubKey(script, "mainnet"), check_validity)
+        script = _intern_script(var_bytes.parse(stream))
+        script_pub_key = ScriptPubKey(script, "mainnet", check_validity=False)
+        return cls(value, script_pub_key, check_validity)
 
     @classmethod
     def from_address(cls: Type[_TxOut], value: int, address: String) -> _TxOut:
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Lightweight view of a serialized transaction (TxView) dataclass.
+
+A TxView records the offsets of a transaction serialized in a buffer
+(e.g. a raw block or a memory-mapped blk*.dat file):
+no Tx field is parsed nor copied.
+Transaction id, hash, size, and weight are computed
+directly from the buffer span, without re-serialization;
+the Tx is materialized only when required.
+"""
+
+from dataclasses import dataclass
+from hashlib import sha256
+from math import ceil
+from typing import IO, Tuple, Type, TypeVar
+
+from btclib import var_int
+from btclib.alias import Buffer
+from btclib.exceptions import BTClibRuntimeError
+from btclib.tx.tx import _SEGWIT_MARKER, Tx
+
+_TxView = TypeVar("_TxView", bound="TxView")
+
+
+def _read_tx_bytes(stream: IO[bytes]) -> bytearray:
+    "Return the bytes of the Tx read from the stream."
+
+    buffer = bytearray()
+    pos = 0
+
+    def take(n: int) -> int:
+        "Return the offset of the next n bytes, reading them if needed."
+        nonlocal pos
+        missing = pos + n - len(buffer)
+        if missing > 0:
+            chunk = stream.read(missing)
+            buffer.extend(chunk)
+            if len(chunk) != missing:
+                raise BTClibRuntimeError("not enough binary data")
+        start = pos
+        pos += n
+        return start
+
+    def take_var_int() -> int:
+        prefix = buffer[take(1)]
+        if prefix < 0xFD:
+            return prefix
+        size = 2 if prefix == 0xFD else 4 if prefix == 0xFE else 8
+        start = take(size)
+        return int.from_bytes(buffer[start : start + size], "little", signed=False)
+
+    take(4)
+    start = take(2)
+    segwit = buffer[start : start + 2] == _SEGWIT_MARKER
+    if not segwit:
+        pos -= 2
+    n_vin = take_var_int()
+    for _ in range(n_vin):
+        take(36)
+        take(take_var_int())
+        take(4)
+    for _ in range(take_var_int()):
+        take(8)
+        take(take_var_int())
+    if segwit:
+        for _ in range(n_vin):
+            for _ in range(take_var_int()):
+                take(take_var_int())
+    take(4)
+    return buffer
+
+
+def _skip_var_bytes(data: Buffer, offset: int, n: int) -> int:
+    "Return the offset after n var_bytes."
+    for _ in range(n):
+        length, offset = var_int.parse_at(data, offset)
+        offset += length
+    return offset
+
+
+@dataclass(frozen=True)
+class TxView:
+    data: memoryview
+    # offsets of the Tx serialization in data
+    start: int
+    end: int
+    # offsets of the witness section (empty for non-segwit serialization)
+    witness_start: int
+    witness_end: int
+
+    def _has_marker(self) -> bool:
+        return self.data[self.start + 4 : self.start + 6] == _SEGWIT_MARKER
+
+    @property
+    def base_size(self) -> int:
+        "Return the transaction size without witness."
+        size = self.end - self.start
+        if self._has_marker():
+            size -= len(_SEGWIT_MARKER) + self.witness_end - self.witness_start
+        return size
+
+    def is_segwit(self) -> bool:
+        """Return True if the transaction has witness data.
+
+        Consistently with Tx, a segwit serialization
+        with empty witnesses only is not a segwit transaction.
+        """
+        # an empty witness is a single zero byte,
+        # a non-empty one starts with a non-zero var_int
+        return any(self.data[self.witness_start : self.witness_end])
+
+    @property
+    def size(self) -> int:
+        "Return the transaction size."
+        if not self.is_segwit():
+            return self.base_size
+        return self.end - self.start
+
+    @property
+    def weight(self) -> int:
+        return self.base_size * 3 + self.size
+
+    @property
+    def vsize(self) -> int:
+        return ceil(self.weight / 4)
+
+    def _base_hash(self) -> bytes:
+        hash_ = sha256()
+        if not self._has_marker():
+            hash_.update(self.data[self.start : self.end])
+        else:
+            marker_end = self.start + 4 + len(_SEGWIT_MARKER)
+            hash_.update(self.data[self.start : self.start + 4])
+            hash_.update(self.data[marker_end : self.witness_start])
+            hash_.update(self.data[self.witness_end : self.end])
+        return sha256(hash_.digest()).digest()
+
+    @property
+    def id(self) -> bytes:
+        "Return the transaction id."
+        return self._base_hash()[::-1]
+
+    @property
+    def hash(self) -> bytes:
+        "Return the transaction hash."
+        if not self.is_segwit():
+            return self.id
+        hash_ = sha256(self.data[self.start : self.end]).digest()
+        return sha256(hash_).digest()[::-1]
+
+    def serialize(self) -> bytes:
+        "Return the transaction serialization as found in the buffer."
+        return self.data[self.start : self.end].tobytes()
+
+    def tx(self, check_validity: bool = True, include_witness: bool = True) -> Tx:
+        """Return the materialized Tx.
+
+        If include_witness is False, witnesses are not parsed.
+        """
+        tx, _ = Tx.parse_at(self.data, self.start, check_validity, include_witness)
+        return tx
+
+    @classmethod
+    def read(cls: Type[_TxView], stream: IO[bytes]) -> _TxView:
+        """Return the TxView of the Tx read from a binary stream.
+
+        Exactly the Tx bytes are read from the stream
+        (the stream does not need to be seekable)
+        and then owned by the TxView.
+        """
+        return cls.parse_at(_read_tx_bytes(stream))
+
+    @classmethod
+    def parse_at(cls: Type[_TxView], data: Buffer, offset: int = 0) -> _TxView:
+        """Return the TxView of the Tx at offset.
+
+        Only offsets are computed: the end of the Tx
+        is available as the end attribute.
+        """
+
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        witness_start, end = scan_at(view, offset)
+        return cls(view, offset, end, witness_start, end - 4)
+
+
+def scan_at(data: Buffer, offset: int = 0) -> Tuple[int, int]:
+    """Return the witness and end offsets of the Tx at offset.
+
+    The witness section (empty for non-segwit serialization)
+    ends where the lock_time starts, i.e. four bytes before the end.
+    Only var_int and length fields are read.
+    """
+
+    i = offset + 4
+    segwit = data[i : i + 2] == _SEGWIT_MARKER
+    if segwit:
+        i += 2
+
+    n_vin, i = var_int.parse_at(data, i)
+    for _ in range(n_vin):
+        i = _skip_var_bytes(data, i + 36, 1) + 4
+
+    n, i = var_int.parse_at(data, i)
+    for _ in range(n):
+        i = _skip_var_bytes(data, i + 8, 1)
+
+    witness_start = i
+    if segwit:
+        for _ in range(n_vin):
+            n, i = var_int.parse_at(data, i)
+            i = _skip_var_bytes(data, i, n)
+
+    end = i + 4
+    if end > len(data):
+        raise BTClibRuntimeError("not enough binary data")
+    return witness_start, end
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Unspent transaction output set (UtxoSet).
+
+Unspent outputs (Coin) are stored with compact keys,
+i.e. the 36 bytes OutPoint serialization,
+and compact values: height and coinbase flag,
+compressed amount, and compressed script_pub_key
+(as in Bitcoin Core, but with var_int integers).
+
+Blocks are connected and disconnected,
+the latter using the undo data (spent coins)
+returned when connecting the block.
+
+The storage is any MutableMapping[bytes, bytes],
+e.g. an in-memory dict (the default) or a SqliteStore.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from btclib import var_bytes, var_int
+from btclib.alias import Buffer
+from btclib.exceptions import BTClibValueError
+from btclib.tx.blocks import Block
+from btclib.tx.out_point import OutPoint
+
+# scripts larger than that are unspendable
+MAX_SCRIPT_SIZE = 10_000
+
+# number of special script types of the script compression
+_N_SPECIAL_SCRIPTS = 6
+
+_Coin = TypeVar("_Coin", bound="Coin")
+
+
+def compress_amount(n: int) -> int:
+    "Return the compressed amount, shrinking trailing zeros."
+
+    if n == 0:
+        return 0
+    e = 0
+    while n % 10 == 0 and e < 9:
+        n //= 10
+        e += 1
+    if e < 9:
+        d = n % 10
+        n //= 10
+        return 1 + (n * 9 + d - 1) * 10 + e
+    return 1 + (n - 1) * 10 + 9
+
+
+def decompress_amount(x: int) -> int:
+    "Return the amount from its compressed value."
+
+    if x == 0:
+        return 0
+    x -= 1
+    e = x % 10
+    x //= 10
+    if e < 9:
+        d = x % 9 + 1
+        x //= 9
+        n = x * 10 + d
+    else:
+        n = x + 1
+    return n * 10 ** e
+
+
+def compress_script(script: bytes) -> bytes:
+    """Return the compressed script_pub_key.
+
+    p2pkh, p2sh, and compressed p2pk are reduced to
+    their hash (or key) prefixed by a type byte.
+    Uncompressed p2pk, which would require key decompression,
+    is stored as any other script.
+    """
+
+    if (
+        len(script) == 25
+        and script[:3] == b"\x76\xa9\x14"
+        and script[23:] == b"\x88\xac"
+    ):
+        return b"\x00" + script[3:23]
+    if len(script) == 23 and script[:2] == b"\xa9\x14" and script[22:] == b"\x87":
+        return b"\x01" + script[2:22]
+    if len(script) == 35 and script[:1] == b"\x21" and script[34:] == b"\xac":
+        if script[1] in (2, 3):
+            return script[1:34]
+    return var_int.serialize(len(script) + _N_SPECIAL_SCRIPTS) + script
+
+
+def decompress_script_at(data: Buffer, offset: int = 0) -> Tuple[bytes, int]:
+    "Return the script_pub_key at offset and the offset just after it."
+
+    script_type, offset = var_int.parse_at(data, offset)
+    if script_type == 0:
+        hash_ = bytes(data[offset : offset + 20])
+        return b"\x76\xa9\x14" + hash_ + b"\x88\xac", offset + 20
+    if script_type == 1:
+        hash_ = bytes(data[offset : offset + 20])
+        return b"\xa9\x14" + hash_ + b"\x87", offset + 20
+    if script_type in (2, 3):
+        x_coord = bytes(data[offset : offset + 32])
+        return b"\x21" + bytes([script_type]) + x_coord + b"\xac", offset + 32
+    if script_type < _N_SPECIAL_SCRIPTS:
+        raise BTClibValueError(f"unsupported script type: {script_type}")
+    end = offset + script_type - _N_SPECIAL_SCRIPTS
+    return bytes(data[offset:end]), end
+
+
+def is_unspendable(script: bytes) -> bool:
+    "Return True if the script_pub_key can never be spent."
+    return script[:1] == b"\x6a" or len(script) > MAX_SCRIPT_SIZE
+
+
+@dataclass(frozen=True)
+class Coin:
+    "Unspent transaction output, with the height of its transaction."
+
+    value: int
+    script_pub_key: bytes
+    height: int
+    is_coinbase: bool
+
+    def serialize(self) -> bytes:
+        "Return the compact serialization of the Coin."
+        out = var_int.serialize(self.height * 2 + self.is_coinbase)
+        out += var_int.serialize(compress_amount(self.value))
+        return out + compress_script(self.script_pub_key)
+
+    @classmethod
+    def parse(cls: Type[_Coin], data: Buffer) -> _Coin:
+        "Return a Coin from its compact serialization."
+        code, offset = var_int.parse_at(data, 0)
+        amount, offset = var_int.parse_at(data, offset)
+        script, _ = decompress_script_at(data, offset)
+        return cls(decompress_amount(amount), script, code >> 1, bool(code & 1))
+
+
+def _key(tx_id: bytes, vout: int) -> bytes:
+    "Return the 36 bytes serialization of the OutPoint."
+    return tx_id[::-1] + vout.to_bytes(4, byteorder="little", signed=False)
+
+
+class UtxoSet:
+    """Unspent transaction output set.
+
+    Blocks must be connected (and disconnected) in chain order.
+    """
+
+    def __init__(self, store: Optional[MutableMapping[bytes, bytes]] = None) -> None:
+        self.store: MutableMapping[bytes, bytes] = {} if store is None else store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __contains__(self, out_point: OutPoint) -> bool:
+        return _key(out_point.tx_id, out_point.vout) in self.store
+
+    def get(self, out_point: OutPoint) -> Optional[Coin]:
+        "Return the unspent Coin of the OutPoint, if any."
+        value = self.store.get(_key(out_point.tx_id, out_point.vout))
+        return None if value is None else Coin.parse(value)
+
+    def connect_block(self, block: Block, height: int) -> bytes:
+        """Spend the block inputs and add its outputs.
+
+        Return the undo data, i.e. the spent coins.
+        The UtxoSet is left unchanged if any input is missing.
+        """
+
+        added: Dict[bytes, bytes] = {}
+        removed: Set[bytes] = set()
+        spent: List[bytes] = []
+        for tx in block.transactions:
+            is_coinbase = tx.is_coinbase()
+            if not is_coinbase:
+                for tx_in in tx.vin:
+                    prev_out = tx_in.prev_out
+                    key = _key(prev_out.tx_id, prev_out.vout)
+                    # outputs of the same block
+                    value = added.pop(key, None)
+                    if value is None and key not in removed:
+                        value = self.store.get(key)
+                        removed.add(key)
+                    if value is None:
+                        err_msg = "missing or spent output: "
+                        err_msg += f"{prev_out.tx_id.hex()}:{prev_out.vout}"
+                        raise BTClibValueError(err_msg)
+                    spent.append(value)
+            tx_id = tx.id
+            for vout, tx_out in enumerate(tx.vout):
+                script = tx_out.script_pub_key.script
+                if not is_unspendable(script):
+                    coin = Coin(tx_out.value, script, height, is_coinbase)
+                    added[_key(tx_id, vout)] = coin.serialize()
+
+        for key in removed:
+            del self.store[key]
+        self.store.update(added)
+        undo = var_int.serialize(len(spent))
+        return undo + b"".join(var_bytes.serialize(value) for value in spent)
+
+    def disconnect_block(self, block: Block, undo: Buffer) -> None:
+        """Remove the block outputs and restore the spent coins.
+
+        The UtxoSet is left unchanged if any output is missing.
+        """
+
+        n, offset = var_int.parse_at(undo, 0)
+        spent = []
+        for _ in range(n):
+            value, offset = var_bytes.parse_at(undo, offset)
+            spent.append(value)
+        n_inputs = sum(len(tx.vin) for tx in block.transactions if not tx.is_coinbase())
+        if n_inputs != len(spent) or offset != len(undo):
+            raise BTClibValueError("invalid undo data")
+
+        added: Dict[bytes, bytes] = {}
+        removed: List[bytes] = []
+        for tx in reversed(block.transactions):
+            tx_id = tx.id
+            for vout, tx_out in enumerate(tx.vout):
+                if is_unspendable(tx_out.script_pub_key.script):
+                    continue
+                key = _key(tx_id, vout)
+                # outputs spent in the same block have been restored
+                if added.pop(key, None) is None:
+                    if key not in self.store:
+                        err_msg = f"missing output: {tx_id.hex()}:{vout}"
+                        raise BTClibValueError(err_msg)
+                    removed.append(key)
+            if not tx.is_coinbase():
+                for tx_in in reversed(tx.vin):
+                    prev_out = tx_in.prev_out
+                    added[_key(prev_out.tx_id, prev_out.vout)] = spent.pop()
+
+        for key in removed:
+            del self.store[key]
+        self.store.update(added)
+
+
+class SqliteStore(MutableMapping[bytes, bytes]):
+    """UtxoSet storage in a local sqlite database.
+
+    Changes are committed by commit (e.g. after each block),
+    or when used as context manager:
+
+        with SqliteStore("utxo.sqlite") as store:
+            utxo_set = UtxoSet(store)
+            ...
+    """
+
+    def __init__(self, filename: str = ":memory:") -> None:
+        self.filename = filename
+        self._db = sqlite3.connect(filename)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS utxo "
+            "(key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self) -> "SqliteStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getitem__(self, key: bytes) -> bytes:
+        sql = "SELECT value FROM utxo WHERE key = ?"
+        row = self._db.execute(sql, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._db.execute("INSERT OR REPLACE INTO utxo VALUES (?, ?)", (key, value))
+
+    def __delitem__(self, key: bytes) -> None:
+        cursor = self._db.execute("DELETE FROM utxo WHERE key = ?", (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return (row[0] for row in self._db.execute("SELECT key FROM utxo"))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM utxo").fetchone()[0]
@@ -67,7 +67,7 @@ def merkle_root(data: List[bytes], hf: Callable[[Union[bytes, str]], bytes]) ->
         for i in range(0, len(data), 2):
             parent = hf(data[i] + data[i + 1])
             parent_level.append(parent)
-        data = parent_level[:]
+        data = parent_level
     return data[0]
 
 
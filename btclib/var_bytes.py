@@ -10,8 +10,10 @@
 
 "Varbytes encoding and decoding functions."
 
+from typing import Tuple
+
 from btclib import var_int
-from btclib.alias import BinaryData, Octets
+from btclib.alias import BinaryData, Buffer, Octets
 from btclib.exceptions import BTClibRuntimeError
 from btclib.utils import bytes_from_octets, bytesio_from_binarydata
 
@@ -30,6 +32,27 @@ def parse(stream: BinaryData, forbid_zero_size: bool = False) -> bytes:
     return result
 
 
+def parse_at(data: Buffer, offset: int = 0) -> Tuple[bytes, int]:
+    """Return the variable-length octets at offset and the offset after them.
+
+    The buffer is not wrapped in a stream:
+    only the returned octets are copied.
+    """
+
+    i, start = var_int.parse_at(data, offset)
+    end = start + i
+    if end > len(data):
+        raise BTClibRuntimeError("not enough binary data")
+    return bytes(data[start:end]), end
+
+
+def size(octets: Octets) -> int:
+    "Return the length of the var_int(len(octets)) + octets serialization."
+
+    n = len(bytes_from_octets(octets))
+    return var_int.size(n) + n
+
+
 def serialize(octets: Octets) -> bytes:
     "Return the var_int(len(octets)) + octets serialization of octets."
 
@@ -29,7 +29,9 @@ Up to 0xfc, a var_int is just 1 byte; however, if the integer is greater than
 * prefix 0xff markes the next eight bytes as the number.
 """
 
-from btclib.alias import BinaryData
+from typing import Tuple
+
+from btclib.alias import BinaryData, Buffer
 from btclib.exceptions import BTClibValueError
 from btclib.utils import bytesio_from_binarydata, hex_string
 
@@ -53,6 +55,38 @@ def parse(stream: BinaryData) -> int:
     return int.from_bytes(stream.read(8), byteorder="little", signed=False)
 
 
+def parse_at(data: Buffer, offset: int = 0) -> Tuple[int, int]:
+    """Return the variable-length integer at offset and the offset after it.
+
+    The buffer is not wrapped in a stream: no bytes object is allocated.
+    """
+
+    i = data[offset]
+    if i < 0xFD:
+        # one byte integer
+        return i, offset + 1
+    # 0xfd, 0xfe, and 0xff mark the next two, four, and eight bytes as the number
+    start = offset + 1
+    end = start + (2 if i == 0xFD else 4 if i == 0xFE else 8)
+    return int.from_bytes(data[start:end], byteorder="little", signed=False), end
+
+
+def size(i: int) -> int:
+    "Return the length of the var_int bytes encoding of an integer."
+
+    if i < 0x00:
+        raise BTClibValueError(f"negative integer: {i}")
+    if i < 0xFD:
+        return 1
+    if i <= 0xFFFF:
+        return 3
+    if i <= 0xFFFFFFFF:
+        return 5
+    if i <= 0xFFFFFFFFFFFFFFFF:
+        return 9
+    raise BTClibValueError(f"integer too big for var_int encoding: '{hex_string(i)}'")
+
+
 def serialize(i: int) -> bytes:
     "Return the var_int bytes encoding of an integer."
 
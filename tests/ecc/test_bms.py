@@ -11,6 +11,7 @@
 "Tests for the `btclib.bms` module."
 
 import json
+from io import BytesIO
 from os import path
 
 import pytest
@@ -75,6 +76,23 @@ def test_signature() -> None:
         bms_sig = bms.Sig(bms_sig.rf, dsa_sig)
 
 
+def test_stream() -> None:
+    msg = b"a large message to be signed" * 10_000
+
+    wif, addr = bms.gen_keys()
+    bms_sig = bms.sign(msg, wif)
+    assert bms.sign_stream(BytesIO(msg), wif) == bms_sig
+    assert bms.sign_stream([msg[:100], msg[100:]], wif, msg_len=len(msg)) == bms_sig
+    assert bms.verify_stream(BytesIO(msg), addr, bms_sig)
+    assert bms.verify_stream([msg], addr, bms_sig, msg_len=len(msg))
+    assert bms.verify_(magic_message(msg), addr, bms_sig)
+    assert not bms.verify_stream(BytesIO(msg[1:]), addr, bms_sig)
+
+    err_msg = "message length required for non-seekable stream"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        bms.verify_stream([msg], addr, bms_sig)
+
+
 def test_exceptions() -> None:
 
     msg = "test".encode()
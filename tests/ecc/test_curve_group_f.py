@@ -12,9 +12,16 @@
 
 import pytest
 
+from btclib.ecc.curve import mult
 from btclib.ecc.curve_group import CurveGroup, mult_aff
-from btclib.ecc.curve_group_f import find_all_points, find_subgroup_points
+from btclib.ecc.curve_group_f import (
+    bsgs,
+    find_all_points,
+    find_subgroup_points,
+    pollard_rho,
+)
 from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
 
 
 def test_ecf() -> None:
@@ -54,7 +61,11 @@ def test_ecf() -> None:
     G = (1804, 5368)
     points = find_subgroup_points(ec, G)
     assert len(points) == 9735
-    # QA = (815, 3190)
+    QA = (815, 3190)
+    nA = bsgs(QA, ec, G, 9735)
+    assert mult_aff(nA, G, ec) == QA
+    # the Hasse bound is used if the order of G is not provided
+    assert bsgs(QA, ec, G) == nA
     # nB = 1829
     # S = mult_aff(nB, QA, ec)
     # b = S[0].to_bytes(ec.p_size, byteorder="big", signed=False)
@@ -74,3 +85,51 @@ def test_ecf_exceptions() -> None:
         # p (10007) is too big to count all subgroup points
         G = (2, 3265)
         find_subgroup_points(ec, G)
+
+
+def test_find_all_points() -> None:
+    for ec in low_card_curves.values():
+        points = find_all_points(ec)
+        assert len(set(points)) == len(points)
+        for Q in points:
+            ec.require_on_curve(Q)
+        subgroup = find_subgroup_points(ec, ec.G)
+        assert len(subgroup) == ec.n
+        assert set(subgroup).issubset(points)
+
+
+def test_dlog() -> None:
+    for ec in low_card_curves.values():
+        for q in range(ec.n):
+            Q = mult(q, ec.G, ec)
+            assert bsgs(Q, ec) == q
+            assert bsgs(Q, ec, max_table_size=2) == q
+            assert pollard_rho(Q, ec) == q
+            assert pollard_rho(Q, ec, ec.G, ec.n) == q
+
+    ec = low_card_curves["ec23_31"]
+    err_msg = "invalid max_table_size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        bsgs(ec.G, ec, max_table_size=0)
+
+    ec_group = CurveGroup(9739, 497, 1768)
+    G = (1804, 5368)  # order 9735 = 3 * 5 * 11 * 59
+    err_msg = "no generator provided and no generator for curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        bsgs(G, ec_group)
+    with pytest.raises(BTClibValueError, match=err_msg):
+        pollard_rho(G, ec_group)
+    err_msg = "missing generator order"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        pollard_rho(G, ec_group, G)
+
+    # H generates a subgroup of prime order 59, not including G
+    H = mult_aff(9735 // 59, G, ec_group)
+    Q = mult_aff(42, H, ec_group)
+    assert bsgs(Q, ec_group, H, 59) == 42
+    assert pollard_rho(Q, ec_group, H, 59) == 42
+    err_msg = "discrete logarithm not found"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        bsgs(G, ec_group, H, 59)
+    with pytest.raises(BTClibValueError, match=err_msg):
+        pollard_rho(G, ec_group, H, 59, max_attempts=2)
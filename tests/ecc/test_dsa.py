@@ -11,7 +11,8 @@
 "Tests for the `btclib.dsa` module."
 
 import secrets
-from hashlib import sha1
+from hashlib import sha1, sha512
+from io import BytesIO
 
 import pytest
 from coincurve._libsecp256k1 import (  # type: ignore # pylint: disable=no-name-in-module
@@ -22,7 +23,8 @@ from coincurve._libsecp256k1 import (  # type: ignore # pylint: disable=no-name-
 from btclib.alias import INF
 from btclib.ecc import dsa
 from btclib.ecc.curve import CURVES, Curve, double_mult, mult
-from btclib.ecc.curve_group import _mult
+from btclib.ecc.curve_group import jac_from_aff
+from btclib.ecc.curve_group_f import find_subgroup_points
 from btclib.ecc.number_theory import mod_inv
 from btclib.ecc.sec_point import bytes_from_point, point_from_octets
 from btclib.exceptions import BTClibRuntimeError, BTClibValueError
@@ -136,6 +138,20 @@ def test_signature() -> None:
         dsa.sign_(reduce_to_hlen(msg), q, sig.ec.n)
 
 
+def test_stream() -> None:
+    msg = b"a large message to be signed" * 10_000
+    chunks = [msg[i : i + 4096] for i in range(0, len(msg), 4096)]
+    q, Q = dsa.gen_keys()
+
+    for hf in (sha1, sha512):
+        sig = dsa.sign(msg, q, hf=hf)
+        assert dsa.sign_stream(BytesIO(msg), q, hf=hf) == sig
+        assert dsa.sign_stream(chunks, q, hf=hf) == sig
+        assert dsa.verify_stream(BytesIO(msg), Q, sig, hf=hf)
+        assert dsa.verify_stream(iter(chunks), Q, sig, hf=hf)
+        assert not dsa.verify_stream(chunks[1:], Q, sig, hf=hf)
+
+
 def test_gec() -> None:
     """GEC 2: Test Vectors for SEC 1, section 2
 
@@ -193,11 +209,14 @@ def test_low_cardinality() -> None:
     lower_s = True
     # only low cardinality test curves or it would take forever
     for ec in test_curves:
+        # G, 2G, ..., nG = INF: all the public keys, in order
+        points = find_subgroup_points(ec, ec.G)
         for q in range(1, ec.n):  # all possible private keys
-            QJ = _mult(q, ec.GJ, ec)  # public key
-            for k in range(1, ec.n):  # all possible ephemeral keys
-                RJ = _mult(k, ec.GJ, ec)
-                r = ec.x_aff_from_jac(RJ) % ec.n
+            QJ = jac_from_aff(points[q - 1])  # public key
+            # with 'low-s' encoding, k and n - k give the same signature:
+            # all possible ephemeral keys are covered by half of them
+            for k in range(1, ec.n // 2 + 1):
+                r = points[k - 1][0] % ec.n
                 k_inv = mod_inv(k, ec.n)
                 for e in range(ec.n):  # all possible challenges
                     s = k_inv * (e + q * r) % ec.n
@@ -208,11 +227,14 @@ def test_low_cardinality() -> None:
                         err_msg = "failed to sign: "
                         with pytest.raises(BTClibRuntimeError, match=err_msg):
                             dsa._sign_(e, q, k, lower_s, ec)
+                        with pytest.raises(BTClibRuntimeError, match=err_msg):
+                            dsa._sign_(e, q, ec.n - k, lower_s, ec)
                     else:
                         sig = dsa._sign_(e, q, k, lower_s, ec)
                         assert r == sig.r
                         assert s == sig.s
                         assert ec == sig.ec
+                        assert sig == dsa._sign_(e, q, ec.n - k, lower_s, ec)
                         # valid signature must pass verification
                         dsa._assert_as_valid_(e, QJ, r, s, lower_s, ec)
 
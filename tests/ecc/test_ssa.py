@@ -13,6 +13,7 @@
 import csv
 import secrets
 from hashlib import sha256 as hf
+from io import BytesIO
 from os import path
 from typing import List
 
@@ -95,6 +96,20 @@ def test_signature() -> None:
         ssa.sign_(m_bytes, q, sig.ec.n)
 
 
+def test_stream() -> None:
+    msg = b"a large message to be signed" * 10_000
+    chunks = [msg[i : i + 4096] for i in range(0, len(msg), 4096)]
+    q, x_Q = ssa.gen_keys()
+
+    # random aux data: signatures are not deterministic
+    assert ssa.verify(msg, x_Q, ssa.sign_stream(BytesIO(msg), q))
+    assert ssa.verify(msg, x_Q, ssa.sign_stream(chunks, q))
+    sig = ssa.sign(msg, q)
+    assert ssa.verify_stream(BytesIO(msg), x_Q, sig)
+    assert ssa.verify_stream(iter(chunks), x_Q, sig)
+    assert not ssa.verify_stream(chunks[1:], x_Q, sig)
+
+
 def test_bip340_vectors() -> None:
     """BIP340 (Schnorr) test vectors.
 
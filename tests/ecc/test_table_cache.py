@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.table_cache` module."
+
+import pytest
+
+from btclib.ecc.curve import secp256k1
+from btclib.ecc.curve_group import (
+    CurveGroup,
+    cached_multiples,
+    cached_multiples_fixwind,
+    mult_fixed_window_cached,
+    mult_jac,
+    warm_table_cache,
+)
+from btclib.ecc.table_cache import TABLE_CACHE, TableCache, table_nbytes
+from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
+
+
+def test_table_cache() -> None:
+
+    table = [(1, 2, 1), (3, 4, 1)]
+    nbytes = table_nbytes(table)
+    cache = TableCache(2 * nbytes)
+
+    assert cache.get("a", lambda: table) is table
+    assert cache.get("a", lambda: []) is table
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 1, 0)
+    assert (info.tables, info.nbytes) == (1, nbytes)
+
+    cache.get("b", lambda: list(table))
+    cache.get("a", lambda: [])  # "a" becomes the most recently used
+    cache.get("c", lambda: list(table))
+    assert cache.keys() == ["a", "c"]
+    assert "b" not in cache
+    assert cache.info().evictions == 1
+
+    cache.get("g", lambda: list(table), pinned=True)
+    assert cache.keys() == ["g", "a", "c"]
+    info = cache.info()
+    assert (info.pinned_tables, info.pinned_nbytes) == (1, nbytes)
+    assert info.nbytes == 2 * nbytes
+
+    cache.max_bytes = nbytes
+    assert cache.keys() == ["g", "c"]
+    cache.max_bytes = 0
+    assert cache.keys() == ["g"]
+    assert len(cache) == 1
+
+    # tables larger than the budget are returned but not cached
+    assert cache.get("d", lambda: table) is table
+    assert "d" not in cache
+
+    cache.max_bytes = 2 * nbytes
+    cache.get("a", lambda: table)
+    cache.pin("a")
+    cache.pin("a")
+    assert cache.info().pinned_tables == 2
+    cache.unpin("a")
+    assert cache.info().pinned_tables == 1
+    assert cache.keys() == ["g", "a"]
+
+    err_msg = "table not cached: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        cache.pin("z")
+    err_msg = "table not pinned: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        cache.unpin("z")
+
+    cache.clear()
+    assert cache.keys() == ["g"]
+    assert cache.info().hits == 0
+    cache.clear(pinned=True)
+    assert len(cache) == 0
+
+    err_msg = "negative max_bytes: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        TableCache(-1)
+    with pytest.raises(BTClibValueError, match=err_msg):
+        cache.max_bytes = -1
+
+
+def test_generator_tables_are_pinned() -> None:
+
+    ec = secp256k1
+    warm_table_cache(ec)
+    assert ("multiples", ec.GJ, ec) in TABLE_CACHE
+    assert ("multiples_fixwind", ec.GJ, ec, 4) in TABLE_CACHE
+
+    max_bytes = TABLE_CACHE.max_bytes
+    try:
+        TABLE_CACHE.max_bytes = 0
+        assert ("multiples", ec.GJ, ec) in TABLE_CACHE
+        assert ("multiples_fixwind", ec.GJ, ec, 4) in TABLE_CACHE
+        hits = TABLE_CACHE.info().hits
+        assert cached_multiples(ec.GJ, ec) is cached_multiples(ec.GJ, ec)
+        assert TABLE_CACHE.info().hits == hits + 2
+
+        # other points are not cached anymore
+        QJ = mult_jac(2, ec.GJ, ec)
+        T = cached_multiples_fixwind(QJ, ec)
+        assert T is not cached_multiples_fixwind(QJ, ec)
+        assert ("multiples_fixwind", QJ, ec, 4) not in TABLE_CACHE
+    finally:
+        TABLE_CACHE.max_bytes = max_bytes
+
+    ec_group = CurveGroup(9739, 497, 1768)
+    err_msg = "no point provided and no generator for curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        warm_table_cache(ec_group)
+    warm_table_cache(ec_group, (493, 5564, 1))
+
+
+def test_cached_mult_with_eviction() -> None:
+
+    max_bytes = TABLE_CACHE.max_bytes
+    try:
+        # room for a couple of tables only, to force evictions
+        TABLE_CACHE.max_bytes = 4096
+        for ec in low_card_curves.values():
+            for k in range(1, 4):
+                QJ = mult_jac(k, ec.GJ, ec)
+                for m in range(ec.n):
+                    R = mult_fixed_window_cached(m, QJ, ec)
+                    assert ec.jac_equality(R, mult_jac(m, QJ, ec))
+        assert TABLE_CACHE.info().nbytes <= 4096
+    finally:
+        TABLE_CACHE.max_bytes = max_bytes
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.table_file` module."
+
+from os import path
+
+import pytest
+
+from btclib.ecc import table_file
+from btclib.ecc.curve import CURVES, secp256k1
+from btclib.ecc.curve_group import (
+    CurveGroup,
+    _generator_multiples_fixwind,
+    _mult,
+    _multiples_fixwind,
+    mult_jac,
+    save_generator_table,
+)
+from btclib.ecc.table_cache import TABLE_CACHE
+from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
+
+
+def test_serialization() -> None:
+
+    ec = secp256k1
+    T = _multiples_fixwind(ec.GJ, ec, 4)
+    data = table_file.serialize(T, ec, 4)
+    T2 = table_file.parse(data, ec, 4)
+    assert len(T) == len(T2)
+    for row, row2 in zip(T, T2):
+        for QJ, QJ2 in zip(row, row2):
+            assert ec.jac_equality(QJ, QJ2)
+    assert table_file.serialize(T2, ec, 4) == data
+
+    for ec in low_card_curves.values():
+        for w in range(1, 5):
+            T = _multiples_fixwind(ec.GJ, ec, w)
+            T2 = table_file.parse(table_file.serialize(T, ec, w), ec, w)
+            for row, row2 in zip(T, T2):
+                for QJ, QJ2 in zip(row, row2):
+                    assert ec.jac_equality(QJ, QJ2)
+
+    err_msg = "invalid table for w=5"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.serialize(T, ec, 5)
+
+
+def test_invalid_data() -> None:
+
+    ec = secp256k1
+    data = table_file.serialize(_multiples_fixwind(ec.GJ, ec, 4), ec, 4)
+
+    err_msg = "invalid table size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(data[:50], ec, 4)
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(data[:-1], ec, 4)
+
+    err_msg = "invalid table magic: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(b"\x00" + data[1:], ec, 4)
+
+    err_msg = "invalid table window: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(data, ec, 5)
+
+    err_msg = "table for a different curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(data, CURVES["secp256r1"], 4)
+
+    err_msg = "invalid table checksum"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(data[:-1] + b"\x00", ec, 4)
+
+    # same curve fingerprint, inconsistent shape
+    rows_offset = 8 + 1 + 2
+    invalid_data = data[:rows_offset] + b"\x00\x00" + data[rows_offset + 2 :]
+    err_msg = "invalid table shape"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.parse(invalid_data, ec, 4)
+
+
+def test_file(tmp_path) -> None:  # type: ignore
+
+    ec = CURVES["secp112r1"]
+    filename = save_generator_table(ec, str(tmp_path / "table.bin"), 4)
+    T = table_file.load(filename, ec, 4)
+    assert ec.jac_equality(T[1][1], mult_jac(16, ec.GJ, ec))
+
+    empty_file = str(tmp_path / "empty.bin")
+    with open(empty_file, "wb"):
+        pass
+    err_msg = "invalid table size: 0"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.load(empty_file, ec, 4)
+
+    err_msg = "no generator for curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        save_generator_table(CurveGroup(9739, 497, 1768))
+
+
+def test_generator_table_lookup(tmp_path) -> None:  # type: ignore
+
+    # the secp256k1 table is shipped as package data
+    filename = table_file.generator_table_filename(secp256k1, 4)
+    assert filename is not None
+    assert path.dirname(filename) == table_file.TABLE_DIRS[0]
+    T = table_file.load(filename, secp256k1, 4)
+    T2 = _multiples_fixwind(secp256k1.GJ, secp256k1, 4)
+    for row, row2 in zip(T, T2):
+        for QJ, QJ2 in zip(row, row2):
+            assert secp256k1.jac_equality(QJ, QJ2)
+
+    ec = list(low_card_curves.values())[0]
+    assert table_file.generator_table_filename(ec, 4) is None
+    err_msg = "unnamed curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        table_file.generator_table_basename(ec, 4)
+
+    ec = CURVES["secp160r1"]
+    assert table_file.generator_table_filename(ec, 4) is None
+    table_file.TABLE_DIRS.insert(0, str(tmp_path))
+    try:
+        filename = save_generator_table(ec)
+        assert table_file.generator_table_filename(ec, 4) == filename
+        TABLE_CACHE.clear(pinned=True)
+        misses = TABLE_CACHE.info().misses
+        QJ = _mult(3, ec.GJ, ec)
+        assert ec.jac_equality(QJ, mult_jac(3, ec.GJ, ec))
+        assert TABLE_CACHE.info().misses == misses + 1
+        assert ("multiples_fixwind", ec.GJ, ec, 4) in TABLE_CACHE
+        # scalar too large for the table
+        QJ = _mult(ec.n * 2 ** 64 + 3, ec.GJ, ec)
+        assert ec.jac_equality(QJ, mult_jac(3, ec.GJ, ec))
+    finally:
+        table_file.TABLE_DIRS.pop(0)
+
+
+def test_invalid_generator_table_file(tmp_path) -> None:  # type: ignore
+
+    ec = CURVES["secp160r1"]
+    table_file.TABLE_DIRS.insert(0, str(tmp_path))
+    try:
+        filename = save_generator_table(ec)
+        with open(filename, "rb") as file_:
+            data = file_.read()
+        with open(filename, "wb") as file_:
+            file_.write(data[:-1])
+        with pytest.raises(BTClibValueError, match="invalid table size: "):
+            table_file.load(filename, ec, 4)
+
+        # the truncated table file is ignored
+        T = _generator_multiples_fixwind(ec, 4)
+        T2 = _multiples_fixwind(ec.GJ, ec, 4)
+        for row, row2 in zip(T, T2):
+            for QJ, QJ2 in zip(row, row2):
+                assert ec.jac_equality(QJ, QJ2)
+    finally:
+        table_file.TABLE_DIRS.pop(0)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.script.address_codec` module."
+
+import pytest
+
+from btclib import b32, b58
+from btclib.exceptions import BTClibValueError
+from btclib.network import NETWORKS
+from btclib.script import address_codec
+from btclib.script.address_codec import AddressCodec
+from btclib.script.script_pub_key import ScriptPubKey, address
+
+
+def _addresses() -> list:
+    h160 = bytes(range(20))
+    h256 = bytes(range(32))
+    addresses = []
+    for network in NETWORKS:
+        addresses.append(b58.address_from_h160("p2pkh", h160, network))
+        addresses.append(b58.address_from_h160("p2sh", h160, network))
+        addresses.append(b32.address_from_witness(0, h160, network))
+        addresses.append(b32.address_from_witness(0, h256, network))
+        addresses.append(b32.address_from_witness(1, h256, network))
+    return addresses
+
+
+def test_decode() -> None:
+    addresses = _addresses()
+    # case, whitespaces, and bytes
+    addresses.append(addresses[2].upper())
+    addresses.append(" " + addresses[0] + "\n")
+    addresses.append(addresses[3].encode("ascii"))
+    for addr in addresses:
+        script_pub_key = ScriptPubKey.from_address(addr)
+        expected = (script_pub_key.script, script_pub_key.network)
+        assert address_codec.decode(addr) == expected
+    expected_many = [address_codec.decode(addr) for addr in addresses]
+    assert address_codec.decode_many(addresses) == expected_many
+
+    addr = b58.address_from_h160("p2pkh", bytes(range(20)))
+    invalid = addr[:-1] + ("1" if addr[-1] != "1" else "2")
+    err_msg = "invalid base58 address prefix: 0x"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        address_codec.decode(b58.b58encode(b"\xff" + bytes(20)))
+
+    # invalid addresses do not abort the batch
+    invalids = [invalid, "bc1", "", "\u00e7"]
+    results = address_codec.decode_many([addr, *invalids, addr])
+    assert results[0] == results[-1] == address_codec.decode(addr)
+    for invalid, result in zip(invalids, results[1:-1]):
+        assert isinstance(result, ValueError)
+        with pytest.raises(type(result)) as excinfo:
+            ScriptPubKey.from_address(invalid)
+        assert str(excinfo.value) == str(result)
+
+
+def test_encode() -> None:
+    scripts = [ScriptPubKey.from_address(addr).script for addr in _addresses()]
+    # not addressable script_pub_keys
+    scripts += [b"", b"\x6a", b"\x21" + b"\x02" * 33 + b"\xac"]
+    for network in NETWORKS:
+        expected = [address(script, network) for script in scripts]
+        assert address_codec.encode_many(scripts, network) == expected
+        assert [address_codec.encode(s, network) for s in scripts] == expected
+
+    err_msg = "unknown network: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        address_codec.encode(scripts[0], "no_network")
+    with pytest.raises(BTClibValueError, match=err_msg):
+        address_codec.encode_many(scripts, "no_network")
+
+
+def test_address_codec() -> None:
+    addresses = _addresses()
+    codec = AddressCodec(maxsize=4)
+    assert codec.decode_many(addresses) == address_codec.decode_many(addresses)
+    assert codec.decode(addresses[-1]) == address_codec.decode(addresses[-1])
+    info = codec.cache_info()["decode"]
+    assert info["hits"] == 1
+    assert info["misses"] == len(addresses)
+    assert info["currsize"] == info["maxsize"] == 4
+
+    scripts = [codec.decode(addr)[0] for addr in addresses]
+    for network in NETWORKS:
+        expected = address_codec.encode_many(scripts, network)
+        assert codec.encode_many(scripts, network) == expected
+        assert codec.encode(scripts[0], network) == expected[0]
+    info = codec.cache_info()["encode"]
+    assert info["hits"] + info["misses"] == (len(scripts) + 1) * len(NETWORKS)
+
+    # invalid addresses are not cached
+    assert isinstance(codec.decode_many(["bc1"])[0], ValueError)
+    assert codec.cache_info()["decode"]["currsize"] == 4
+
+    codec.cache_clear()
+    assert codec.cache_info()["decode"]["hits"] == 0
+    assert codec.cache_info()["encode"]["currsize"] == 0
+
+    # no caching
+    codec = AddressCodec(maxsize=0)
+    codec.decode_many(addresses + addresses)
+    assert codec.cache_info()["decode"]["misses"] == 2 * len(addresses)
@@ -15,7 +15,7 @@ from typing import List
 import pytest
 
 from btclib.exceptions import BTClibValueError
-from btclib.script.script import Command, Script, parse, serialize
+from btclib.script.script import Command, Script, parse, serialize, tokenize
 
 
 def test_add_and_eq() -> None:
@@ -68,6 +68,49 @@ def test_exceptions() -> None:
         serialize(script_pub_key_)
 
 
+def test_tokenize() -> None:
+    script_bytes = serialize(["OP_0", "OP_1", "01" * 20, "02" * 80, "03" * 300, 5])
+    tokens = [
+        (op, data if data is None else bytes(data), i)
+        for op, data, i in tokenize(script_bytes)
+    ]
+    assert tokens == [
+        (0x00, None, 0),
+        (0x51, None, 1),
+        (0x14, b"\x01" * 20, 2),
+        (0x4C, b"\x02" * 80, 23),
+        (0x4D, b"\x03" * 300, 105),
+        (0x01, b"\x05", 408),
+    ]
+    assert list(tokenize(script_bytes.hex())) == list(tokenize(script_bytes))
+
+    # data is a view over the script, not a copy
+    data = next(tokenize(bytearray(b"\x01\x02")))[1]
+    assert isinstance(data, memoryview)
+
+    # truncated pushes yield the available data, as parse does
+    truncated = {"060102": "0102", "4c": "", "4d02": "", "4e0300": ""}
+    for script_hex, data_hex in truncated.items():
+        ((_, data, _),) = tokenize(script_hex)
+        assert data is not None and data.hex() == data_hex
+        assert parse(script_hex) == [data_hex.upper()]
+
+
+def test_assert_valid() -> None:
+    Script(serialize(["OP_1", "00" * 520, "OP_DROP"]))
+
+    err_msg = "invalid opcode: 255"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        Script(b"\x51\xff")
+
+    err_msg = "too many bytes for OP_PUSHDATA: 521"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        Script("4e09020000" + "00" * 521 + "75")
+
+    script = Script("4e09020000" + "00" * 521 + "75", check_validity=False)
+    assert script.asm == ["00" * 521, "OP_DROP"]
+
+
 def test_nulldata() -> None:
 
     scripts: List[List[Command]] = [["OP_RETURN", "11" * 79], ["OP_RETURN", "00" * 79]]
@@ -17,9 +17,11 @@ from typing import List
 import pytest
 
 from btclib import b32, b58, var_bytes
+from btclib.alias import Octets
 from btclib.exceptions import BTClibValueError
 from btclib.script.script import Command, Script, parse, serialize
 from btclib.script.script_pub_key import (
+    SCRIPT_TYPES,
     ScriptPubKey,
     address,
     assert_p2ms,
@@ -31,6 +33,7 @@ from btclib.script.script_pub_key import (
     is_nulldata,
     is_p2ms,
     type_and_payload,
+    type_and_payload_many,
 )
 from btclib.to_pub_key import Key
 from btclib.utils import hash160, sha256
@@ -567,3 +570,32 @@ def test_non_standard_script_in_p2wsh() -> None:
     addr = "bc1q0df3qvuuvqqlw4s5m2jsswpelf2dgct97mzkqfwv2nfe02z62uyq7n4zjj"
     assert addr == address(script_pub_key, network)
     assert addr == b32.address_from_witness(0, payload, network)
+
+
+def test_type_and_payload_many() -> None:
+    pub_key = "02 cc71eb30d653c0c3163990c47b976f3fb3f37cccdcbedb169a1dfef58bbfbfaf"
+    script_pub_keys: List[Octets] = [
+        ScriptPubKey.p2pk(pub_key).script,
+        ScriptPubKey.p2pkh(pub_key).script,
+        ScriptPubKey.p2wpkh(pub_key).script,
+        ScriptPubKey.p2ms(1, [pub_key]).script.hex(),
+        ScriptPubKey.nulldata(b"\x00" * 80).script,
+        # invalid pub_key in p2pk template
+        b"\x21\x02" + b"\x00" * 32 + b"\xac",
+        b"",
+    ]
+    types, payloads = type_and_payload_many(script_pub_keys)
+    assert len(types) == len(payloads) == len(script_pub_keys)
+    assert [SCRIPT_TYPES[i] for i in types] == [
+        "p2pk",
+        "p2pkh",
+        "p2wpkh",
+        "p2ms",
+        "nulldata",
+        "unknown",
+        "unknown",
+    ]
+    for i, script_pub_key in enumerate(script_pub_keys):
+        assert (SCRIPT_TYPES[types[i]], payloads[i]) == type_and_payload(script_pub_key)
+
+    assert type_and_payload_many([]) == (b"", [])
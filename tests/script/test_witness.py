@@ -11,8 +11,11 @@
 "Tests for the `btclib.script.witness` module."
 
 import json
+from copy import deepcopy
 from os import path
 
+import pytest
+
 from btclib.script.witness import Witness
 
 
@@ -76,3 +79,18 @@ def test_dataclasses_json_dict() -> None:
     assert len(witness2.stack) > 0
 
     assert witness == witness2
+
+
+def test_empty_witness() -> None:
+    witness = Witness()
+    witness.stack.append(b"\x01")
+    assert witness == Witness([b"\x01"])
+    assert witness.size == 3
+    # not shared
+    assert not Witness().stack
+    assert deepcopy(witness) == witness
+    assert deepcopy(witness).stack is not witness.stack
+
+    # slots, no __dict__
+    with pytest.raises(AttributeError):
+        Witness().foo = 1  # type: ignore # pylint: disable=assigning-non-slot
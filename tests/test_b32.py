@@ -144,6 +144,49 @@ def test_invalid_address() -> None:
             b32.witness_from_address(address)
 
 
+def test_witness_from_address_many() -> None:
+    addresses = [
+        "BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4",
+        "tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7",
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5",
+        "bc1zw508d6qejxtdg4y5r3zarvaryvqyzf3du",
+        "bc1gmk9yu",
+        " bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4 ",
+    ]
+    results = b32.witness_from_address_many(addresses)
+    assert len(results) == len(addresses)
+    for address, result in zip(addresses, results):
+        if isinstance(result, ValueError):
+            with pytest.raises(BTClibValueError, match=str(result)):
+                b32.witness_from_address(address)
+        else:
+            assert result == b32.witness_from_address(address)
+    assert results[0] == results[-1]
+    errors = [isinstance(r, ValueError) for r in results]
+    assert errors == [False, False, True, True, True, False]
+
+
+def test_conversions() -> None:
+    # the fast converters are checked against power_of_2_base_conversion
+    # also for sizes and paddings not reachable from valid addresses
+    # pylint: disable=protected-access
+    for size in range(42):
+        data = bytes(range(255 - size, 255))
+        values = b32._convert_8_to_5(data)
+        assert values == b32.power_of_2_base_conversion(data, 8, 5)
+        assert b32._convert_5_to_8(values) == data
+
+    for size in range(17):
+        for values in ([0] * size, [31] * size, [1] * size):
+            try:
+                expected = bytes(b32.power_of_2_base_conversion(values, 5, 8, False))
+            except BTClibValueError as e:
+                with pytest.raises(BTClibValueError, match=str(e)):
+                    b32._convert_5_to_8(values)
+            else:
+                assert b32._convert_5_to_8(values) == expected
+
+
 def test_invalid_address_enc() -> None:
     "Test whether address encoding fails on invalid input."
 
@@ -18,7 +18,9 @@ from btclib.base58 import (
     _b58encode,
     _b58encode_from_int,
     b58decode,
+    b58decode_many,
     b58encode,
+    b58encode_many,
 )
 from btclib.exceptions import BTClibValueError
 
@@ -107,3 +109,29 @@ def test_integers() -> None:
     n = int(number, 16)
     assert _b58decode_to_int(digits) == n
     assert _b58encode_from_int(n) == digits[1:]
+
+
+def test_chunks() -> None:
+    # around the 58^10 chunk boundaries
+    for e in (9, 10, 11, 19, 20, 21, 100):
+        for n in (58 ** e - 1, 58 ** e, 58 ** e + 1):
+            digits = _b58encode_from_int(n)
+            assert len(digits) == e + (n >= 58 ** e)
+            assert _b58decode_to_int(digits) == n
+    assert _b58encode_from_int(58 ** 20) == b"2" + b"1" * 20
+
+
+def test_many() -> None:
+    values = [b"", b"\x00", b"hello world", bytes(range(256))]
+    encoded = b58encode_many(values)
+    assert encoded == [b58encode(v) for v in values]
+    assert b58decode_many(encoded) == values
+    assert b58decode_many([v.decode("ascii") for v in encoded]) == values
+
+    err_msg = "valid checksum, invalid decoded size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        b58decode_many(encoded, 11)
+    assert b58decode_many(encoded[2:3], 11) == values[2:3]
+    err_msg = "invalid size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        b58encode_many(values, 11)
@@ -41,7 +41,7 @@ with the following modifications:
 
 import pytest
 
-from btclib.bech32 import b32decode
+from btclib.bech32 import _GENERATOR, _GENERATOR_TABLE, _polymod, b32decode
 from btclib.exceptions import BTClibValueError
 
 VALID_CHECKSUM = [
@@ -106,3 +106,14 @@ def test_insertion_issue() -> None:
     for string in strings:
         for i in range(20):
             b32decode(string[:-1] + i * "q" + string[-1:])
+
+
+def test_polymod() -> None:
+    for top in range(32):
+        chk = 0
+        for i in range(5):
+            chk ^= _GENERATOR[i] if ((top >> i) & 1) else 0
+        assert _GENERATOR_TABLE[top] == chk
+    # the checksum state can be carried over
+    values = list(range(32)) * 3
+    assert _polymod(values) == _polymod(values[40:], _polymod(values[:40]))
@@ -10,8 +10,21 @@
 
 "Tests for the `btclib.hashes` module."
 
+import hashlib
+from io import BytesIO
+
+import pytest
+
+from btclib import hashes
 from btclib.bip32.bip32 import BIP32KeyData, derive, rootxprv_from_seed
-from btclib.hashes import fingerprint
+from btclib.exceptions import BTClibValueError
+from btclib.hashes import (
+    fingerprint,
+    magic_message,
+    magic_message_stream,
+    reduce_to_hlen,
+    reduce_to_hlen_stream,
+)
 
 
 def test_fingerprint() -> None:
@@ -22,3 +35,42 @@ def test_fingerprint() -> None:
     child_key = derive(xprv, 0x80000000)
     pf2 = BIP32KeyData.b58decode(child_key).parent_fingerprint
     assert pf == pf2
+
+
+def test_reduce_to_hlen_stream() -> None:
+
+    msg = b"a large message " * 100_000
+    chunks = [msg[i : i + 1000] for i in range(0, len(msg), 1000)]
+    for hf in (hashlib.sha256, hashlib.sha512, hashlib.sha1):
+        msg_hash = reduce_to_hlen(msg, hf)
+        assert reduce_to_hlen_stream(BytesIO(msg), hf) == msg_hash
+        assert reduce_to_hlen_stream(chunks, hf) == msg_hash
+        assert reduce_to_hlen_stream(iter(chunks), hf) == msg_hash
+    assert reduce_to_hlen_stream([]) == reduce_to_hlen(b"")
+
+
+def test_magic_message_stream() -> None:
+
+    for size in (0, 1, 0xFC, 0xFD, 0xFFFF, 0x10000, 3 * hashes.CHUNK_SIZE):
+        msg = b"\x5a" * size
+        magic_msg = magic_message(msg)
+        assert magic_message_stream(BytesIO(msg)) == magic_msg
+        assert magic_message_stream([msg[:3], msg[3:]], size) == magic_msg
+
+    # the var_int encoding of the message length is used
+    msg = b"\x5a" * 0xFD
+    t = hashes.MAGIC_PREFIX + b"\xfd\xfd\x00" + msg
+    assert magic_message(msg) == hashlib.sha256(t).digest()
+
+    # only the bytes from the current position onwards
+    stream = BytesIO(b"skip" + msg)
+    stream.read(4)
+    assert magic_message_stream(stream) == magic_message(msg)
+
+    err_msg = "message length required for non-seekable stream"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        magic_message_stream([msg])
+
+    err_msg = "message length mismatch: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        magic_message_stream([msg], len(msg) + 1)
@@ -76,3 +76,16 @@ def test_var_int_conversion() -> None:
     assert var_int.parse("6a") == 106
     assert var_int.parse("fd2602") == 550
     assert var_int.parse("fe703a0f00") == 998000
+
+
+def test_size() -> None:
+
+    for int_ in (0, 0xFC, 0xFD, 0xFFFF, 0x10000, 0xFFFFFFFF, 0x100000000):
+        assert var_int.size(int_) == len(var_int.serialize(int_))
+    assert var_int.size(0xFFFFFFFFFFFFFFFF) == 9
+
+    with pytest.raises(BTClibValueError, match="negative integer: "):
+        var_int.size(-1)
+    err_msg = "integer too big for var_int encoding: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        var_int.size(0xFFFFFFFFFFFFFFFF + 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.blk_file` module."
+
+from os import path
+from typing import List
+
+import pytest
+
+from btclib.exceptions import BTClibValueError
+from btclib.tx import blk_file
+from btclib.tx.blk_file import BlkFile
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.blocks import Block
+
+MAGIC = bytes.fromhex("f9beb4d9")
+XOR_KEY = bytes.fromhex("0123456789abcdef")
+
+
+def _raw_blocks(fnames: List[str]) -> List[bytes]:
+    raw_blocks = []
+    for fname in fnames:
+        filename = path.join(path.dirname(__file__), "_data", fname)
+        with open(filename, "rb") as file_:
+            raw_blocks.append(file_.read())
+    return raw_blocks
+
+
+def _write_blk_file(
+    filename: str, raw_blocks: List[bytes], xor_key: bytes = b""
+) -> None:
+    data = b""
+    for raw_block in raw_blocks:
+        data += MAGIC + len(raw_block).to_bytes(4, "little") + raw_block
+    with open(filename, "wb") as file_:
+        file_.write(blk_file.xor(data, xor_key))
+        # preallocated space, never obfuscated
+        file_.write(b"\x00" * 100)
+
+
+def _header_hash(raw_block: bytes) -> bytes:
+    return BlockHeader.parse(raw_block[:80]).hash
+
+
+def test_blk_file(tmp_path) -> None:  # type: ignore
+
+    raw_blocks = _raw_blocks(["block_1.bin", "block_170.bin", "block_200000.bin"])
+    blocks = [Block.parse(raw_block) for raw_block in raw_blocks]
+
+    for xor_key in (b"", XOR_KEY):
+        filename = str(tmp_path / "blk00000.dat")
+        _write_blk_file(filename, raw_blocks, xor_key)
+        with BlkFile(filename, xor_key=xor_key) as blk:
+            spans = blk.spans()
+            assert [size for _, size in spans] == [len(b) for b in raw_blocks]
+            assert spans[0][0] == 8
+            assert [raw for _, raw in blk.raw_blocks()] == raw_blocks
+            assert list(blk.headers()) == [block.header for block in blocks]
+            assert list(blk.blocks()) == blocks
+
+    # obfuscated data read without key
+    with BlkFile(filename) as blk:
+        with pytest.raises(BTClibValueError, match="invalid magic bytes at offset 0"):
+            blk.spans()
+
+    with open(filename, "rb") as file_:
+        data = blk_file.xor(file_.read(), XOR_KEY)
+    with open(filename, "wb") as file_:
+        file_.write(data[: spans[-1][0] + 10])
+    with BlkFile(filename) as blk:
+        with pytest.raises(BTClibValueError, match="truncated block at offset "):
+            blk.spans()
+
+    (tmp_path / "empty.dat").touch()
+    filename = str(tmp_path / "empty.dat")
+    with BlkFile(filename) as blk:
+        assert not blk.spans()
+
+    with pytest.raises(BTClibValueError, match="invalid xor key size: "):
+        BlkFile(filename, xor_key=b"\x01")
+
+
+def test_blocks_dir(tmp_path) -> None:  # type: ignore
+
+    raw_blocks = _raw_blocks(["block_1.bin", "block_170.bin", "block_200000.bin"])
+    assert blk_file.read_xor_key(str(tmp_path)) == b""
+    with open(tmp_path / "xor.dat", "wb") as file_:
+        file_.write(XOR_KEY)
+    xor_key = blk_file.read_xor_key(str(tmp_path))
+    assert xor_key == XOR_KEY
+
+    # written in reverse order to check sorting
+    for i in (10, 2, 1, 0):
+        filename = str(tmp_path / f"blk{i:05}.dat")
+        _write_blk_file(filename, raw_blocks[: i % 3 + 1], xor_key)
+    (tmp_path / "rev00000.dat").touch()
+
+    filenames = blk_file.blk_filenames(str(tmp_path))
+    assert [path.basename(f) for f in filenames] == [
+        "blk00000.dat",
+        "blk00001.dat",
+        "blk00002.dat",
+        "blk00010.dat",
+    ]
+
+    expected = []
+    for filename in filenames:
+        with BlkFile(filename, xor_key=xor_key) as blk:
+            for offset, raw_block in blk.raw_blocks():
+                expected.append((filename, offset, _header_hash(raw_block)))
+    results = blk_file.map_blk_files(_header_hash, filenames, xor_key=xor_key)
+    assert list(results) == expected
+    results = blk_file.map_blk_files(
+        _header_hash, filenames, xor_key=xor_key, max_workers=1
+    )
+    assert list(results) == expected
@@ -12,13 +12,16 @@
 
 import json
 from datetime import datetime, timezone
+from io import BytesIO
 from os import path
 
 import pytest
 
-from btclib.exceptions import BTClibValueError
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
 from btclib.network import NETWORKS
-from btclib.tx.blocks import Block, BlockHeader
+from btclib.tx import tx as tx_module
+from btclib.tx.blocks import Block, BlockHeader, LazyBlock
+from btclib.utils import hash256
 
 datadir = path.join(path.dirname(__file__), "_generated_files")
 
@@ -246,7 +249,70 @@ def test_block_481824() -> None:
             assert block.vsize == 988_436
 
 
-def test_dataclasses_json_dict() -> None:
+def test_size() -> None:
+    "Test arithmetic sizes against actual serialization lengths."
+
+    for fname in ["block_170.bin", "block_481824_complete.bin"]:
+        filename = path.join(path.dirname(__file__), "_data", fname)
+        with open(filename, "rb") as file_:
+            block_bytes = file_.read()
+
+        block = Block.parse(block_bytes)
+        assert block.size == len(block_bytes)
+        assert block.header.size == len(block.header.serialize()) == 80
+        for tx in block.transactions:
+            assert tx.size == len(tx.serialize(include_witness=True))
+            no_witness_size = len(tx.serialize(include_witness=False))
+            assert tx.weight == no_witness_size * 3 + tx.size
+            for tx_in in tx.vin:
+                assert tx_in.size == len(tx_in.serialize())
+                assert tx_in.prev_out.size == len(tx_in.prev_out.serialize())
+                witness = tx_in.script_witness
+                assert witness.size == len(witness.serialize())
+            for tx_out in tx.vout:
+                assert tx_out.size == len(tx_out.serialize())
+
+
+def test_lazy_block() -> None:
+
+    fname = "block_481824_complete.bin"
+    filename = path.join(path.dirname(__file__), "_data", fname)
+    with open(filename, "rb") as file_:
+        block_bytes = file_.read()
+    block = Block.parse(block_bytes)
+
+    lazy_block = LazyBlock(block_bytes)
+    assert lazy_block.header == block.header
+    assert lazy_block.n_transactions == len(block.transactions)
+    # buffers can be iterated more than once
+    for _ in range(2):
+        for tx, tx_view in zip(block.transactions, lazy_block.tx_views()):
+            assert tx_view.id == tx.id
+    assert list(lazy_block.transactions()) == block.transactions
+
+    with open(filename, "rb") as file_:
+        lazy_block = LazyBlock(file_)
+        assert lazy_block.header == block.header
+        # only the coinbase and the outputs are needed
+        txs = lazy_block.transactions(check_validity=False, include_witness=False)
+        coinbase = next(txs)
+        assert coinbase.vout == block.transactions[0].vout
+        assert not coinbase.is_segwit()
+        assert coinbase.id == block.transactions[0].id
+        for tx, tx2 in zip(block.transactions[1:], txs):
+            assert tx2.vout == tx.vout
+        assert file_.read() == b""
+        err_msg = "transactions already read from stream"
+        with pytest.raises(BTClibValueError, match=err_msg):
+            next(lazy_block.tx_views())
+
+    lazy_block = LazyBlock(BytesIO(block_bytes[:-1]))
+    err_msg = "not enough binary data"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        list(lazy_block.tx_views())
+
+
+def test_dataclasses_json_dict(tmp_path) -> None:  # type: ignore
 
     fname = "block_481824.bin"
     filename = path.join(path.dirname(__file__), "_data", fname)
@@ -260,7 +326,8 @@ def test_dataclasses_json_dict() -> None:
     # dict
     block_dict = block_data.to_dict()
     assert isinstance(block_dict, dict)
-    filename = path.join(datadir, "block_481824.json")
+    # too large to be kept with the other generated files
+    filename = str(tmp_path / "block_481824.json")
     with open(filename, "w") as file_:
         json.dump(block_dict, file_, indent=4)
     assert block_data == Block.from_dict(block_dict)
@@ -278,3 +345,62 @@ def test_dataclasses_json_dict() -> None:
     with open(filename, "w") as file_:
         json.dump(block_header_d, file_, indent=4)
     assert block_header_data == BlockHeader.from_dict(block_header_d)
+
+
+def test_witness_commitment(monkeypatch) -> None:  # type: ignore
+
+    blocks = []
+    for fname in ["block_481824.bin", "block_481824_complete.bin"]:
+        filename = path.join(path.dirname(__file__), "_data", fname)
+        with open(filename, "rb") as file_:
+            blocks.append(Block.parse(file_.read(), check_validity=False))
+    legacy_block, block = blocks[0], blocks[1]
+
+    commitment = "6c3c4dff76b5760d58694147264d208689ee07823e5694c4872f856eacf5a5d8"
+    assert block.witness_commitment() == bytes.fromhex(commitment)
+    # legacy nodes see the commitment, not the witness data
+    assert legacy_block.witness_commitment() == block.witness_commitment()
+    legacy_block.assert_valid_witness_commitment()
+
+    # each transaction is hashed exactly once per id type
+    counter = {"n": 0}
+
+    def counting_hash256(octets):  # type: ignore
+        counter["n"] += 1
+        return hash256(octets)
+
+    monkeypatch.setattr(tx_module, "hash256", counting_hash256)
+    block.assert_valid()
+    n_segwit = sum(tx.is_segwit() for tx in block.transactions[1:])
+    assert counter["n"] == len(block.transactions) + n_segwit
+    block.assert_valid()
+    assert counter["n"] == len(block.transactions) + n_segwit
+    monkeypatch.undo()
+
+    segwit_tx = [tx for tx in block.transactions[1:] if tx.is_segwit()][-1]
+    tx_in = segwit_tx.vin[0]
+    stack = tx_in.script_witness.stack
+    tx_in.script_witness.stack = stack[:-1]
+    err_msg = "invalid witness commitment: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        block.assert_valid_witness_commitment()
+    tx_in.script_witness.stack = stack
+    block.assert_valid_witness_commitment()
+
+    coinbase = block.transactions[0]
+    reserved_value = coinbase.vin[0].script_witness.stack
+    coinbase.vin[0].script_witness.stack = []
+    err_msg = "invalid witness reserved value"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        block.assert_valid_witness_commitment()
+    coinbase.vin[0].script_witness.stack = reserved_value
+
+    coinbase.vout = [
+        tx_out
+        for tx_out in coinbase.vout
+        if not tx_out.script_pub_key.script.startswith(bytes.fromhex("6a24aa21a9ed"))
+    ]
+    assert block.witness_commitment() is None
+    err_msg = "missing witness commitment"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        block.assert_valid_witness_commitment()
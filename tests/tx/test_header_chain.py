@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.header_chain` module."
+
+from os import path
+from typing import List
+
+import pytest
+
+from btclib.exceptions import BTClibValueError
+from btclib.tx import header_chain
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.blocks import Block
+from btclib.tx.header_chain import HeaderChain
+from btclib.utils import hash256
+
+# regtest minimum difficulty
+EASY_BITS = bytes.fromhex("207fffff")
+HARD_BITS = bytes.fromhex("1f7fffff")
+
+
+def _mine(prev_hash: bytes, salt: int, bits: bytes = EASY_BITS, time: int = 0) -> bytes:
+    "Return a raw header satisfying its target."
+    target = int.from_bytes(bits[1:], "big") << (8 * (bits[0] - 3))
+    time = time or 1231006505 + salt
+    for nonce in range(1, 0xFFFFFFFF):
+        raw_header = b"\x00\x00\x00\x20" + prev_hash[::-1]
+        raw_header += salt.to_bytes(32, "little")
+        raw_header += time.to_bytes(4, "little")
+        raw_header += bits[::-1] + nonce.to_bytes(4, "little")
+        if int.from_bytes(hash256(raw_header), "little") <= target:
+            return raw_header
+    raise ValueError  # pragma: no cover
+
+
+def _branch(
+    prev_hash: bytes, n: int, salt: int, bits: bytes = EASY_BITS
+) -> List[bytes]:
+    raw_headers = []
+    for i in range(n):
+        raw_header = _mine(prev_hash, salt + i, bits)
+        raw_headers.append(raw_header)
+        prev_hash = hash256(raw_header)[::-1]
+    return raw_headers
+
+
+def test_mainnet_headers() -> None:
+    headers = []
+    for fname in ["block_1.bin", "block_170.bin"]:
+        filename = path.join(path.dirname(__file__), "_data", fname)
+        with open(filename, "rb") as file_:
+            headers.append(Block.parse(file_.read()).header)
+
+    chain = HeaderChain()
+    assert len(chain) == 0
+    assert chain.height == -1
+    assert chain.add(headers[0])
+    assert chain.tip == headers[0].hash
+    assert chain[0] == headers[0]
+    assert chain.raw(0) == headers[0].serialize()
+    assert chain.height_of(headers[0].hash) == 0
+    assert chain.chain_work() == 2 ** 256 // ((0xFFFF << 8 * 26) + 1)
+
+    err_msg = "unknown previous block: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.add(headers[1])
+
+    header = BlockHeader.parse(headers[1].serialize())
+    header.nonce += 1
+    err_msg = "invalid proof-of-work: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.add(header)
+
+
+def test_header_chain(tmp_path, monkeypatch) -> None:  # type: ignore
+
+    # exercise cumulative work checkpoints with a short chain
+    monkeypatch.setattr(header_chain, "_CHECKPOINT", 4)
+
+    main = _branch(b"\x00" * 32, 10, 0)
+    chain = HeaderChain()
+    for raw_header in main:
+        assert chain.add(raw_header)
+    assert len(chain) == 10
+    assert chain.serialize() == b"".join(main)
+    for height, raw_header in enumerate(main):
+        hash_ = hash256(raw_header)[::-1]
+        assert chain.hash(height) == hash_
+        assert chain.height_of(hash_) == height
+        assert chain[height] == BlockHeader.parse(raw_header, check_validity=False)
+    assert chain.height_of(b"\x00" * 32) is None
+    assert chain.raw(-1) == main[-1]
+    for height in (-11, 10):
+        with pytest.raises(IndexError, match="height out of range"):
+            chain.raw(height)
+
+    # already known header
+    assert not chain.add(main[5])
+
+    # cumulative work
+    work = chain.chain_work(0)
+    assert work == 2
+    assert chain.chain_work() == 10 * work
+
+    # a shorter fork does not change the best chain
+    fork = _branch(chain.hash(4), 3, 100)
+    for raw_header in fork:
+        assert not chain.add(raw_header)
+    assert chain.tip == hash256(main[-1])[::-1]
+    assert hash256(fork[-1])[::-1] in chain
+    assert chain.height_of(hash256(fork[-1])[::-1]) is None
+
+    # a shorter fork with more work reorganizes the best chain
+    fork += _branch(hash256(fork[-1])[::-1], 2, 200, HARD_BITS)
+    assert chain.add(fork[3])
+    assert len(chain) == 9
+    assert chain.add(fork[4])
+    assert len(chain) == 10
+    assert chain.serialize() == b"".join(main[:5] + fork)
+    assert chain.height_of(hash256(main[-1])[::-1]) is None
+    assert hash256(main[-1])[::-1] in chain
+    for height, raw_header in enumerate(fork, 5):
+        assert chain.height_of(hash256(raw_header)[::-1]) == height
+    hard_work = 2 ** 256 // ((0x7FFFFF << 8 * 28) + 1)
+    assert chain.chain_work() == 8 * work + 2 * hard_work
+
+    # the old branch gets back
+    main += _branch(hash256(main[-1])[::-1], 600, 1000)
+    for raw_header in main[10:]:
+        chain.add(raw_header)
+    assert chain.serialize() == b"".join(main)
+    assert chain.chain_work() == len(main) * work
+    assert chain.chain_work(-2) == (len(main) - 1) * work
+
+    filename = str(tmp_path / "headers.dat")
+    chain.save(filename)
+    chain2 = HeaderChain.load(filename)
+    assert chain2.serialize() == chain.serialize()
+    assert chain2.chain_work() == chain.chain_work()
+
+    with pytest.raises(BTClibValueError, match="invalid header chain size: "):
+        HeaderChain(b"\x00" * 81)
+
+
+def test_compact() -> None:
+    # private consensus helpers, not exposed by the public API
+    # pylint: disable=protected-access
+    for bits in ("1d00ffff", "1b0404cb", "05009234", "20123456", "207fffff"):
+        raw_bits = bytes.fromhex(bits)[::-1]
+        assert header_chain._compact(header_chain._target(raw_bits)) == raw_bits
+    assert header_chain._compact(0x12) == bytes.fromhex("01120000")[::-1]
+    assert header_chain._compact(0x80) == bytes.fromhex("02008000")[::-1]
+
+
+def _retargeting_chain(times: List[int]) -> List[bytes]:
+    # difficulty retargets computed as the validation does
+    # pylint: disable=protected-access
+    raw_headers: List[bytes] = []
+    prev_hash = b"\x00" * 32
+    bits = EASY_BITS
+    pow_limit = header_chain._POW_RULES["mainnet"][0]
+    interval = header_chain.RETARGET_INTERVAL
+    for height, time in enumerate(times):
+        if height and height % interval == 0:
+            first_time = header_chain._time(raw_headers[height - interval])
+            last_time = header_chain._time(raw_headers[-1])
+            raw_bits = header_chain._retarget(
+                bits[::-1], first_time, last_time, pow_limit
+            )
+            bits = raw_bits[::-1]
+        raw_headers.append(_mine(prev_hash, height, bits, time))
+        prev_hash = hash256(raw_headers[-1])[::-1]
+    return raw_headers
+
+
+def test_assert_valid_headers(monkeypatch) -> None:  # type: ignore
+    # consensus rules patched for a short regtest-difficulty chain
+    # pylint: disable=protected-access
+
+    # mainnet rules with regtest proof-of-work limit and short periods
+    monkeypatch.setitem(header_chain._POW_RULES, "mainnet", ((1 << 255) - 1, True))
+    monkeypatch.setattr(header_chain, "RETARGET_INTERVAL", 8)
+    monkeypatch.setattr(header_chain, "_TARGET_TIMESPAN", 8 * 600)
+
+    # blocks found twice as fast, i.e. increasing difficulty
+    times = [1231006505 + 300 * i for i in range(20)]
+    raw_headers = _retargeting_chain(times)
+    assert raw_headers[8][72:76] != raw_headers[7][72:76]
+    assert raw_headers[16][72:76] != raw_headers[15][72:76]
+    data = b"".join(raw_headers)
+
+    chain = HeaderChain()
+    chain.assert_valid_headers(data)
+    chain.extend(data)
+    assert chain.serialize() == data
+
+    # validation in the context of the existing chain
+    chain = HeaderChain(data[: 10 * 80])
+    assert chain.height_of(chain.tip) == 9
+    chain.extend(data[10 * 80 :], max_workers=2)
+    assert chain.serialize() == data
+    assert chain.height_of(chain.tip) == 19
+
+    err_msg = "invalid header data size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(data[:-1])
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.extend(data[:-1], check_validity=False)
+
+    err_msg = "invalid previous hash at height 20"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(raw_headers[-1])
+
+    chain = HeaderChain(data[: 3 * 80])
+    raw_header = raw_headers[3][:76]
+    target = header_chain._target(raw_headers[3][72:76])
+    for nonce in range(0xFFFFFFFF):  # pragma: no branch
+        invalid = raw_header + nonce.to_bytes(4, "little")
+        if int.from_bytes(hash256(invalid), "little") > target:
+            break
+    err_msg = "invalid proof-of-work at height 3"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(invalid)
+
+    # no bits change between retargets
+    invalid = _mine(chain.tip, 3, bytes.fromhex("1f7fffff"), times[3])
+    err_msg = "invalid difficulty at height 3: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(invalid)
+    # but testnet and regtest difficulty is not checked
+    chain.assert_valid_headers(invalid, "regtest")
+
+    # no retarget
+    chain = HeaderChain(data[: 8 * 80])
+    invalid = _mine(chain.tip, 8, EASY_BITS, times[8])
+    err_msg = "invalid difficulty at height 8: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(invalid)
+
+    # median time past of the previous (up to 11) headers: times[5]
+    chain = HeaderChain(data[: 10 * 80])
+    invalid = _mine(chain.tip, 10, raw_headers[9][72:76][::-1], times[5])
+    err_msg = "invalid timestamp at height 10: not after the median time past"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        chain.assert_valid_headers(invalid)
+    valid = _mine(chain.tip, 10, raw_headers[9][72:76][::-1], times[5] + 1)
+    chain.assert_valid_headers(valid)
+
+    err_msg = "invalid bits at height 0: "
+    for bits in ("04923456", "1d000000"):
+        with pytest.raises(BTClibValueError, match=err_msg):
+            raw_header = raw_headers[0][:72] + bytes.fromhex(bits)[::-1]
+            HeaderChain().assert_valid_headers(raw_header + raw_headers[0][76:])
+    # above the actual mainnet proof-of-work limit
+    monkeypatch.undo()
+    with pytest.raises(BTClibValueError, match=err_msg):
+        HeaderChain().assert_valid_headers(raw_headers[0])
+    HeaderChain().assert_valid_headers(raw_headers[0], "regtest")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.merkle_tree` module."
+
+from os import path
+
+import pytest
+
+from btclib.exceptions import BTClibValueError
+from btclib.tx.blocks import Block
+from btclib.tx.merkle_tree import (
+    MerkleTree,
+    PartialMerkleTree,
+    root_from_proof,
+    verify_proof,
+)
+from btclib.utils import hash256, merkle_root
+
+
+def _tx_ids(n: int):  # type: ignore
+    return [hash256(i.to_bytes(4, "little")) for i in range(n)]
+
+
+def _merkle_root(tx_ids):  # type: ignore
+    # utils.merkle_root hashes its leaves: pass txids as identity
+    data = [tx_id[::-1] for tx_id in tx_ids]
+    return merkle_root(data, lambda x: x if len(x) == 32 else hash256(x))[::-1]
+
+
+def test_block() -> None:
+    fname = path.join(path.dirname(__file__), "_data", "block_200000.bin")
+    with open(fname, "rb") as file_:
+        block = Block.parse(file_.read())
+    tx_ids = [tx.id for tx in block.transactions]
+    tree = MerkleTree(tx_ids)
+    assert len(tree) == len(tx_ids)
+    assert tree.root == block.header.merkle_root
+
+    for i, tx_id in enumerate(tx_ids):
+        proof = tree.proof(i)
+        assert verify_proof(tx_id, i, proof, block.header.merkle_root)
+        assert not verify_proof(tx_id, i ^ 1, proof, block.header.merkle_root)
+
+
+def test_incremental() -> None:
+    tx_ids = _tx_ids(20)
+    tree = MerkleTree()
+    with pytest.raises(BTClibValueError, match="empty merkle tree"):
+        tree.root  # pylint: disable=pointless-statement
+    for n, tx_id in enumerate(tx_ids, 1):
+        tree.append(tx_id)
+        assert tree.root == _merkle_root(tx_ids[:n])
+        assert tree.root == MerkleTree(tx_ids[:n]).root
+        for i in range(n):
+            assert root_from_proof(tx_ids[i], i, tree.proof(i)) == tree.root
+
+    new_tx_ids = _tx_ids(40)[20:]
+    for i, tx_id in enumerate(new_tx_ids):
+        tree.replace(i, tx_id)
+        assert tree.root == _merkle_root(new_tx_ids[: i + 1] + tx_ids[i + 1 :])
+
+    for i in (-1, len(tree)):
+        with pytest.raises(IndexError, match="leaf index out of range"):
+            tree.proof(i)
+        with pytest.raises(IndexError, match="leaf index out of range"):
+            tree.replace(i, tx_ids[0])
+
+
+def test_partial() -> None:
+    for n in (1, 2, 3, 7, 8, 9, 20):
+        tx_ids = _tx_ids(n)
+        tree = MerkleTree(tx_ids)
+        for matches in ([], [0], [n - 1], list(range(0, n, 3)), list(range(n))):
+            partial = tree.partial(matches)
+            assert partial.n_transactions == n
+            root, matched = partial.extract()
+            assert root == tree.root
+            assert matched == [(i, tx_ids[i]) for i in sorted(set(matches))]
+            data = partial.serialize()
+            assert PartialMerkleTree.parse(data).extract() == (root, matched)
+            assert PartialMerkleTree.parse(data.hex()).serialize() == data
+
+    with pytest.raises(IndexError, match="leaf index out of range"):
+        tree.partial([n])
+
+
+def test_invalid_partial() -> None:
+    tx_ids = _tx_ids(3)
+    partial = MerkleTree(tx_ids).partial([1])
+
+    err_msg = "invalid n_transactions: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(0, [], [])
+
+    err_msg = "more hashes than transactions"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(1, partial.hashes, partial.flags)
+
+    err_msg = "less flags than hashes"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(3, partial.hashes, partial.flags[:1])
+
+    err_msg = "invalid hash length: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(3, [b"\x00" * 31], [False])
+
+    err_msg = "not enough flags"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(3, partial.hashes, partial.flags[:3]).extract()
+
+    err_msg = "not enough hashes"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(3, partial.hashes[:2], partial.flags).extract()
+
+    err_msg = "unused hashes"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        partial_7 = MerkleTree(_tx_ids(7)).partial([1])
+        hashes = partial_7.hashes + [tx_ids[0]]
+        PartialMerkleTree(7, hashes, partial_7.flags).extract()
+
+    err_msg = "unused flags"
+    flags = partial.flags + [False] * 8
+    with pytest.raises(BTClibValueError, match=err_msg):
+        PartialMerkleTree(3, partial.hashes, flags).extract()
+
+    # CVE-2012-2459: duplicated last transaction
+    tx_ids = _tx_ids(3) + [_tx_ids(3)[2]]
+    partial = MerkleTree(tx_ids).partial([2])
+    err_msg = "duplicated hashes"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        partial.extract()
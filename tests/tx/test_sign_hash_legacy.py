@@ -166,5 +166,14 @@ def test_test_vectors() -> None:
         tx = Tx.parse(raw_tx, check_validity=False)
         if hash_type < 0:
             hash_type += 0xFFFFFFFF + 1
+        serialized_tx = tx.serialize(include_witness=True, check_validity=False)
         actual_hash = sign_hash.legacy(script_, tx, input_index, hash_type)
         assert actual_hash == bytes.fromhex(exp_hash)[::-1]
+        # tx is not modified
+        assert tx.serialize(True, False) == serialized_tx
+
+        # serialized outputs are shared by the inputs of the same tx
+        context = sign_hash.SegwitV0Context(tx)
+        for vin_i in range(len(tx.vin)):
+            hash_ = sign_hash.legacy(script_, tx, vin_i, hash_type, context=context)
+            assert hash_ == sign_hash.legacy(script_, tx, vin_i, hash_type)
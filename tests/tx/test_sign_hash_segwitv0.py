@@ -13,6 +13,9 @@
 test vector at https://github.com/bitcoin/bips/blob/master/bip-0143.mediawiki
 """
 
+import pytest
+
+from btclib.exceptions import BTClibValueError
 from btclib.script.witness import Witness
 from btclib.tx import sign_hash
 from btclib.tx.tx import Tx
@@ -148,3 +151,64 @@ def test_wrapped_p2wsh() -> None:
     assert hash_ == bytes.fromhex(
         "511e8e52ed574121fc1b654970395502128263f62662e076dc6baf05c2e6a99b"
     )
+
+
+def test_context() -> None:
+    tx_bytes = "0100000002fff7f7881a8099afa6940d42d1e7f6362bec38171ea3edf433541db4e4ad969f0000000000eeffffffef51e1b804cc89d182d279655c3aa89e815b1b309fe287d9b2b55d57b90ec68a0100000000ffffffff02202cb206000000001976a9148280b37df378db99f66f85c95a783a76ac7a6d5988ac9093510d000000001976a9143bde42dbee7e4dbe6a21b2d50ce2f0167faa815988ac11000000"
+    tx = Tx.parse(tx_bytes)
+    utxos = [
+        TxOut(
+            625000000,
+            "2103c9f4836b9a4f77fc0d81f7bcb01b7f1b35916864b9476c241ce9fc198bd25432ac",
+        ),
+        TxOut(600000000, "00141d0f172a0ecb48aee1be1f2687d2963ae33f71a1"),
+    ]
+
+    hashes = sign_hash.from_utxos(utxos, tx)
+    assert hashes[1] == bytes.fromhex(
+        "c37af31116d1b27caf68aae9e3ac82f1477929014d5b917657d0eb49478cb670"
+    )
+    assert hashes[0] == sign_hash.from_utxo(utxos[0], tx, 0, sign_hash.ALL)
+
+    context = sign_hash.SegwitV0Context(tx)
+    hash_types = [
+        sign_hash.ALL,
+        sign_hash.NONE,
+        sign_hash.SINGLE,
+        sign_hash.ANYONECANPAY | sign_hash.ALL,
+        sign_hash.ANYONECANPAY | sign_hash.NONE,
+        sign_hash.ANYONECANPAY | sign_hash.SINGLE,
+    ]
+    for hash_type in hash_types:
+        hashes = sign_hash.from_utxos(utxos, tx, [hash_type, hash_type])
+        for vin_i, utxo in enumerate(utxos):
+            hash_ = sign_hash.from_utxo(utxo, tx, vin_i, hash_type, context=context)
+            assert hash_ == hashes[vin_i]
+            assert hash_ == sign_hash.from_utxo(utxo, tx, vin_i, hash_type)
+
+    # the cached hashes are discarded only when invalidated
+    hash_ = sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL, context=context)
+    tx.vout[0].value -= 1
+    stale_hash = sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL, context=context)
+    assert stale_hash == hash_
+    context.invalidate()
+    new_hash = sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL, context=context)
+    assert new_hash != hash_
+    assert new_hash == sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL)
+    tx.vin[0].sequence = 0
+    context.invalidate()
+    new_hash = sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL, context=context)
+    assert new_hash == sign_hash.from_utxo(utxos[1], tx, 1, sign_hash.ALL)
+
+    err_msg = "context for a different transaction"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        sign_hash.from_utxo(
+            utxos[1], Tx.parse(tx_bytes), 1, sign_hash.ALL, context=context
+        )
+
+    err_msg = "mismatched number of utxos: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        sign_hash.from_utxos(utxos[:1], tx)
+    err_msg = "mismatched number of hash types: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        sign_hash.from_utxos(utxos, tx, [sign_hash.ALL])
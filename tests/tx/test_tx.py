@@ -10,14 +10,18 @@
 
 "Tests for the `btclib.tx` module."
 
+import copy
+import io
 import json
+import pickle
 from os import path
+from unittest.mock import patch
 
 import pytest
 
-from btclib.exceptions import BTClibValueError
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
 from btclib.script.witness import Witness
-from btclib.tx.tx import Tx
+from btclib.tx.tx import FrozenTx, Tx
 from btclib.tx.tx_in import OutPoint, TxIn
 from btclib.tx.tx_out import TxOut
 
@@ -292,6 +296,141 @@ def test_double_witness() -> None:
     assert not tx.is_coinbase()
 
 
+def test_memoization() -> None:
+    tx_bytes = "01000000000102322d4f05c3a4f78e97deda01bd8fc5ff96777b62c8f2daa72b02b70fa1e3e1051600000017160014e123a5263695be634abf3ad3456b4bf15f09cc6afffffffffdfee6e881f12d80cbcd6dc54c3fe390670678ebd26c3ae2dd129f41882e3efc25000000171600145946c8c3def6c79859f01b34ad537e7053cf8e73ffffffff02c763ac050000000017a9145ffd6df9bd06dedb43e7b72675388cbfc883d2098727eb180a000000001976a9145f9e96f739198f65d249ea2a0336e9aa5aa0c7ed88ac024830450221009b364c1074c602b2c5a411f4034573a486847da9c9c2467596efba8db338d33402204ccf4ac0eb7793f93a1b96b599e011fe83b3e91afdc4c7ab82d765ce1da25ace01210334d50996c36638265ad8e3cd127506994100dd7f24a5828155d531ebaf736e160247304402200c6dd55e636a2e4d7e684bf429b7800a091986479d834a8d462fbda28cf6f8010220669d1f6d963079516172f5061f923ef90099136647b38cc4b3be2a80b820bdf90121030aa2a1c2344bc8f38b7a726134501a2a45db28df8b4bee2df4428544c62d731400000000"
+    tx = Tx.parse(tx_bytes)
+
+    def assert_consistent(tx: Tx) -> None:
+        # a fresh Tx has no memoized values
+        tx2 = Tx.parse(tx.serialize(include_witness=True, check_validity=False))
+        assert (tx.id, tx.hash) == (tx2.id, tx2.hash)
+        assert (tx.size, tx.vsize, tx.weight) == (tx2.size, tx2.vsize, tx2.weight)
+
+    assert tx.weight == 1033
+    assert_consistent(tx)
+
+    tx_id, hash_ = tx.id, tx.hash
+    tx.vin[0].script_witness.stack.append(b"\x01")
+    assert tx.id == tx_id
+    assert tx.hash != hash_
+    assert_consistent(tx)
+
+    tx.vin[1].script_sig = b"\x51"
+    assert tx.id != tx_id
+    assert_consistent(tx)
+
+    tx.vout[0].value -= 1
+    assert_consistent(tx)
+    tx.vout.append(TxOut(1, b"\x51"))
+    assert_consistent(tx)
+    tx.version = 2
+    assert_consistent(tx)
+    tx.lock_time = 1
+    assert_consistent(tx)
+
+    for tx_in in tx.vin:
+        tx_in.script_witness = Witness()
+    assert tx.hash == tx.id
+    assert tx.size * 4 == tx.weight
+    assert_consistent(tx)
+
+
+def test_frozen_tx() -> None:
+    tx_bytes = "01000000000102322d4f05c3a4f78e97deda01bd8fc5ff96777b62c8f2daa72b02b70fa1e3e1051600000017160014e123a5263695be634abf3ad3456b4bf15f09cc6afffffffffdfee6e881f12d80cbcd6dc54c3fe390670678ebd26c3ae2dd129f41882e3efc25000000171600145946c8c3def6c79859f01b34ad537e7053cf8e73ffffffff02c763ac050000000017a9145ffd6df9bd06dedb43e7b72675388cbfc883d2098727eb180a000000001976a9145f9e96f739198f65d249ea2a0336e9aa5aa0c7ed88ac024830450221009b364c1074c602b2c5a411f4034573a486847da9c9c2467596efba8db338d33402204ccf4ac0eb7793f93a1b96b599e011fe83b3e91afdc4c7ab82d765ce1da25ace01210334d50996c36638265ad8e3cd127506994100dd7f24a5828155d531ebaf736e160247304402200c6dd55e636a2e4d7e684bf429b7800a091986479d834a8d462fbda28cf6f8010220669d1f6d963079516172f5061f923ef90099136647b38cc4b3be2a80b820bdf90121030aa2a1c2344bc8f38b7a726134501a2a45db28df8b4bee2df4428544c62d731400000000"
+    tx = Tx.parse(tx_bytes)
+    frozen_tx = FrozenTx.parse(tx_bytes)
+    assert isinstance(frozen_tx, FrozenTx)
+    assert frozen_tx == tx
+    assert tx == frozen_tx
+    assert frozen_tx == FrozenTx.from_tx(tx)
+    assert frozen_tx == FrozenTx.from_dict(tx.to_dict())
+    assert frozen_tx.to_dict() == tx.to_dict()
+    assert frozen_tx.serialize(True) == tx.serialize(True)
+    assert frozen_tx.is_segwit()
+    assert (frozen_tx.id, frozen_tx.hash) == (tx.id, tx.hash)
+    assert (frozen_tx.size, frozen_tx.vsize) == (tx.size, tx.vsize)
+    assert frozen_tx.weight == tx.weight
+    assert len({frozen_tx, FrozenTx.parse(tx_bytes)}) == 1
+
+    frozen_tx = FrozenTx.from_tx(Tx(vin=[TxIn(OutPoint(), b"\x51\x51")]))
+    assert not frozen_tx.is_segwit()
+    assert frozen_tx.hash == frozen_tx.id
+    assert frozen_tx.size * 4 == frozen_tx.weight
+
+    err_msg = "FrozenTx is immutable: cannot set version"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        frozen_tx.version = 2
+    err_msg = "FrozenTx is immutable: cannot delete vin"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        del frozen_tx.vin
+    with pytest.raises(AttributeError):
+        frozen_tx.vout.append(TxOut(1, b"\x51"))  # type: ignore
+
+    # from_tx copies the inputs and outputs
+    tx_id = frozen_tx.id
+    tx = Tx(vin=[TxIn(OutPoint(), b"\x51\x51")])
+    frozen_tx = FrozenTx.from_tx(tx)
+    tx.vin[0].script_sig = b"\x52\x52"
+    assert frozen_tx.id == tx_id != tx.id
+    assert copy.deepcopy(frozen_tx) == frozen_tx
+    assert pickle.loads(pickle.dumps(frozen_tx)) == frozen_tx
+
+    # memoized values are returned without serializing again
+    with patch.object(FrozenTx, "serialize", side_effect=AssertionError):
+        assert frozen_tx.id == tx_id
+
+
+def test_compact() -> None:
+    script = bytes.fromhex("0014") + b"\x01" * 20
+    prev_out = OutPoint(b"\x01" * 32, 0)
+    tx_in = TxIn(prev_out, b"", 0xFFFFFFFF, Witness([b"\x01"]))
+    tx = Tx(2, 0, [tx_in, TxIn(prev_out)], [TxOut(1, script), TxOut(2, script)])
+    tx_bytes = tx.serialize(include_witness=True)
+
+    for tx2 in (Tx.parse(tx_bytes), Tx.parse(io.BytesIO(tx_bytes))):
+        assert tx2 == tx
+        # interned scripts
+        assert tx2.vout[0].script_pub_key.script is tx2.vout[1].script_pub_key.script
+        # mutable (not shared) empty witnesses
+        tx2.vin[1].script_witness.stack.append(b"\x02")
+        assert tx2.vin[1].script_witness.stack == [b"\x02"]
+        assert tx2 != tx
+    tx_in = TxIn()
+    tx_in.script_witness.stack.append(b"\x01")
+    assert not TxIn().script_witness.stack
+    assert tx2.vout[0].script_pub_key.script is Tx.parse(tx_bytes).vout[0].scriptPubKey
+
+    # slots, no __dict__
+    for obj in (
+        tx,
+        tx.vin[0],
+        tx.vin[0].prev_out,
+        tx.vout[0],
+        tx.vout[0].script_pub_key,
+    ):
+        with pytest.raises(AttributeError):
+            obj.foo = 1  # type: ignore
+
+
+def test_trusted_parse() -> None:
+    tx_in = TxIn(OutPoint(b"\x01" * 32, 0))
+    tx_out = TxOut(2 ** 63, b"\x51", check_validity=False)
+    tx = Tx(1, 0, [tx_in], [tx_out], check_validity=False)
+    tx_bytes = tx.serialize(include_witness=True, check_validity=False)
+
+    err_msg = "invalid satoshi amount: "
+    for data in (tx_bytes, io.BytesIO(tx_bytes)):
+        with pytest.raises(BTClibValueError, match=err_msg):
+            Tx.parse(data)
+
+    # trusted data is not validated, until assert_valid is called
+    for data in (tx_bytes, io.BytesIO(tx_bytes)):
+        tx2 = Tx.parse(data, check_validity=False)
+        assert tx2 == tx
+        with pytest.raises(BTClibValueError, match=err_msg):
+            tx2.assert_valid()
+
+
 def test_dataclasses_json_dict() -> None:
     fname = "d4f3c2c3c218be868c77ae31bedb497e2f908d6ee5bbbe91e4933e6da680c970.bin"
     filename = path.join(path.dirname(__file__), "_data", fname)
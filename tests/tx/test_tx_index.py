@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.tx_index` module."
+
+from os import path
+from typing import List
+
+from btclib.tx import blk_file
+from btclib.tx.blk_file import BlkFile
+from btclib.tx.blocks import Block
+from btclib.tx.tx_index import TxIndex
+
+MAGIC = bytes.fromhex("f9beb4d9")
+XOR_KEY = bytes.fromhex("0123456789abcdef")
+
+
+def _raw_blocks(fnames: List[str]) -> List[bytes]:
+    raw_blocks = []
+    for fname in fnames:
+        filename = path.join(path.dirname(__file__), "_data", fname)
+        with open(filename, "rb") as file_:
+            raw_blocks.append(file_.read())
+    return raw_blocks
+
+
+def _write_blk_file(filename: str, raw_blocks: List[bytes], xor_key: bytes) -> None:
+    data = b""
+    for raw_block in raw_blocks:
+        data += MAGIC + len(raw_block).to_bytes(4, "little") + raw_block
+    with open(filename, "wb") as file_:
+        file_.write(blk_file.xor(data, xor_key))
+
+
+def test_tx_index(tmp_path) -> None:  # type: ignore
+
+    raw_blocks = _raw_blocks(["block_1.bin", "block_170.bin", "block_200000.bin"])
+    txs = [tx for raw_block in raw_blocks for tx in Block.parse(raw_block).transactions]
+    filenames = [str(tmp_path / f"blk{i:05}.dat") for i in range(2)]
+    _write_blk_file(filenames[0], raw_blocks[:2], XOR_KEY)
+    _write_blk_file(filenames[1], raw_blocks[2:], XOR_KEY)
+
+    db_filename = str(tmp_path / "txindex.sqlite")
+    with TxIndex(db_filename) as tx_index:
+        assert len(tx_index) == 0
+        with BlkFile(filenames[0], xor_key=XOR_KEY) as blk:
+            assert tx_index.add_blk_file(blk, 0) == 3
+            # re-indexing is harmless
+            assert tx_index.add_blk_file(blk, 0) == 3
+        assert len(tx_index) == 3
+
+    # incremental append on the reopened index
+    with TxIndex(db_filename) as tx_index:
+        assert len(tx_index) == 3
+        with BlkFile(filenames[1], xor_key=XOR_KEY) as blk:
+            for offset, raw_block in blk.raw_blocks():
+                n = tx_index.add_block(raw_block, 1, offset)
+                assert n == len(Block.parse(raw_block).transactions)
+        assert len(tx_index) == len(txs)
+
+        for tx in txs:
+            locations = tx_index.locations(tx.id)
+            assert len(locations) == 1
+            _, _, length = locations[0]
+            assert length == tx.size
+            raw_tx = tx_index.raw_tx(tx.id, filenames.__getitem__, XOR_KEY)
+            assert raw_tx == tx.serialize(include_witness=True)
+
+        tx_id = txs[0].id
+        # same truncated key, different txid
+        colliding_tx_id = tx_id[:8] + b"\x00" * 24
+        assert tx_index.locations(colliding_tx_id) == tx_index.locations(tx_id)
+        assert tx_index.raw_tx(colliding_tx_id, filenames.__getitem__, XOR_KEY) is None
+        missing_tx_id = b"\x00" * 32
+        assert not tx_index.locations(missing_tx_id)
+        assert tx_index.raw_tx(missing_tx_id, filenames.__getitem__, XOR_KEY) is None
+
+    with TxIndex() as tx_index:
+        assert tx_index.add_block(raw_blocks[2], 0, 8) == len(txs) - 3
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.tx_offsets` module."
+
+from os import path
+
+import pytest
+
+from btclib.exceptions import BTClibValueError
+from btclib.tx.blocks import Block
+from btclib.tx.tx_offsets import TxOffsets
+
+
+def test_tx_offsets() -> None:
+
+    fname = "block_481824_complete.bin"
+    filename = path.join(path.dirname(__file__), "_data", fname)
+    with open(filename, "rb") as file_:
+        block_bytes = file_.read()
+    block = Block.parse(block_bytes)
+
+    tx_offsets = TxOffsets.from_block(block_bytes)
+    assert len(tx_offsets) == len(block.transactions)
+    offset, length, _ = tx_offsets[-1]
+    assert offset + length == len(block_bytes)
+
+    i = 1742
+    tx = block.transactions[i]
+    offset, length, witness_offset = tx_offsets[i]
+    assert block_bytes[offset : offset + length] == tx.serialize(True)
+    assert tx_offsets.tx(block_bytes, i) == tx
+    assert tx_offsets.tx_id(block_bytes, i) == tx.id
+    assert tx_offsets.tx_view(block_bytes, i).hash == tx.hash
+    for i, tx in enumerate(block.transactions):
+        offset, length, witness_offset = tx_offsets[i]
+        if not tx.is_segwit():
+            assert witness_offset == offset + length - 4
+        assert tx_offsets.tx_id(block_bytes, i) == tx.id
+    assert list(tx_offsets) == [tx_offsets[i] for i in range(len(tx_offsets))]
+
+    # cacheable alongside the block
+    data = tx_offsets.serialize()
+    assert len(data) == 12 * len(tx_offsets)
+    assert TxOffsets.parse(data) == tx_offsets
+
+    err_msg = "invalid TxOffsets size: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        TxOffsets.parse(data[:-1])
+    err_msg = "invalid number of offsets: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        TxOffsets([1, 2])
+    with pytest.raises(IndexError, match="transaction index out of range"):
+        _ = tx_offsets[len(tx_offsets)]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.tx_view` module."
+
+from os import path
+
+import pytest
+
+from btclib import var_bytes, var_int
+from btclib.exceptions import BTClibRuntimeError
+from btclib.script.witness import Witness
+from btclib.tx.blocks import Block
+from btclib.tx.tx import Tx
+from btclib.tx.tx_in import TxIn
+from btclib.tx.tx_out import TxOut
+from btclib.tx.tx_view import TxView
+
+
+def test_parse_at() -> None:
+
+    data = b"\x00" + var_int.serialize(0xFFFF) + var_bytes.serialize(b"\x01\x02")
+    assert var_int.parse_at(data) == (0, 1)
+    assert var_int.parse_at(data, 1) == (0xFFFF, 4)
+    assert var_bytes.parse_at(memoryview(data), 4) == (b"\x01\x02", 7)
+
+    err_msg = "not enough binary data"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        var_bytes.parse_at(data[:-1], 4)
+
+
+def test_block_views() -> None:
+
+    fname = "block_481824_complete.bin"
+    filename = path.join(path.dirname(__file__), "_data", fname)
+    with open(filename, "rb") as file_:
+        block_bytes = file_.read()
+
+    block, end = Block.parse_at(memoryview(block_bytes))
+    assert end == len(block_bytes)
+    assert block == Block.parse(block_bytes)
+
+    n, offset = var_int.parse_at(block_bytes, 80)
+    assert n == len(block.transactions)
+    for tx in block.transactions:
+        view = TxView.parse_at(block_bytes, offset)
+        assert view.start == offset
+        assert view.id == tx.id
+        assert view.hash == tx.hash
+        assert view.is_segwit() == tx.is_segwit()
+        assert (view.size, view.vsize, view.weight) == (tx.size, tx.vsize, tx.weight)
+        assert view.serialize() == tx.serialize(include_witness=True)
+        assert view.tx() == tx
+        tx2, offset = Tx.parse_at(bytearray(block_bytes), offset)
+        assert tx2 == tx
+        assert offset == view.end
+    assert offset == len(block_bytes)
+
+
+def test_segwit_marker_without_witness() -> None:
+
+    tx = Tx(vin=[TxIn(script_witness=Witness([b"\x01"]))], vout=[TxOut(1, b"\x51")])
+    tx_bytes = tx.serialize(include_witness=True)
+    tx.vin[0].script_witness = Witness()
+    # segwit serialization with an empty witness
+    tx_bytes = tx_bytes[:-7] + b"\x00" + tx_bytes[-4:]
+
+    view = TxView.parse_at(tx_bytes)
+    assert not view.is_segwit()
+    assert view.id == view.hash == tx.id
+    assert view.base_size == view.size == tx.size
+    assert view.tx() == tx == Tx.parse(tx_bytes)
+
+
+def test_invalid_data() -> None:
+
+    tx = Tx(vin=[TxIn(script_witness=Witness([b"\x01"]))], vout=[TxOut(1, b"\x51")])
+    tx_bytes = tx.serialize(include_witness=True)
+
+    err_msg = "not enough binary data"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        TxView.parse_at(tx_bytes[:-1])
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        Tx.parse(tx_bytes[:-1])
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.utxo_set` module."
+
+from typing import List, Tuple
+
+import pytest
+
+from btclib.exceptions import BTClibValueError
+from btclib.tx.block_header import BlockHeader
+from btclib.tx.blocks import Block
+from btclib.tx.out_point import OutPoint
+from btclib.tx.tx import Tx
+from btclib.tx.tx_in import TxIn
+from btclib.tx.tx_out import TxOut
+from btclib.tx.utxo_set import (
+    Coin,
+    SqliteStore,
+    UtxoSet,
+    compress_amount,
+    compress_script,
+    decompress_amount,
+    decompress_script_at,
+)
+
+P2PKH = bytes.fromhex("76a914") + b"\x01" * 20 + bytes.fromhex("88ac")
+P2SH = bytes.fromhex("a914") + b"\x02" * 20 + bytes.fromhex("87")
+P2PK = bytes.fromhex("2102") + b"\x03" * 32 + bytes.fromhex("ac")
+P2PK_UNCOMPRESSED = bytes.fromhex("4104") + b"\x04" * 64 + bytes.fromhex("ac")
+P2WPKH = bytes.fromhex("0014") + b"\x05" * 20
+NULLDATA = bytes.fromhex("6a04") + b"\x06" * 4
+
+
+def test_compress_amount() -> None:
+    # Bitcoin Core compress_tests
+    coin = 100_000_000
+    for amount, compressed in (
+        (0, 0x0),
+        (1, 0x1),
+        (1_000_000, 0x7),
+        (coin, 0x9),
+        (50 * coin, 0x32),
+        (21_000_000 * coin, 0x1406F40),
+    ):
+        assert compress_amount(amount) == compressed
+        assert decompress_amount(compressed) == amount
+    for amount in list(range(1000)) + [10 ** i for i in range(17)] + [12345 * coin]:
+        assert decompress_amount(compress_amount(amount)) == amount
+
+
+def test_compress_script() -> None:
+    for script, size in (
+        (P2PKH, 21),
+        (P2SH, 21),
+        (P2PK, 33),
+        (P2PK_UNCOMPRESSED, 68),
+        (P2WPKH, 23),
+        (b"", 1),
+    ):
+        compressed = compress_script(script)
+        assert len(compressed) == size
+        assert decompress_script_at(b"\xff" + compressed, 1) == (script, size + 1)
+
+    with pytest.raises(BTClibValueError, match="unsupported script type: 4"):
+        decompress_script_at(b"\x04" + b"\x00" * 64)
+
+
+def test_coin() -> None:
+    for coin in (
+        Coin(50 * 100_000_000, P2PK, 0, True),
+        Coin(12345, P2WPKH, 700_000, False),
+    ):
+        assert Coin.parse(coin.serialize()) == coin
+
+
+def _tx(prev_outs: List[Tuple[bytes, int]], scripts: List[bytes]) -> Tx:
+    vin = [
+        TxIn(OutPoint(tx_id, vout, False), check_validity=False)
+        for tx_id, vout in prev_outs
+    ]
+    vout = [TxOut(1000 * (i + 1), script, False) for i, script in enumerate(scripts)]
+    return Tx(2, 0, vin, vout, False)
+
+
+def _coinbase(height: int, scripts: List[bytes]) -> Tx:
+    tx = _tx([(b"\x00" * 32, 0xFFFFFFFF)], scripts)
+    tx.vin[0].script_sig = bytes([1, height])
+    return tx
+
+
+def _block(transactions: List[Tx]) -> Block:
+    return Block(BlockHeader(check_validity=False), transactions, False)
+
+
+def _chain() -> List[Block]:
+    coinbase_0 = _coinbase(0, [P2PKH, NULLDATA])
+    block_0 = _block([coinbase_0])
+    coinbase_1 = _coinbase(1, [P2PK])
+    tx_1 = _tx([(coinbase_0.id, 0)], [P2SH, P2WPKH])
+    # spending an output of the same block
+    tx_2 = _tx([(tx_1.id, 0)], [P2PK_UNCOMPRESSED])
+    block_1 = _block([coinbase_1, tx_1, tx_2])
+    return [block_0, block_1]
+
+
+def _check_utxo_set(utxo_set: UtxoSet) -> None:
+
+    block_0, block_1 = _chain()
+    coinbase_0 = block_0.transactions[0]
+    undo_0 = utxo_set.connect_block(block_0, 0)
+    assert undo_0 == b"\x00"
+    assert len(utxo_set) == 1
+    assert utxo_set.get(OutPoint(coinbase_0.id, 0)) == Coin(1000, P2PKH, 0, True)
+    # nulldata is not stored
+    assert OutPoint(coinbase_0.id, 1) not in utxo_set
+    state_0 = dict(utxo_set.store)
+
+    undo_1 = utxo_set.connect_block(block_1, 1)
+    assert len(utxo_set) == 3
+    coinbase_1, tx_1, tx_2 = block_1.transactions
+    assert OutPoint(coinbase_0.id, 0) not in utxo_set
+    assert OutPoint(tx_1.id, 0) not in utxo_set
+    assert utxo_set.get(OutPoint(coinbase_1.id, 0)) == Coin(1000, P2PK, 1, True)
+    assert utxo_set.get(OutPoint(tx_1.id, 1)) == Coin(2000, P2WPKH, 1, False)
+    coin = Coin(1000, P2PK_UNCOMPRESSED, 1, False)
+    assert utxo_set.get(OutPoint(tx_2.id, 0)) == coin
+    state_1 = dict(utxo_set.store)
+
+    # already spent: the UtxoSet is unchanged
+    err_msg = "missing or spent output: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        utxo_set.connect_block(_block([_coinbase(2, [P2PKH]), tx_1]), 2)
+    assert dict(utxo_set.store) == state_1
+
+    # double spending in the same block
+    tx_3 = _tx([(coinbase_1.id, 0)], [P2PKH])
+    tx_4 = _tx([(coinbase_1.id, 0)], [P2SH])
+    with pytest.raises(BTClibValueError, match=err_msg):
+        utxo_set.connect_block(_block([_coinbase(2, [P2PKH]), tx_3, tx_4]), 2)
+    assert dict(utxo_set.store) == state_1
+
+    with pytest.raises(BTClibValueError, match="invalid undo data"):
+        utxo_set.disconnect_block(block_1, undo_0)
+    with pytest.raises(BTClibValueError, match="missing output: "):
+        utxo_set.disconnect_block(block_0, undo_0)
+    assert dict(utxo_set.store) == state_1
+
+    utxo_set.disconnect_block(block_1, undo_1)
+    assert dict(utxo_set.store) == state_0
+    utxo_set.disconnect_block(block_0, undo_0)
+    assert len(utxo_set) == 0
+
+
+def test_utxo_set() -> None:
+    _check_utxo_set(UtxoSet())
+
+
+def test_sqlite_store(tmp_path) -> None:  # type: ignore
+
+    filename = str(tmp_path / "utxo.sqlite")
+    with SqliteStore(filename) as store:
+        _check_utxo_set(UtxoSet(store))
+
+        store[b"\x01"] = b"\x02"
+        store.commit()
+    with SqliteStore(filename) as store:
+        assert dict(store) == {b"\x01": b"\x02"}
+        del store[b"\x01"]
+        with pytest.raises(KeyError):
+            del store[b"\x01"]
+        with pytest.raises(KeyError):
+            store[b"\x01"]  # pylint: disable=pointless-statement
+        assert len(store) == 0